@@ -0,0 +1,200 @@
+"""
+音频 QA 指标：True Peak / 削波 / 直流偏移 / 峰值因数
+
+响度脚本只报告 LUFS，不检查样本间峰值、直流偏移和连续削波，这些问题在 Vorbis / Opus 编码后才会暴露。
+QAAccumulator 按块累积，一次遍历得到所有指标：
+- true_peak_db：4 倍过采样（scipy.signal.resample_poly）后的峰值，dBTP
+  相邻块之间保留 2 × OVERLAP 个样本作为上下文，只统计两侧上下文都完整的输出，结果与整段一次计算一致
+- sample_peak_db / rms_db / crest_db：样本峰值、RMS 与峰值因数（峰值 - RMS）
+- clip_runs / clipped_samples：|x| >= CLIP_THRESHOLD 且连续至少 MIN_CLIP_RUN 个样本的段数和样本数，跨块的段会接上
+- dc_offset：各声道均值中绝对值最大的一个（线性值）
+
+用法：
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).resolve().parents[N]))  # 仓库根目录
+    from Audio_QA import analyze_file, analyze_array, qa_issues, format_qa
+
+    qa = analyze_file("a.wav")           # 按块读取文件
+    qa = analyze_array(audio)            # 已解码的数组（如共享内存），按块计算
+    print(format_qa(qa), qa_issues(qa))
+"""
+
+import math
+
+import numpy as np
+
+OVERSAMPLE = 4
+OVERLAP = 32                # 输入样本数，需大于 resample_poly 滤波器的半长（约 10 个输入样本）
+BLOCK_FRAMES = 65536
+
+CLIP_THRESHOLD = 0.999      # ≈ -0.01 dBFS
+MIN_CLIP_RUN = 3            # 连续这么多个样本才算一次削波
+
+# qa_issues 的判断阈值
+TRUE_PEAK_LIMIT_DB = -1.0
+DC_OFFSET_LIMIT = 0.001     # -60 dBFS
+
+
+def _to_db(value):
+    return 20 * math.log10(value) if value > 0 else float("-inf")
+
+
+class QAAccumulator:
+    def __init__(self):
+        self.frames = 0
+        self.clip_runs = 0
+        self.clipped_samples = 0
+        self._sample_peak = 0.0
+        self._true_peak = 0.0
+        self._sum = None            # 各声道样本和（直流偏移）
+        self._sum_square = 0.0
+        self._run_carry = None      # 各声道延续到块末尾、尚未结束的削波长度
+        self._history = None        # 上一块末尾的样本（过采样上下文）
+        self._history_start = 0     # _history 第一个样本的全局位置
+        self._covered = 0           # 已统计过采样峰值的样本位置
+        self._finished = False
+
+    # --------------------------------------------------------
+    # 累积
+    # --------------------------------------------------------
+    def feed(self, block):
+        """block: (样本, 声道) 或 (样本,) 的 float 数组"""
+        block = np.asarray(block, dtype=np.float32)
+        if block.ndim == 1:
+            block = block[:, np.newaxis]
+        if not len(block):
+            return
+
+        if self._sum is None:
+            self._sum = np.zeros(block.shape[1])
+            self._run_carry = np.zeros(block.shape[1], dtype=np.int64)
+            self._history = np.zeros((0, block.shape[1]), dtype=np.float32)
+
+        magnitude = np.abs(block)
+        self._sample_peak = max(self._sample_peak, float(magnitude.max()))
+        self._sum += block.sum(axis=0, dtype=np.float64)
+        self._sum_square += float(np.square(block, dtype=np.float64).sum())
+        self.frames += len(block)
+
+        self._count_clips(magnitude >= CLIP_THRESHOLD)
+        self._oversample(block, final=False)
+
+    def _oversample(self, block, final):
+        """
+        过采样 [上一块末尾 + 本块]，统计尚未统计、且右侧有 OVERLAP 个样本上下文（或已到文件末尾）的输出
+        左侧上下文由保留的历史样本保证（文件开头之前本来就是静音）
+        """
+        from scipy.signal import resample_poly
+
+        data = np.concatenate([self._history, block]) if len(block) else self._history
+        low = self._covered - self._history_start
+        high = len(data) if final else len(data) - OVERLAP
+
+        if high > low:
+            upsampled = resample_poly(data, OVERSAMPLE, 1, axis=0)
+            self._true_peak = max(self._true_peak, float(np.abs(upsampled[low * OVERSAMPLE:high * OVERSAMPLE]).max()))
+            self._covered = self._history_start + high
+
+        keep = min(len(data), 2 * OVERLAP)
+        self._history_start += len(data) - keep
+        self._history = data[len(data) - keep:]
+
+    def _count_clips(self, mask):
+        """按声道找出连续为 True 的段，首尾与相邻块的段相接"""
+        frames = len(mask)
+        padded = np.zeros((frames + 2, mask.shape[1]), dtype=np.int8)
+        padded[1:-1] = mask
+        edges = np.diff(padded, axis=0).T
+        # nonzero 按声道、再按位置排序，同一声道的起点和终点一一对应
+        channels, starts = np.nonzero(edges == 1)
+        _, ends = np.nonzero(edges == -1)
+        lengths = ends - starts
+
+        # 从块开头开始的段接上上一块末尾的段；没有接上的，上一块的段已经结束
+        head = starts == 0
+        lengths += np.where(head, self._run_carry[channels], 0)
+        ended = self._run_carry.copy()
+        ended[channels[head]] = 0
+        self._finish_runs(ended)
+
+        # 到块末尾还没结束的段留到下一块
+        tail = ends == frames
+        self._run_carry = np.zeros_like(self._run_carry)
+        self._run_carry[channels[tail]] = lengths[tail]
+        self._finish_runs(lengths[~tail])
+
+    def _finish_runs(self, lengths):
+        counted = lengths[lengths >= MIN_CLIP_RUN]
+        self.clip_runs += len(counted)
+        self.clipped_samples += int(counted.sum())
+
+    # --------------------------------------------------------
+    # 结果
+    # --------------------------------------------------------
+    def result(self):
+        """结束累积并返回指标 dict，没有样本时返回 None"""
+        if not self.frames:
+            return None
+        if not self._finished:
+            self._finished = True
+            self._oversample(np.zeros((0, len(self._sum)), dtype=np.float32), final=True)
+            self._finish_runs(self._run_carry)
+            self._run_carry = np.zeros_like(self._run_carry)
+
+        rms = math.sqrt(self._sum_square / (self.frames * len(self._sum)))
+        sample_peak_db = _to_db(self._sample_peak)
+        rms_db = _to_db(rms)
+        return {
+            "true_peak_db": _to_db(max(self._true_peak, self._sample_peak)),
+            "sample_peak_db": sample_peak_db,
+            "rms_db": rms_db,
+            "crest_db": sample_peak_db - rms_db if rms > 0 else None,
+            "clip_runs": self.clip_runs,
+            "clipped_samples": self.clipped_samples,
+            "dc_offset": float(np.abs(self._sum / self.frames).max()),
+        }
+
+
+# ============================================================
+# 便捷函数
+# ============================================================
+def analyze_array(audio, block_frames=BLOCK_FRAMES):
+    """按块分析已解码的音频（不复制整段数组）"""
+    accumulator = QAAccumulator()
+    for start in range(0, len(audio), block_frames):
+        accumulator.feed(audio[start:start + block_frames])
+    return accumulator.result()
+
+
+def analyze_file(file_path, block_frames=BLOCK_FRAMES):
+    """用 soundfile 按块读取并分析，内存占用与文件长度无关"""
+    import soundfile as sf
+
+    accumulator = QAAccumulator()
+    for block in sf.blocks(file_path, blocksize=block_frames, dtype="float32", always_2d=True):
+        accumulator.feed(block)
+    return accumulator.result()
+
+
+def qa_issues(qa):
+    """返回超出阈值的问题列表，空列表表示正常"""
+    if not qa:
+        return []
+    issues = []
+    if qa["true_peak_db"] > TRUE_PEAK_LIMIT_DB:
+        issues.append(f"True Peak {qa['true_peak_db']:.2f} dBTP > {TRUE_PEAK_LIMIT_DB} dBTP")
+    if qa["clip_runs"]:
+        issues.append(f"削波 {qa['clip_runs']} 处（{qa['clipped_samples']} 个样本）")
+    if qa["dc_offset"] > DC_OFFSET_LIMIT:
+        issues.append(f"直流偏移 {qa['dc_offset']:.4f}")
+    return issues
+
+
+def format_qa(qa):
+    """格式化为日志文本，如 "TP -0.8 dBTP, Peak -1.2 dBFS, Crest 14.3 dB, DC 0.0001, Clip 0" """
+    if not qa:
+        return "无样本"
+    crest = f"{qa['crest_db']:.1f} dB" if qa["crest_db"] is not None else "-"
+    return (f"TP {qa['true_peak_db']:.2f} dBTP, Peak {qa['sample_peak_db']:.2f} dBFS, Crest {crest}, "
+            f"DC {qa['dc_offset']:.4f}, Clip {qa['clip_runs']}")
@@ -0,0 +1,180 @@
+"""
+按内容判断声道布局，给出 ChannelConfigOverride 建议
+
+read_wav_channel_mask 只读文件头的声道掩码，实际很多"立体声"是双单声道（左右完全相同），
+5.1 里的 LFE / Center 也经常是空的。ChannelAccumulator 按块累积，一次遍历得到：
+- 各声道 RMS / 峰值（dBFS）
+- 声道两两之间的 Gram 矩阵 block.T @ block（float64），由此得到相关系数，
+  以及差值信号的能量 E[(a - b)²] = G_aa + G_bb - 2·G_ab（相对两声道平均能量，dB），不需要再遍历一次
+recommend_layout 根据这些指标判断：
+- 双单声道 / 只有第一个声道有声音 → 单声道（Override 为 CONFIG_MONO）
+- 只有前两个声道有内容的多声道文件 → 立体声（CONFIG_STEREO）
+- 其它声道静音（如 LFE / Center）只报告，不给 Override 值：Override 保留的是前面的声道，中间的空声道去不掉
+
+ChannelConfigOverride 的值为 (声道掩码 << 12) | (配置类型 << 8) | 声道数，配置类型 1 为标准布局，
+例如原来写死的 49410 = channel_config(0xC, 2)，即 Center + LFE。
+
+用法：
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).resolve().parents[N]))  # 仓库根目录
+    from Channel_Layout import analyze_file, recommend_layout
+
+    stats = analyze_file("a.wav")
+    layout = recommend_layout(stats, ["Front Left", "Front Right"])
+    layout["config"], layout["reason"]
+"""
+
+import math
+
+import numpy as np
+
+BLOCK_FRAMES = 65536
+
+SILENT_DB = -70.0           # RMS 低于该值视为静音声道
+DUPLICATE_DB = -40.0        # 差值能量低于两声道平均能量这么多视为相同内容
+
+CONFIG_TYPE_STANDARD = 1
+SPEAKER_FRONT_LEFT = 0x1
+SPEAKER_FRONT_RIGHT = 0x2
+SPEAKER_FRONT_CENTER = 0x4
+SPEAKER_LFE = 0x8
+
+
+def channel_config(mask, channels, config_type=CONFIG_TYPE_STANDARD):
+    """编码 ChannelConfigOverride 的值"""
+    return (mask << 12) | (config_type << 8) | channels
+
+
+CONFIG_MONO = channel_config(SPEAKER_FRONT_CENTER, 1)
+CONFIG_STEREO = channel_config(SPEAKER_FRONT_LEFT | SPEAKER_FRONT_RIGHT, 2)
+CONFIG_CENTER_LFE = channel_config(SPEAKER_FRONT_CENTER | SPEAKER_LFE, 2)
+
+
+def _to_db(value):
+    return 10 * math.log10(value) if value > 0 else float("-inf")
+
+
+class ChannelAccumulator:
+    def __init__(self):
+        self.frames = 0
+        self._gram = None           # Σ xᵀx，对角线为各声道平方和
+        self._peak = None
+
+    def feed(self, block):
+        """block: (样本, 声道) 或 (样本,) 的 float 数组"""
+        block = np.asarray(block, dtype=np.float32)
+        if block.ndim == 1:
+            block = block[:, np.newaxis]
+        if not len(block):
+            return
+        if self._gram is None:
+            self._gram = np.zeros((block.shape[1], block.shape[1]))
+            self._peak = np.zeros(block.shape[1])
+
+        wide = block.astype(np.float64)
+        self._gram += wide.T @ wide
+        np.maximum(self._peak, np.abs(block).max(axis=0), out=self._peak)
+        self.frames += len(block)
+
+    def result(self):
+        """
+        返回 dict，没有样本时返回 None：
+            channels: 声道数
+            rms_db / peak_db: 各声道的列表
+            correlation: 相关系数矩阵（嵌套列表，静音声道所在行列为 0）
+            difference_db: 两两差值能量相对平均能量的 dB 矩阵（静音声道为 None）
+        """
+        if not self.frames:
+            return None
+        power = np.diag(self._gram) / self.frames
+        channels = len(power)
+
+        norm = np.sqrt(np.outer(np.diag(self._gram), np.diag(self._gram)))
+        correlation = np.divide(self._gram, norm, out=np.zeros_like(self._gram), where=norm > 0)
+
+        # E[(a - b)²] / ((E[a²] + E[b²]) / 2)
+        energy = np.diag(self._gram)
+        residual = energy[:, None] + energy[None, :] - 2 * self._gram
+        mean_energy = (energy[:, None] + energy[None, :]) / 2
+        difference_db = [[None] * channels for _ in range(channels)]
+        for a in range(channels):
+            for b in range(channels):
+                if mean_energy[a, b] > 0:
+                    difference_db[a][b] = _to_db(max(residual[a, b], 0.0) / mean_energy[a, b])
+
+        return {
+            "channels": channels,
+            "rms_db": [_to_db(value) for value in power],
+            "peak_db": [_to_db(value * value) for value in self._peak],
+            "correlation": correlation.round(4).tolist(),
+            "difference_db": difference_db,
+        }
+
+
+# ============================================================
+# 便捷函数
+# ============================================================
+def analyze_array(audio, block_frames=BLOCK_FRAMES):
+    accumulator = ChannelAccumulator()
+    for start in range(0, len(audio), block_frames):
+        accumulator.feed(audio[start:start + block_frames])
+    return accumulator.result()
+
+
+def analyze_file(file_path, block_frames=BLOCK_FRAMES):
+    """用 soundfile 按块读取并分析，内存占用与文件长度无关"""
+    import soundfile as sf
+
+    accumulator = ChannelAccumulator()
+    for block in sf.blocks(file_path, blocksize=block_frames, dtype="float32", always_2d=True):
+        accumulator.feed(block)
+    return accumulator.result()
+
+
+def _same_as(stats, a, b):
+    difference = stats["difference_db"][a][b]
+    return difference is not None and difference < DUPLICATE_DB
+
+
+def recommend_layout(stats, channel_names=None):
+    """
+    Args:
+        stats: analyze_file / analyze_array 的结果
+        channel_names: 各声道名称（用于报告，如 getWavChannels 的 decode_channel_mask 结果），None 时为 Ch1、Ch2...
+
+    Returns:
+        dict: {"config": Override 值或 None, "layout": "mono" / "stereo" / None,
+               "silent": 静音声道名称列表, "reason": 说明}
+    """
+    if not stats:
+        return {"config": None, "layout": None, "silent": [], "reason": "无样本"}
+    channels = stats["channels"]
+    names = list(channel_names or [])[:channels]
+    names += [f"Ch{index + 1}" for index in range(len(names), channels)]
+
+    silent_mask = [rms < SILENT_DB for rms in stats["rms_db"]]
+    silent = [name for name, is_silent in zip(names, silent_mask) if is_silent]
+    active = [index for index, is_silent in enumerate(silent_mask) if not is_silent]
+
+    def result(config, layout, reason):
+        return {"config": config, "layout": layout, "silent": silent, "reason": reason}
+
+    if channels == 1:
+        return result(None, None, "已是单声道")
+    if not active:
+        return result(None, None, "所有声道均为静音")
+
+    # 有声音的声道都与第一个声道相同 → 单声道
+    if active[0] == 0 and all(_same_as(stats, 0, index) for index in active[1:]):
+        if len(active) == 1:
+            return result(CONFIG_MONO, "mono", f"只有 {names[0]} 有声音")
+        return result(CONFIG_MONO, "mono", "双单声道（" + " = ".join(names[index] for index in active) + "）")
+
+    # 多声道文件只有前两个声道有内容 → 立体声
+    if channels > 2 and active == [0, 1]:
+        return result(CONFIG_STEREO, "stereo", "只有 " + " / ".join(names[:2]) + " 有声音")
+
+    if silent:
+        return result(None, None, "静音声道不在末尾，需重新导出: " + ", ".join(silent))
+    return result(None, None, "各声道内容不同")
@@ -1,8 +1,13 @@
-﻿import sys
-from waapi import WaapiClient, CannotConnectToWaapiException
+﻿import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from startup_report import STARTUP
+from Wwise_Log import get_log_sink, log_sink
+
 from pprint import pprint
 from collections import deque
-import soundfile as sf
 TARGET_TYPE = "Sound"  # 目标类型
 WAAPI_URL = "ws://127.0.0.1:8081/waapi"
 # ============================================================
@@ -15,39 +20,10 @@ def wwise_log(client, text, level="info"):
         warning → Warning
         error   → Error
         fatal   → Fatal Error
-    """
-
-    # CMD 颜色
-    color = ""
-    severity = "Message"
-
-    if level == "info":
-        color = "\033[92m"  # green
-        severity = "Message"
-
-    elif level == "warning":
-        color = "\033[93m"  # yellow
-        severity = "Warning"
-
-    elif level == "error":
-        color = "\033[91m"  # red
-        severity = "Error"
-
-    elif level == "fatal":
-        color = "\033[95m"  # magenta
-        severity = "Fatal Error"
-
-    # 输出到 CMD
-    print(f"{color}{text}\033[0m")
 
-    # 写入 Wwise Log
-    try:
-        client.call("ak.wwise.core.log.addItem", {
-            "severity": severity,
-            "message": text
-        })
-    except Exception as e:
-        print(f"\033[91m[ERROR] 写入 Wwise Log 失败: {e}\033[0m")
+    CMD 立即输出，Wwise Log 由后台线程批量写入（见 Wwise_Log.py）
+    """
+    get_log_sink(client).log(text, level)
 
 
 # ============================================================
@@ -102,18 +78,28 @@ def momentary_max(file_path: str) -> float | None:
 
 def check_loudness(client, file_path, name):
     try:
-        # 首先检查音频时长
-        audio, sr = sf.read(file_path, dtype="float32")
-        duration_ms = len(audio) / sr * 1000
+        # soundfile 只在真正检查文件时才导入，不拖慢启动
+        import soundfile as sf
+
+        # 首先检查音频时长（只读文件头，不解码整段音频）
+        info = sf.info(file_path)
+        duration_ms = info.frames / info.samplerate * 1000
         min_duration = 400
 
         if duration_ms < min_duration:
-            wwise_log(
-                client,
-                f"[警告]  {name}: 音频过短 ({duration_ms:.1f}ms < {min_duration}ms)，无法计算响度",
-                level="warning"
-            )
-            return None
+            # 过短的音频无法计算 Integrated / Momentary Max，补齐到 400ms 窗口估算（见 Short_Loudness.py）
+            from Short_Loudness import estimate_short_loudness, format_estimate
+            audio, sr = sf.read(file_path, dtype="float32")
+            estimate = estimate_short_loudness(audio, sr)
+            if estimate["lufs"] is None:
+                wwise_log(
+                    client,
+                    f"[警告]  {name}: 音频过短 ({duration_ms:.1f}ms < {min_duration}ms)，无法计算响度",
+                    level="warning"
+                )
+                return None
+            wwise_log(client, f"[估算]  {format_estimate(estimate)} - {name} ({duration_ms:.1f}ms)", level="info")
+            return estimate["lufs"]
 
         # 使用 ffmpeg 计算 Momentary Max 响度
         momentary_lufs = momentary_max(file_path)
@@ -179,9 +165,13 @@ def bfs_collect_objects(client, start_id, target_type):
 # 主程序
 # ============================================================
 if __name__ == "__main__":
+    # waapi（autobahn / asyncio）较重，放到连接前导入，启动报告中单独计时
+    from waapi import WaapiClient, CannotConnectToWaapiException
+    STARTUP.mark("waapi imported")
 
     try:
-        with WaapiClient(url=WAAPI_URL) as client:
+        with WaapiClient(url=WAAPI_URL) as client, log_sink(client):
+            STARTUP.checkpoint("WAAPI connected")
 
             raw_string = sys.argv[2].strip()
             wav_ids = raw_string.split()
@@ -215,6 +205,7 @@ if __name__ == "__main__":
             for sound in total_collected:
                 check_loudness(client, sound['originalWavFilePath'], sound['name'])
 
+            STARTUP.print_report()
             input("按回车键退出...")
 
     except CannotConnectToWaapiException:
@@ -1,21 +1,28 @@
-﻿import soundfile as sf
-import loudness
-import os
+﻿import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from startup_report import STARTUP
+
 import re
 import threading
-import sys
 import traceback
 from queue import Queue
-from waapi import WaapiClient, CannotConnectToWaapiException
 from pprint import pprint
 
 
 # 添加详细的错误处理
 def main():
+    # waapi（autobahn / asyncio）较重，放到连接前导入，启动报告中单独计时
+    from waapi import WaapiClient, CannotConnectToWaapiException
+    STARTUP.mark("waapi imported")
+
     try:
         print("程序启动...")
 
         with WaapiClient() as client:
+            STARTUP.checkpoint("WAAPI connected")
             print("成功连接到 Wwise WAAPI")
             result = client.call(
                 "ak.wwise.ui.getSelectedObjects",
@@ -25,6 +32,8 @@ def main():
             pprint(result["objects"])
             print('========================================')
 
+            # 过短的音频先收集起来，最后一起估算
+            short_clips = []
             for obj in result["objects"]:
                 my_id = obj['id']
                 sounds = process_single_id(my_id, client)
@@ -33,11 +42,15 @@ def main():
                     file_exists, processed_path = check_file_exists(sound['wav_path'])
                     # print(f"检查文件: {sound['name']} -> {processed_path}")
                     if file_exists:
-                        check_loudness(processed_path, sound['name'])
+                        check_loudness(processed_path, sound['name'], short_clips)
                     else:
                         print(f"[错误] 文件不存在: {sound['wav_path']}")
 
+            if short_clips:
+                estimate_short(short_clips)
+
         print("程序执行完成")
+        STARTUP.print_report()
         input("按回车键退出...")
 
     except CannotConnectToWaapiException:
@@ -137,10 +150,15 @@ def check_file_exists(file_path):
         return False, f"文件不存在: {normalized_path}"
 
 
-def check_loudness(file_path, name):
+def check_loudness(file_path, name, short_clips=None):
     """
     检查音频文件响度，处理短音频文件
+    short_clips: 传入列表时，过短的音频放入其中稍后用 estimate_short 一起估算，否则立即估算
     """
+    # soundfile / loudness 只在真正检查文件时才导入，不拖慢启动
+    import soundfile as sf
+    import loudness
+
     try:
         audio, sr = sf.read(file_path, dtype="float32")
 
@@ -149,8 +167,10 @@ def check_loudness(file_path, name):
         min_duration = 400  # 最小需要400ms
 
         if duration_ms < min_duration:
-            print(f"[警告] {name}: 音频过短 ({duration_ms:.1f}ms < {min_duration}ms)，无法计算响度")
-            return None
+            if short_clips is not None:
+                short_clips.append((name, audio, sr))
+                return None
+            return estimate_short([(name, audio, sr)])[0]
 
         lufs = loudness.integrated_loudness(audio, sr)
         print(f"{lufs:.2f} LUFS - {name} ({duration_ms:.1f}ms)")
@@ -161,5 +181,33 @@ def check_loudness(file_path, name):
         return None
 
 
+
+def estimate_short(short_clips):
+    """
+    批量估算过短的音频（见 Short_Loudness.py）
+
+    Args:
+        short_clips: [(name, audio, sr), ...]
+
+    Returns:
+        list: 每个音频的估算响度，无法估算时为 None
+    """
+    from Short_Loudness import estimate_short_batch, format_estimate
+
+    try:
+        estimates = estimate_short_batch([(audio, sr) for _, audio, sr in short_clips])
+    except Exception as e:
+        for name, _, _ in short_clips:
+            print(f"[错误] 估算短音频响度失败 {name}: {e}")
+        return [None] * len(short_clips)
+
+    for (name, _, _), estimate in zip(short_clips, estimates):
+        if estimate["lufs"] is None:
+            print(f"[警告] {name}: 音频过短 ({estimate['duration_ms']:.1f}ms)，无法计算响度")
+        else:
+            print(f"[估算] {format_estimate(estimate)} - {name} ({estimate['duration_ms']:.1f}ms)")
+    return [estimate["lufs"] for estimate in estimates]
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,6 +3,10 @@
 import pprint
 import sys
 import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from startup_report import STARTUP
+
 import pyperclip
 
 # 设置虚拟环境
@@ -34,9 +38,11 @@ def get_selected_guids_list():
 #     print("使用系统 Python 环境")
 
 
+STARTUP.checkpoint("ready")
 guids = get_selected_guids_list()
 pyperclip.copy(' '.join(guids))
 pprint.pprint(guids)
+STARTUP.print_report()
 
 
 
@@ -1,15 +1,20 @@
 ﻿
-from waapi import WaapiClient
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from startup_report import STARTUP
+
 from PySide6.QtWidgets import (
     QApplication, QWidget, QPushButton, QTableWidget, QTableWidgetItem,
     QHBoxLayout, QVBoxLayout, QMessageBox, QAbstractItemView
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from my_external_module import process_single_id, channel_C_LFE
-import json
-import os
+from selection_history import SelectionHistory
 
-JSON_PATH = "SelectedWwiseObject.json"
+JSON_PATH = "SelectedWwiseObject.json"          # 旧格式，首次运行时导入
+HISTORY_PATH = "SelectedWwiseObject.jsonl"
 TYPE_PRIORITY = {"State": 1, "Switch": 2, "Event": 3, "Sound": 4, "Other": 100}
 
 
@@ -54,12 +59,15 @@ class WwiseSelectionWindow(QWidget):
         main_layout.addWidget(self.table_widget)
         self.setLayout(main_layout)
 
+        self.history = SelectionHistory(HISTORY_PATH, TYPE_PRIORITY, legacy_path=JSON_PATH)
         self.refresh_table()
 
     # -----------------------------------------------------
     # 写入当前选中的对象
     # -----------------------------------------------------
     def write_selection(self):
+        # waapi 在第一次写入时才导入，窗口显示不等它
+        from waapi import WaapiClient
         try:
             with WaapiClient() as client:
                 selected = client.call(
@@ -75,24 +83,15 @@ class WwiseSelectionWindow(QWidget):
             QMessageBox.warning(self, "无选中对象", "请在Wwise中选中一个对象。")
             return
 
-        data = self.load_json()
-
-        for obj in selected.get("objects"):
-            obj_id = obj["id"]
-            obj_name = obj["name"]
-            obj_type = obj["type"]
-
-            # 检查是否重复
-            if not any(item["id"] == obj_id for item in data["history"]):
-                data["history"].append({
-                    "id": obj_id,
-                    "name": obj_name,
-                    "type": obj_type
-                })
-
-        # 保存并刷新
-        self.save_json(data)
-        self.refresh_table()
+        # 按 GUID 去重，只把新增的行插入表格
+        added = self.history.add_many(selected.get("objects"))
+        self.table_widget.setUpdatesEnabled(False)
+        try:
+            for row, item in added:
+                self.table_widget.insertRow(row)
+                self.set_row(row, item)
+        finally:
+            self.table_widget.setUpdatesEnabled(True)
 
     # -----------------------------------------------------
     # 删除选中行（多选）
@@ -106,13 +105,15 @@ class WwiseSelectionWindow(QWidget):
             QMessageBox.warning(self, "未选中", "请先选择要删除的记录。")
             return
 
-        data = self.load_json()
-        for row in selected_rows:
-            if row < len(data["history"]):
-                del data["history"][row]
+        ids = [self.table_widget.item(row, 0).data(Qt.UserRole) for row in selected_rows]
+        self.history.remove_many(ids)
 
-        self.save_json(data)
-        self.refresh_table()
+        self.table_widget.setUpdatesEnabled(False)
+        try:
+            for row in selected_rows:
+                self.table_widget.removeRow(row)
+        finally:
+            self.table_widget.setUpdatesEnabled(True)
 
     # -----------------------------------------------------
     # 清空所有记录
@@ -120,64 +121,29 @@ class WwiseSelectionWindow(QWidget):
     def clear_json(self):
         if os.path.exists(JSON_PATH):
             os.remove(JSON_PATH)
-        self.refresh_table()
+        self.history.clear()
+        self.table_widget.setRowCount(0)
 
     # -----------------------------------------------------
-    # 刷新表格（按类型优先级排序）
+    # 刷新表格（按类型优先级排序，只在启动时整表填充）
     # -----------------------------------------------------
     def refresh_table(self):
-        self.table_widget.setRowCount(0)
-        data = self.load_json()
-        new_history = []
-
-        # 自动修复旧格式
-        for item in data["history"]:
-            if isinstance(item, str):
-                new_history.append({
-                    "id": item,
-                    "name": "Unknown",
-                    "type": "Unknown"
-                })
-            else:
-                new_history.append(item)
-
-        # 按 TYPE 优先级排序
-        new_history.sort(key=lambda x: TYPE_PRIORITY.get(x["type"], 100))
-
-        # 保存修复和排序后的数据
-        data["history"] = new_history
-        self.save_json(data)
-
-        # 填充表格
-        self.table_widget.setRowCount(len(new_history))
-        for row, item in enumerate(new_history):
-            name_item = QTableWidgetItem(item["name"])
-            type_item = QTableWidgetItem(item["type"])
-            # 隐藏ID
-            name_item.setData(Qt.UserRole, item["id"])
-
-            self.table_widget.setItem(row, 0, name_item)
-            self.table_widget.setItem(row, 1, type_item)
+        items = list(self.history)
+        self.table_widget.setRowCount(len(items))
+        for row, item in enumerate(items):
+            self.set_row(row, item)
 
-    # -----------------------------------------------------
-    # JSON IO
-    # -----------------------------------------------------
-    def load_json(self):
-        if os.path.exists(JSON_PATH):
-            with open(JSON_PATH, "r", encoding="utf-8") as f:
-                try:
-                    return json.load(f)
-                except:
-                    return {"history": []}
-        return {"history": []}
+    def set_row(self, row, item):
+        name_item = QTableWidgetItem(item["name"])
+        type_item = QTableWidgetItem(item["type"])
+        # 隐藏ID
+        name_item.setData(Qt.UserRole, item["id"])
 
-    def save_json(self, data):
-        with open(JSON_PATH, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        self.table_widget.setItem(row, 0, name_item)
+        self.table_widget.setItem(row, 1, type_item)
 
     def call_external_function(self):
-        data = self.load_json()
-        id_list = [item["id"] if isinstance(item, dict) else item for item in data["history"]]
+        id_list = self.history.ids()
 
         if not id_list:
             QMessageBox.warning(self, "无数据", "当前 JSON 没有任何 ID。")
@@ -206,4 +172,8 @@ if __name__ == "__main__":
     app = QApplication([])
     win = WwiseSelectionWindow()
     win.show()
+    STARTUP.mark("window shown")
+    if STARTUP.exit_at_checkpoint:
+        # 事件循环跑起来（首帧绘制）后输出报告并退出；槽函数里抛 SystemExit 不会结束事件循环
+        QTimer.singleShot(0, lambda: (STARTUP.mark("event loop started"), STARTUP.print_report(), app.quit()))
     app.exec()
@@ -1,24 +1,28 @@
 ﻿import os
+import sys
 import json
 import threading
 from queue import Queue
-from waapi import WaapiClient
 from pprint import pprint
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from Json_Stream import StreamingJsonWriter, iter_json_records
+
 OUTPUT_JSON = "CollectedSounds.json"
-lock = threading.Lock()
 
 def process_single_id(id_list):
     """
     遍历 Wwise ID，收集所有 Sound 类型，写入 CollectedSounds.json
+    边遍历边写入临时文件，完成后替换，中途出错不会留下不完整的文件
     """
-    collected_sounds = []
-
     queue = Queue()
     for wid in id_list:
         queue.put(wid)
 
+    from waapi import WaapiClient
+
     # WaapiClient 只在主线程使用
-    with WaapiClient() as client:
+    with StreamingJsonWriter(OUTPUT_JSON, array_key="sounds") as writer, WaapiClient() as client:
 
         def worker():
             while not queue.empty():
@@ -36,8 +40,7 @@ def process_single_id(id_list):
                         c_name = child.get("name")
 
                         if c_type == "Sound":
-                            with lock:
-                                collected_sounds.append({"id": c_id, "name": c_name})
+                            writer.write({"id": c_id, "name": c_name})
                         elif c_type in ["Folder", "Event", "Actor-Mixer", "SwitchContainer", "StateGroup"]:
                             queue.put(c_id)
                 except Exception as e:
@@ -53,26 +56,20 @@ def process_single_id(id_list):
 
         queue.join()
 
-    # 先清空 JSON
-    if os.path.exists(OUTPUT_JSON):
-        with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-            f.write('{"sounds": []}')
-
-    # 写入收集结果
-    with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-        json.dump({"sounds": collected_sounds}, f, indent=4, ensure_ascii=False)
-
-    print(f"完成收集，共 {len(collected_sounds)} 个 Sound 写入 {OUTPUT_JSON}")
-    return len(collected_sounds)
+    print(f"完成收集，共 {writer.count} 个 Sound 写入 {OUTPUT_JSON}")
+    return writer.count
 
 
 def channel_C_LFE():
     """
-    读取 CollectedSounds.json 并打印所有 Sound ID
+    逐条读取 CollectedSounds.json 并设置所有 Sound 的声道
     """
+    count = 0
     try:
-        with open(OUTPUT_JSON, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        for s in iter_json_records(OUTPUT_JSON, array_key="sounds"):
+            setChannel(s["id"])
+            # print(s["id"])
+            count += 1
     except FileNotFoundError:
         print(f"[错误] 文件 {OUTPUT_JSON} 不存在")
         return
@@ -80,17 +77,15 @@ def channel_C_LFE():
         print(f"[错误] 文件 {OUTPUT_JSON} 不是有效 JSON")
         return
 
-    sounds = data.get("sounds", [])
-    if not sounds:
+    if not count:
         print("没有收集到任何 Sound")
         return
 
-    print(f"共 {len(sounds)} 个 Sound ID：")
-    for s in sounds:
-        setChannel(s["id"])
-        # print(s["id"])
+    print(f"共 {count} 个 Sound ID")
 
 def setChannel(sound_id):
+    from waapi import WaapiClient
+
     with WaapiClient() as client:
 
         result = client.call("ak.wwise.core.object.get", {
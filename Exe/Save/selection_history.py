@@ -0,0 +1,162 @@
+"""
+选择记录存储
+
+以 GUID 为键保存记录，按类型优先级分桶（同优先级内保持加入顺序），
+加入 / 删除都不需要扫描或重新排序整个列表，并能直接给出记录在表格中的行号。
+
+持久化为追加写入的 JSON Lines 操作日志，每次修改只追加几行：
+    {"op": "add", "id": "...", "name": "...", "type": "..."}
+    {"op": "remove", "id": "..."}
+清空时直接重写为空日志；加载时日志行数明显多于记录数则压缩重写一次。
+首次运行时从旧的 SelectedWwiseObject.json（{"history": [...]}）导入。
+"""
+
+import json
+import os
+from collections import OrderedDict
+
+DEFAULT_PRIORITY = 100
+
+
+class SelectionHistory:
+    def __init__(self, log_path, type_priority, legacy_path=None):
+        """
+        Args:
+            log_path: 操作日志路径（.jsonl）
+            type_priority: {类型: 优先级}，数值小的排在前面
+            legacy_path: 旧格式 JSON 路径，日志不存在时从中导入
+        """
+        self.log_path = log_path
+        self.type_priority = type_priority
+        self.buckets = {}   # 优先级 -> OrderedDict(id -> item)
+        self.index = {}     # id -> 优先级
+        self._load(legacy_path)
+
+    # --------------------------------------------------------
+    # 查询
+    # --------------------------------------------------------
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, obj_id):
+        return obj_id in self.index
+
+    def __iter__(self):
+        """按类型优先级输出记录"""
+        for priority in sorted(self.buckets):
+            yield from self.buckets[priority].values()
+
+    def ids(self):
+        return [item["id"] for item in self]
+
+    def _priority(self, obj_type):
+        return self.type_priority.get(obj_type, DEFAULT_PRIORITY)
+
+    def _row_of_last(self, priority):
+        """优先级 priority 的桶中最后一条记录的行号"""
+        return sum(len(bucket) for p, bucket in self.buckets.items() if p <= priority) - 1
+
+    # --------------------------------------------------------
+    # 修改
+    # --------------------------------------------------------
+    def _insert(self, item):
+        priority = self._priority(item["type"])
+        self.buckets.setdefault(priority, OrderedDict())[item["id"]] = item
+        self.index[item["id"]] = priority
+        return self._row_of_last(priority)
+
+    def add_many(self, objects):
+        """
+        加入记录，已存在的 GUID 跳过
+
+        Returns:
+            list: [(行号, 记录)]，按加入顺序依次插入表格即可与排序结果一致
+        """
+        added = []
+        for obj in objects:
+            if obj["id"] in self.index:
+                continue
+            item = {"id": obj["id"], "name": obj.get("name", "Unknown"), "type": obj.get("type", "Unknown")}
+            added.append((self._insert(item), item))
+        self._append([{"op": "add", **item} for _, item in added])
+        return added
+
+    def _discard(self, obj_id):
+        priority = self.index.pop(obj_id, None)
+        if priority is None:
+            return False
+        del self.buckets[priority][obj_id]
+        if not self.buckets[priority]:
+            del self.buckets[priority]
+        return True
+
+    def remove_many(self, ids):
+        """删除记录，返回实际删除的数量"""
+        removed = [obj_id for obj_id in ids if self._discard(obj_id)]
+        self._append([{"op": "remove", "id": obj_id} for obj_id in removed])
+        return len(removed)
+
+    def clear(self):
+        self.buckets.clear()
+        self.index.clear()
+        self._rewrite()
+
+    # --------------------------------------------------------
+    # 持久化
+    # --------------------------------------------------------
+    def _append(self, ops):
+        if not ops:
+            return
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops))
+
+    def _rewrite(self):
+        """把当前记录压缩写成新的日志（临时文件 + 替换）"""
+        tmp_path = self.log_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for item in self:
+                f.write(json.dumps({"op": "add", **item}, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.log_path)
+
+    def _load(self, legacy_path):
+        if not os.path.exists(self.log_path):
+            if legacy_path and os.path.exists(legacy_path):
+                for item in _read_legacy(legacy_path):
+                    if item["id"] not in self.index:
+                        self._insert(item)
+                self._rewrite()
+            return
+
+        line_count = 0
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line_count += 1
+                try:
+                    op = json.loads(line)
+                except json.JSONDecodeError:
+                    # 写到一半中断的最后一行
+                    continue
+                if op.get("op") == "add" and op.get("id") not in self.index:
+                    self._insert({"id": op["id"], "name": op.get("name", "Unknown"), "type": op.get("type", "Unknown")})
+                elif op.get("op") == "remove":
+                    self._discard(op.get("id"))
+
+        if line_count > 2 * len(self) + 100:
+            self._rewrite()
+
+
+def _read_legacy(path):
+    """读取旧格式 {"history": [...]}，兼容更早的纯字符串 ID"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            history = json.load(f).get("history", [])
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return []
+
+    items = []
+    for item in history:
+        if isinstance(item, str):
+            items.append({"id": item, "name": "Unknown", "type": "Unknown"})
+        elif isinstance(item, dict) and "id" in item:
+            items.append({"id": item["id"], "name": item.get("name", "Unknown"), "type": item.get("type", "Unknown")})
+    return items
@@ -1,7 +1,21 @@
 import json
 import os
+import tempfile
+import threading
 from typing import Any, Dict, Union
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_default(obj):
+    """提供 to_dict() 的对象（如 WwiseObjectRecord）在序列化时才转换为 dict"""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 
 class JSONHandler:
     """
@@ -30,7 +44,7 @@ class JSONHandler:
         """
         try:
             with open(self.filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+                json.dump(data, f, ensure_ascii=False, indent=4, default=_json_default)
             return True
         except Exception as e:
             print(f"写入JSON文件时出错: {e}")
@@ -231,25 +245,208 @@ class JSONHandler:
         return data.get(obj_id, {})
 
 
-def save_wwise_objects_to_json(objects: list, filename: str = "test_config.json") -> bool:
+class CachedJSONHandler(JSONHandler):
+    """
+    带内存缓存、批量写入的JSON处理器
+    
+    JSONHandler 的 update_json / add_multiple / delete_multiple 每次都要重新读取并写入整个文件。
+    这里首次读取后把数据保存在内存中，修改只更新缓存并标记为 dirty，
+    在以下时机一次性原子写入（临时文件 + os.replace）：
+    - 显式调用 flush()
+    - with 语句退出
+    - 设置了 debounce 时，最后一次修改后 debounce 秒内没有新的修改
+    
+    用法:
+        with CachedJSONHandler("wwise_selected_objects.json") as handler:
+            for obj in objects:
+                handler.update_json(obj["id"], obj)   # 只修改内存
+        # 退出时写入一次
+    """
+    
+    BACKENDS = ("json", "compact", "orjson")
+    
+    def __init__(self, filename: str = "config.json", debounce: float = None, backend: str = "json"):
+        """
+        初始化缓存JSON处理器
+        
+        Args:
+            filename: JSON文件名
+            debounce: 自动写入的延迟秒数，None 表示只在 flush / 退出时写入
+            backend: 序列化方式
+                json    - 与 JSONHandler 相同的 indent=4 格式
+                compact - 无缩进的 JSON，文件更小、写入更快
+                orjson  - 使用 orjson（未安装时退回 compact）
+        """
+        super().__init__(filename)
+        if backend not in self.BACKENDS:
+            raise ValueError(f"未知的 backend: {backend}，可选: {', '.join(self.BACKENDS)}")
+        if backend == "orjson" and orjson is None:
+            print("未安装 orjson，使用 compact 格式")
+            backend = "compact"
+        self.backend = backend
+        self.debounce = debounce
+        self.write_count = 0
+        self._data = None
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.RLock()
+    
+    # ---------- 缓存 ----------
+    
+    def _cache(self) -> Dict[str, Any]:
+        """返回缓存数据，首次调用时从文件加载"""
+        with self._lock:
+            if self._data is None:
+                self._data = super().read_from_json({}) if os.path.exists(self.filename) else {}
+            return self._data
+    
+    def _mark_dirty(self) -> bool:
+        self._dirty = True
+        if self.debounce is not None:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+        return True
+    
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+    
+    # ---------- 读取 ----------
+    
+    def read_from_json(self, default_data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        读取数据（来自缓存，返回浅拷贝）
+        
+        Args:
+            default_data: 如果文件不存在且没有缓存数据，返回的默认数据
+            
+        Returns:
+            Dict[str, Any]: 数据字典
+        """
+        with self._lock:
+            data = self._cache()
+            if not data and not os.path.exists(self.filename) and default_data is not None:
+                return default_data
+            return dict(data)
+    
+    def get_value(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._cache().get(key, default)
+    
+    def get_object_ids(self) -> list:
+        with self._lock:
+            return list(self._cache().keys())
+    
+    def get_object_by_id(self, obj_id: str) -> dict:
+        with self._lock:
+            return self._cache().get(obj_id, {})
+    
+    # ---------- 修改（只改缓存） ----------
+    
+    def write_to_json(self, data: Dict[str, Any]) -> bool:
+        with self._lock:
+            self._data = dict(data)
+            return self._mark_dirty()
+    
+    def update_json(self, key: str, value: Any) -> bool:
+        with self._lock:
+            self._cache()[key] = value
+            return self._mark_dirty()
+    
+    def add_multiple(self, data_dict: Dict[str, Any]) -> bool:
+        with self._lock:
+            self._cache().update(data_dict)
+            return self._mark_dirty()
+    
+    def delete_multiple(self, keys: list) -> bool:
+        with self._lock:
+            data = self._cache()
+            for key in keys:
+                data.pop(key, None)
+            return self._mark_dirty()
+    
+    def clear_all(self) -> bool:
+        return self.write_to_json({})
+    
+    # ---------- 写入 ----------
+    
+    def _serialize(self, data: Dict[str, Any]) -> bytes:
+        if self.backend == "orjson":
+            return orjson.dumps(data, default=_json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        if self.backend == "compact":
+            return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+        return json.dumps(data, ensure_ascii=False, indent=4, default=_json_default).encode("utf-8")
+    
+    def flush(self) -> bool:
+        """
+        把缓存原子写入文件，没有修改时不写
+        
+        Returns:
+            bool: 写入是否成功
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return True
+            
+            tmp_path = None
+            try:
+                payload = self._serialize(self._data)
+                directory = os.path.dirname(os.path.abspath(self.filename))
+                fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.filename) + ".", suffix=".tmp",
+                                                dir=directory)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.filename)
+                tmp_path = None
+                self._dirty = False
+                self.write_count += 1
+                return True
+            except Exception as e:
+                print(f"写入JSON文件时出错: {e}")
+                return False
+            finally:
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+    
+    def close(self) -> bool:
+        return self.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+
+def save_wwise_objects_to_json(objects: list, filename: str = "test_config.json",
+                               handler: CachedJSONHandler = None) -> bool:
     """
-    将Wwise对象列表保存到JSON文件
+    将Wwise对象列表保存到JSON文件（读取一次、原子写入一次）
     
     Args:
         objects: Wwise对象列表，每个对象应包含id、name、type等字段
         filename: JSON文件名
+        handler: 复用已有的 CachedJSONHandler（之后可直接从其缓存读取），为 None 时按 filename 创建
         
     Returns:
         bool: 保存是否成功
     """
-    handler = JSONHandler(filename)
+    handler = handler or CachedJSONHandler(filename)
     
     # 创建字典，以ID为键存储对象信息
     data_dict = {}
     for obj in objects:
         data_dict[obj['id']] = obj
     
-    return handler.add_multiple(data_dict)
+    handler.add_multiple(data_dict)
+    return handler.flush()
 
 
 # 使用示例和测试函数
@@ -17,11 +17,15 @@ Wwise 对象分析器函数库
 版本: 1.0
 """
 
-from waapi import WaapiClient
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
 import threading
 import time
 
+from object_record import to_records
+
+# 遍历时需要取回的字段，类型处理函数只使用这些字段
+DETAIL_FIELDS = ["id", "name", "type", "path", "classId", "ChannelConfigOverride"]
+
 
 class ObjectTypeProcessor:
     """
@@ -104,23 +108,41 @@ class ParallelWwiseTraverser:
     """
     并行 Wwise 对象遍历器
     
-    采用广度优先+深度优先的多线程遍历策略：
-    1. 广度优先获取第一层子对象
-    2. 为每个子树开启独立线程进行深度优先遍历
-    3. 合并所有线程的结果
+    两种遍历模式：
+    - 单次查询（默认）：一次 descendants 查询取回所有根对象的整棵子树及全部字段
+    - 逐节点遍历：
+        1. 广度优先获取第一层子对象
+        2. 多线程工作窃取遍历（每个节点 2 次调用）
+        3. 合并所有线程的结果
     """
 
-    def __init__(self, client, max_workers=8):
+    def __init__(self, client, max_workers=8, single_pass=True):
         """
         初始化遍历器
         
         Args:
             client: WAAPI 客户端实例
             max_workers: 最大线程数，默认8个
+            single_pass: 是否使用单次 descendants 查询
         """
         self.client = client
         self.max_workers = max_workers
+        self.single_pass = single_pass
         self.lock = threading.Lock()
+        # 统计信息
+        self.call_count = 0
+        self.node_count = 0
+
+    def _call(self, uri, args):
+        """调用 WAAPI 并计数"""
+        with self.lock:
+            self.call_count += 1
+        return self.client.call(uri, args)
+
+    def reset_stats(self):
+        with self.lock:
+            self.call_count = 0
+            self.node_count = 0
 
     def get_children_ids(self, object_id):
         """
@@ -133,7 +155,7 @@ class ParallelWwiseTraverser:
             list: 子对象ID和类型的元组列表 [(id, type), ...]
         """
         try:
-            result = self.client.call("ak.wwise.core.object.get", {
+            result = self._call("ak.wwise.core.object.get", {
                 "from": {"id": [object_id]},
                 "transform": [{"select": ["children"]}],
                 "options": {"return": ["id", "name", "type"]}
@@ -158,10 +180,10 @@ class ParallelWwiseTraverser:
             list: 符合条件的对象信息列表
         """
         try:
-            result = self.client.call("ak.wwise.core.object.get", {
+            result = self._call("ak.wwise.core.object.get", {
                 "from": {"id": [object_id]},
                 "options": {
-                    "return": ["id", "name", "type", "path", "classId", "ChannelConfigOverride"]
+                    "return": DETAIL_FIELDS
                 }
             })
 
@@ -169,13 +191,43 @@ class ParallelWwiseTraverser:
             if "return" in result and result["return"]:
                 current_obj = result["return"][0]
                 if object_type_filter is None or current_obj.get("type") == object_type_filter:
-                    objects.append(current_obj)
+                    objects.extend(to_records([current_obj]))
 
             return objects
         except Exception as e:
             print(f"获取对象详情时出错 {object_id}: {e}")
             return []
 
+    def fetch_descendants(self, root_ids, object_type_filter=None):
+        """
+        单次查询：一次 descendants 查询取回所有根对象的子树（不含根对象本身）
+        
+        Args:
+            root_ids: 根对象ID列表
+            object_type_filter: 对象类型过滤器，在本地过滤
+            
+        Returns:
+            list: 子树中的所有对象记录（WwiseObjectRecord），查询失败时返回 None
+        """
+        try:
+            result = self._call("ak.wwise.core.object.get", {
+                "from": {"id": list(root_ids)},
+                "transform": [{"select": ["descendants"]}],
+                "options": {"return": DETAIL_FIELDS}
+            })
+        except Exception as e:
+            print(f"获取子树时出错: {e}")
+            return None
+
+        descendants = result.get("return", [])
+        with self.lock:
+            self.node_count += len(descendants)
+        print(f"🎯 找到 {len(root_ids)} 个根对象，单次查询取回 {len(descendants)} 个子对象")
+
+        if object_type_filter is not None:
+            descendants = [obj for obj in descendants if obj.get("type") == object_type_filter]
+        return to_records(descendants)
+
     def parallel_deep_traverse(self, root_ids, object_type_filter=None):
         """
         并行深度优先遍历主函数
@@ -187,8 +239,12 @@ class ParallelWwiseTraverser:
         Returns:
             list: 所有遍历到的对象信息列表
         """
-        all_objects = []
-        
+        if self.single_pass:
+            objects = self.fetch_descendants(root_ids, object_type_filter)
+            if objects is not None:
+                return objects
+            print("⚠️ 单次查询失败，改用逐节点遍历")
+
         # 第一步：为每个根对象广度优先获取第一层子对象
         all_first_level_children = []
         root_info = []
@@ -204,53 +260,101 @@ class ParallelWwiseTraverser:
             print(f"   - 对象 {root_id}: {child_count} 个直接子对象")
         print(f"🚀 总共 {total_children} 个子树，启动 {min(self.max_workers, total_children)} 个线程进行并行处理...")
         
-        # 第二步：使用线程池并行处理每个子树
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # 提交所有子树的任务
-            future_to_child = {
-                executor.submit(self._traverse_subtree, child_id, object_type_filter): child_id 
-                for child_id, child_type in all_first_level_children
-            }
-            
-            # 收集结果
-            completed_count = 0
-            for future in as_completed(future_to_child):
-                child_id = future_to_child[future]
-                completed_count += 1
-                try:
-                    subtree_objects = future.result()
-                    with self.lock:
-                        all_objects.extend(subtree_objects)
-                    print(f"✅ 完成子树 {completed_count}/{total_children}")
-                except Exception as e:
-                    print(f"❌ 处理子对象 {child_id} 时出错: {e}")
-        
-        return all_objects
+        # 第二步：工作窃取调度，遍历中发现的每个子对象都是一个新任务
+        return self._work_stealing_traverse([child_id for child_id, child_type in all_first_level_children],
+                                            object_type_filter)
 
-    def _traverse_subtree(self, root_id, object_type_filter=None):
+    def _work_stealing_traverse(self, seed_ids, object_type_filter=None):
         """
-        遍历单个子树（递归深度优先）
+        工作窃取遍历
+        
+        每个线程有自己的双端队列：处理节点后把子对象压入自己队列的尾部并从尾部取任务（深度优先），
+        自己的队列空了就从其他线程队列的头部窃取（通常是层级较高、子树较大的节点）。
+        一个很大的 Work Unit 会被拆散到所有线程上，不会只让一个线程忙。
         
         Args:
-            root_id: 子树根节点ID
+            seed_ids: 初始任务（节点ID列表）
             object_type_filter: 对象类型过滤器
             
         Returns:
-            list: 子树中的所有对象信息
+            list: 所有遍历到的对象信息
         """
-        objects = []
-
-        # 获取当前对象的详细信息
-        current_objects = self.get_object_details(root_id, object_type_filter)
-        objects.extend(current_objects)
-
-        # 递归获取子对象
-        children = self.get_children_ids(root_id)
-        for child_id, child_type in children:
-            child_objects = self._traverse_subtree(child_id, object_type_filter)
-            objects.extend(child_objects)
+        worker_count = max(1, min(self.max_workers, len(seed_ids)))
+        deques = [deque() for _ in range(worker_count)]
+        for i, object_id in enumerate(seed_ids):
+            deques[i % worker_count].append(object_id)
+
+        # 尚未完成的任务数，为 0 时所有线程退出
+        pending = [len(seed_ids)]
+        pending_lock = threading.Lock()
+        results = [[] for _ in range(worker_count)]
+        stats = [{"busy": 0.0, "tasks": 0, "steals": 0} for _ in range(worker_count)]
+
+        def take_task(index):
+            try:
+                return deques[index].pop()
+            except IndexError:
+                pass
+            # 从其他线程队列的头部窃取，起点错开避免都去偷同一个
+            for offset in range(1, worker_count):
+                try:
+                    object_id = deques[(index + offset) % worker_count].popleft()
+                    stats[index]["steals"] += 1
+                    return object_id
+                except IndexError:
+                    continue
+            return None
 
-        return objects
+        def worker(index):
+            while True:
+                object_id = take_task(index)
+                if object_id is None:
+                    with pending_lock:
+                        if pending[0] == 0:
+                            return
+                    time.sleep(0.001)
+                    continue
+
+                task_start = time.perf_counter()
+                try:
+                    with self.lock:
+                        self.node_count += 1
+                    results[index].extend(self.get_object_details(object_id, object_type_filter))
+                    children = self.get_children_ids(object_id)
+                    with pending_lock:
+                        pending[0] += len(children)
+                    deques[index].extend(child_id for child_id, child_type in children)
+                except Exception as e:
+                    print(f"❌ 处理对象 {object_id} 时出错: {e}")
+                finally:
+                    with pending_lock:
+                        pending[0] -= 1
+                    stats[index]["busy"] += time.perf_counter() - task_start
+                    stats[index]["tasks"] += 1
+
+        wall_start = time.perf_counter()
+        threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(worker_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall_time = time.perf_counter() - wall_start
+
+        self._print_utilization(stats, wall_time)
+        return [obj for worker_results in results for obj in worker_results]
+
+    @staticmethod
+    def _print_utilization(stats, wall_time):
+        """显示每个线程的利用率直方图"""
+        if not stats or wall_time <= 0:
+            return
+        total_busy = sum(stat["busy"] for stat in stats)
+        print(f"\n🧵 线程利用率 (墙钟 {wall_time:.2f} 秒，总工作量 / 线程数 = {total_busy / len(stats):.2f} 秒):")
+        for index, stat in enumerate(stats):
+            utilization = min(stat["busy"] / wall_time, 1.0)
+            bar = "█" * round(utilization * 30)
+            print(f"   线程 {index:2d} {bar:<30} {utilization * 100:5.1f}%  "
+                  f"任务 {stat['tasks']:5d}  窃取 {stat['steals']:4d}")
 
     def get_objects_details(self, object_ids):
         """
@@ -263,14 +367,14 @@ class ParallelWwiseTraverser:
             list: 对象详细信息列表
         """
         try:
-            result = self.client.call("ak.wwise.core.object.get", {
+            result = self._call("ak.wwise.core.object.get", {
                 "from": {"id": object_ids},
                 "options": {
-                    "return": ["id", "name", "type", "path", "classId"]
+                    "return": DETAIL_FIELDS
                 }
             })
             
-            return result.get("return", [])
+            return to_records(result.get("return", []))
         except Exception as e:
             print(f"获取对象详情时出错: {e}")
             return []
@@ -287,16 +391,17 @@ class WwiseObjectAnalyzer:
     - 层次结构展示
     """
 
-    def __init__(self, client, max_workers=8):
+    def __init__(self, client, max_workers=8, single_pass=True):
         """
         初始化分析器
         
         Args:
             client: WAAPI 客户端实例
             max_workers: 最大线程数
+            single_pass: 是否使用单次 descendants 查询遍历
         """
         self.client = client
-        self.traverser = ParallelWwiseTraverser(client, max_workers)
+        self.traverser = ParallelWwiseTraverser(client, max_workers, single_pass)
         self.processor = ObjectTypeProcessor()
 
     def analyze_by_ids(self, object_ids, object_type_filter=None):
@@ -308,14 +413,18 @@ class WwiseObjectAnalyzer:
             object_type_filter: 可选的对象类型过滤器
             
         Returns:
-            list: 所有分析到的对象数据，包含ID、名称、类型等信息
+            list: 所有分析到的对象记录（WwiseObjectRecord，可按 dict 方式访问），包含ID、名称、类型等信息
         """
         if not object_ids:
             print("❌ 对象ID列表为空")
             return None
 
+        # 去掉重复的ID（保持顺序）
+        object_ids = list(dict.fromkeys(object_ids))
+
         print(f"🎯 开始分析 {len(object_ids)} 个对象:")
         print("=" * 60)
+        self.traverser.reset_stats()
         
         # 获取根对象的详细信息
         root_objects = self.traverser.get_objects_details(object_ids)
@@ -328,20 +437,26 @@ class WwiseObjectAnalyzer:
         
         print("=" * 60)
         
+        # 已包含在其他选中对象子树中的根对象不再单独遍历
+        covered = self._find_covered_roots(root_objects)
+        traverse_ids = [obj_id for obj_id in object_ids if obj_id not in covered]
+        if covered:
+            print(f"🔗 {len(covered)} 个对象已包含在其他选中对象的子树中，跳过重复遍历:")
+            for obj_id, parent_id in covered.items():
+                print(f"   - {obj_id} ⊂ {parent_id}")
+
         # 并行遍历所有对象及其子对象
         print("\n🔍 开始并行遍历所有对象及其子对象...")
         start_time = time.time()
-        all_objects = self.traverser.parallel_deep_traverse(object_ids, object_type_filter)
+        all_objects = self.traverser.parallel_deep_traverse(traverse_ids, object_type_filter)
         elapsed_time = time.time() - start_time
         
-        # 将根对象也加入到结果中
-        root_objects_in_result = []
+        # 将根对象也加入到结果中（用ID集合去重）
+        seen_ids = {obj.get('id') for obj in all_objects}
         for root_obj in root_objects:
-            # 检查是否已经在结果中（避免重复）
-            if not any(obj.get('id') == root_obj.get('id') for obj in all_objects):
-                root_objects_in_result.append(root_obj)
-        
-        all_objects.extend(root_objects_in_result)
+            if root_obj.get('id') not in seen_ids:
+                seen_ids.add(root_obj.get('id'))
+                all_objects.append(root_obj)
         
         # 按类型处理对象
         self._process_objects_by_type(all_objects)
@@ -354,6 +469,34 @@ class WwiseObjectAnalyzer:
         
         return all_objects
 
+    @staticmethod
+    def _find_covered_roots(root_objects):
+        """
+        找出位于其他选中对象子树中的根对象
+        
+        根对象的路径以另一个根对象的路径 + "\\" 开头即视为被包含
+        
+        Args:
+            root_objects: 根对象信息列表（需包含 path）
+            
+        Returns:
+            dict: {被包含的对象ID: 包含它的根对象ID}
+        """
+        root_paths = {obj['path']: obj['id'] for obj in root_objects if obj.get('path')}
+        covered = {}
+        for obj in root_objects:
+            path = obj.get('path')
+            if not path:
+                continue
+            parts = path.split("\\")
+            # 从最近的祖先开始向上查找
+            for i in range(len(parts) - 1, 1, -1):
+                ancestor_id = root_paths.get("\\".join(parts[:i]))
+                if ancestor_id is not None:
+                    covered[obj['id']] = ancestor_id
+                    break
+        return covered
+
     def _process_objects_by_type(self, objects):
         """
         根据对象类型执行不同的处理函数
@@ -425,6 +568,15 @@ class WwiseObjectAnalyzer:
         print(f"📦 处理对象总数: {total_count} 个")
         print(f"⏱️  总耗时: {elapsed_time:.2f} 秒")
 
+        # WAAPI 调用次数：逐节点遍历每个节点需要 2 次调用（详情 + 子对象），
+        # 另加每个根对象 1 次第一层子对象查询和 1 次根对象详情查询
+        traverser = self.traverser
+        node_based_calls = 2 * traverser.node_count + root_count + 1
+        mode = "单次查询" if traverser.single_pass else "逐节点遍历"
+        print(f"🌐 WAAPI 调用: {traverser.call_count} 次 [{mode}]，遍历节点 {traverser.node_count} 个")
+        if traverser.single_pass and traverser.call_count:
+            print(f"   逐节点遍历约需 {node_based_calls} 次，减少 {node_based_calls / traverser.call_count:.0f} 倍")
+
     def _show_hierarchies(self, object_ids, root_objects):
         """
         显示层次结构
@@ -475,7 +627,7 @@ class WwiseObjectAnalyzer:
 # 入口函数 - 主要调用接口
 # =============================================================================
 
-def analyze_custom_objects(object_ids, max_workers=6, object_type_filter=None):
+def analyze_custom_objects(object_ids, max_workers=6, object_type_filter=None, single_pass=True):
     """
     🎯 主要入口函数 - 在其他地方调用此函数进行分析
     
@@ -489,6 +641,7 @@ def analyze_custom_objects(object_ids, max_workers=6, object_type_filter=None):
         object_ids (list): Wwise对象ID列表，例如 ["{id1}", "{id2}"]
         max_workers (int, optional): 最大线程数，默认6个. 
         object_type_filter (str, optional): 对象类型过滤器，例如 "AudioFileSource"
+        single_pass (bool, optional): 使用单次 descendants 查询遍历，默认 True
         
     Returns:
         list: 包含所有分析到的对象数据的列表，每个对象包含id、name、type、path等信息
@@ -516,9 +669,11 @@ def analyze_custom_objects(object_ids, max_workers=6, object_type_filter=None):
              for obj in result:
                  print(f"对象: {obj['name']} [{obj['type']}]")
     """
+    from waapi import WaapiClient
+
     try:
         with WaapiClient() as client:
-            analyzer = WwiseObjectAnalyzer(client, max_workers)
+            analyzer = WwiseObjectAnalyzer(client, max_workers, single_pass)
             return analyzer.analyze_by_ids(object_ids, object_type_filter)
     except Exception as e:
         print(f"❌ 分析自定义对象时出错: {e}")
@@ -534,6 +689,8 @@ def analyze_selected_objects():
     Returns:
         list: 分析结果对象列表，失败返回None
     """
+    from waapi import WaapiClient
+
     try:
         with WaapiClient() as client:
             # 获取选中的对象
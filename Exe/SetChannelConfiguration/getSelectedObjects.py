@@ -1,13 +1,23 @@
 #!/usr/bin/env python3
-from waapi import WaapiClient, CannotConnectToWaapiException
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from startup_report import STARTUP
+
 from pprint import pprint
-from Json.json_handler import save_wwise_objects_to_json, JSONHandler
+from Json.json_handler import save_wwise_objects_to_json, CachedJSONHandler
 from functionLibrary import WwiseObjectAnalyzer
 
 def main():
     """获取Wwise选中的对象并保存到JSON，然后使用多线程分析功能"""
+    # waapi（autobahn / asyncio）较重，放到连接前导入，启动报告中单独计时
+    from waapi import WaapiClient, CannotConnectToWaapiException
+    STARTUP.mark("waapi imported")
+
     try:
         with WaapiClient() as client:
+            STARTUP.checkpoint("WAAPI connected")
             result = client.call(
                 "ak.wwise.ui.getSelectedObjects",
                 options ={"return": ['id',"type", "name"]}
@@ -20,13 +30,11 @@ def main():
                 pprint('=========================================')
                 pprint(id)
                 
-                # 使用封装的函数保存Wwise对象
-                if save_wwise_objects_to_json(result["objects"], "wwise_selected_objects.json"):
+                # 使用封装的函数保存Wwise对象，之后直接从同一个缓存读取，不再重新读文件
+                handler = CachedJSONHandler("wwise_selected_objects.json")
+                if save_wwise_objects_to_json(result["objects"], handler=handler):
                     print("Wwise对象保存成功！")
                     
-                    # 创建JSONHandler实例来获取对象ID
-                    handler = JSONHandler("wwise_selected_objects.json")
-                    
                     # 获取所有对象ID
                     selected_ids = handler.get_object_ids()
                     print(f"\n所有对象ID: {selected_ids}")
@@ -38,8 +46,9 @@ def main():
                     
                     # 保存分析结果到JSON
                     if analysis_results:
-                        analysis_handler = JSONHandler("wwise_analysis_results.json")
-                        if analysis_handler.write_to_json({"analysis_results": analysis_results}):
+                        analysis_handler = CachedJSONHandler("wwise_analysis_results.json")
+                        analysis_handler.write_to_json({"analysis_results": analysis_results})
+                        if analysis_handler.flush():
                             print("\n分析结果已保存到 wwise_analysis_results.json")
                         
                         print(f"\n=== 分析完成 ===")
@@ -60,3 +69,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    STARTUP.print_report()
@@ -0,0 +1,105 @@
+"""
+紧凑的 Wwise 对象记录
+
+遍历大型工程时会得到十万级的对象，每个 WAAPI 返回的 dict 都带一张哈希表。
+WwiseObjectRecord 使用 __slots__ 存储同样的字段：
+- GUID 以 16 字节存储，访问 id 时再格式化为 "{XXXXXXXX-...}"
+- 类型名做 sys.intern，所有同类型对象共用一个字符串
+- WAAPI 没有返回的字段不占用槽位，"key in record" 与 dict 行为一致
+
+支持 get / [] / in / keys，现有按 dict 访问的处理函数无需修改；
+只在序列化时通过 to_dict() 转成 dict（JSONHandler 写文件时自动调用）。
+"""
+
+import sys
+import uuid
+
+# WAAPI 字段名 -> 槽位名
+FIELD_SLOTS = {
+    "name": "name",
+    "type": "type",
+    "path": "path",
+    "classId": "class_id",
+    "ChannelConfigOverride": "channel_config",
+}
+
+_MISSING = object()
+
+
+class WwiseObjectRecord:
+    __slots__ = ("_guid", "name", "type", "path", "class_id", "channel_config", "_extra")
+
+    @classmethod
+    def from_waapi(cls, obj):
+        """从 WAAPI 返回的 dict 创建记录，未知字段保存在 _extra 中"""
+        record = cls()
+        record._extra = None
+        for key, value in obj.items():
+            if key == "id":
+                record._guid = _pack_guid(value)
+            elif key == "type":
+                record.type = sys.intern(value)
+            elif key in FIELD_SLOTS:
+                setattr(record, FIELD_SLOTS[key], value)
+            else:
+                if record._extra is None:
+                    record._extra = {}
+                record._extra[key] = value
+        return record
+
+    @property
+    def id(self):
+        guid = self._guid
+        if isinstance(guid, bytes):
+            return "{" + str(uuid.UUID(bytes=guid)).upper() + "}"
+        return guid
+
+    # --------------------------------------------------------
+    # 与 dict 兼容的访问方式
+    # --------------------------------------------------------
+    def get(self, key, default=None):
+        if key == "id":
+            return self.id if hasattr(self, "_guid") else default
+        slot = FIELD_SLOTS.get(key)
+        if slot is not None:
+            return getattr(self, slot, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self):
+        if hasattr(self, "_guid"):
+            yield "id"
+        for key, slot in FIELD_SLOTS.items():
+            if hasattr(self, slot):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def to_dict(self):
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self):
+        return f"WwiseObjectRecord({self.to_dict()!r})"
+
+
+def _pack_guid(guid):
+    """"{AE8F5D36-...}" -> 16 字节，无法解析时保留原字符串"""
+    try:
+        return uuid.UUID(guid.strip("{}")).bytes
+    except (AttributeError, ValueError):
+        return guid
+
+
+def to_records(objects):
+    """把 WAAPI 返回的 dict 列表转换为记录列表"""
+    return [WwiseObjectRecord.from_waapi(obj) for obj in objects]
@@ -1,5 +1,45 @@
-﻿from waapi import WaapiClient, CannotConnectToWaapiException
+﻿import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from startup_report import STARTUP
+
 from pprint import pprint
+from SoundBankGenerationLog import SoundBankLogCapture
+
+GENERATION_LOG = "SoundBankGeneration.jsonl"
+
+def query_platforms_languages(client):
+    """
+    使用已连接的 client 查询平台和语言（不新建连接）
+
+    Returns:
+        tuple: (platforms_array, languages_array)
+    """
+    # 获取所有平台
+    platforms_result = client.call("ak.wwise.core.object.get", {
+        "waql": "from type platform"
+    }, options={
+        "return": ["id", "name"]
+    })
+
+    # 获取所有语言
+    languages_result = client.call("ak.wwise.core.object.get", {
+        "waql": "from type language"
+    }, options={
+        "return": ["id", "name"]
+    })
+
+    # 过滤掉不需要的平台（如WwiseAuthoringPlayback）
+    platforms = [platform['name'] for platform in platforms_result['return']
+                 if platform['name'] != 'WwiseAuthoringPlayback']
+
+    # 过滤掉不需要的语言（根据您的需求调整）
+    languages = [language['name'] for language in languages_result['return']
+                 if language['name'] not in ['Mixed', 'External', 'SFX']]
+
+    return platforms, languages
+
 
 def get_wwise_platforms_languages():
     """
@@ -8,29 +48,11 @@ def get_wwise_platforms_languages():
     Returns:
         tuple: 包含两个数组的元组 (platforms_array, languages_array)
     """
+    from waapi import WaapiClient, CannotConnectToWaapiException
+
     try:
         with WaapiClient() as client:
-            # 获取所有平台
-            platforms_result = client.call("ak.wwise.core.object.get", {
-                "waql": "from type platform"
-            }, options={
-                "return": ["id", "name"]
-            })
-
-            # 获取所有语言
-            languages_result = client.call("ak.wwise.core.object.get", {
-                "waql": "from type language"
-            }, options={
-                "return": ["id", "name"]
-            })
-
-            # 过滤掉不需要的平台（如WwiseAuthoringPlayback）
-            platforms = [platform['name'] for platform in platforms_result['return']
-                         if platform['name'] != 'WwiseAuthoringPlayback']
-
-            # 过滤掉不需要的语言（根据您的需求调整）
-            languages = [language['name'] for language in languages_result['return']
-                         if language['name'] not in ['Mixed', 'External', 'SFX']]
+            platforms, languages = query_platforms_languages(client)
 
             print("獲取語言完成")
             pprint(platforms)
@@ -45,37 +67,55 @@ def get_wwise_platforms_languages():
         return [], []
 
 
+def collect_error_logs(result):
+    """从 soundbank.generate 的返回值中提取 Error 日志"""
+    error_messages = []
+
+    for log in result.get("logs", []):
+        if log.get("severity") == "Error":
+            sev = log.get("severity")
+            msg = log.get("message")
+            print(f"[{sev}] {msg}")
+
+            # 将错误信息作为字典添加到列表
+            error_messages.append({
+                "severity": sev,
+                "message": msg
+            })
+
+    return error_messages
+
+
 def generate_soundbank_all():
-    platforms, languages = get_wwise_platforms_languages()
+    # waapi（autobahn / asyncio）较重，放到连接前导入，启动报告中单独计时
+    from waapi import WaapiClient
+    STARTUP.mark("waapi imported")
 
+    # 平台/语言查询与生成共用同一个连接
     with WaapiClient() as client:
-        # 调用 SoundBank 生成
-        result = client.call("ak.wwise.core.soundbank.generate", {
-            "platforms": platforms,
-            "languages": languages,
-            "writeToDisk": True
-        })
+        STARTUP.checkpoint("WAAPI connected")
+        platforms, languages = query_platforms_languages(client)
+        print("獲取語言完成")
+        pprint(platforms)
+        pprint(languages)
+
+        # 调用 SoundBank 生成，生成过程中的 Bank 完成/日志实时写入 JSON Lines
+        with SoundBankLogCapture(client, GENERATION_LOG) as capture:
+            result = client.call("ak.wwise.core.soundbank.generate", {
+                "platforms": platforms,
+                "languages": languages,
+                "writeToDisk": True
+            })
+        capture.print_profile()
 
         # print("------ SoundBank 生成日志（Result Logs） ------")
         # 如果可能有多个相同severity的错误，使用列表存储
-        error_messages = []
-
-        for log in result.get("logs", []):
-            if log.get("severity") == "Error":
-                sev = log.get("severity")
-                msg = log.get("message")
-                print(f"[{sev}] {msg}")
+        error_messages = collect_error_logs(result)
 
-                # 将错误信息作为字典添加到列表
-                error_messages.append({
-                    "severity": sev,
-                    "message": msg
-                })
-
-        if len(error_messages) > 0:
+        if len(error_messages) > 0 or capture.failed:
             pprint("生成失败")
 
 
-
-
-generate_soundbank_all()
+if __name__ == "__main__":
+    generate_soundbank_all()
+    STARTUP.print_report()
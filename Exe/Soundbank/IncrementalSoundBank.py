@@ -0,0 +1,323 @@
+"""
+增量 SoundBank 生成
+
+只重新生成包含了被修改对象的 SoundBank，而不是每次生成全部 Bank。
+
+变更来源两种，可同时使用：
+1. watch 模式：订阅 WAAPI 变更通知，把被修改的对象 ID 记录到状态文件
+2. Work Unit 差异：对比 .wwu 文件的修改时间/大小快照，找出被修改的 Work Unit
+
+build 模式把变更对象映射到 Bank：
+- 变更对象及其所有祖先（结构包含：Bank 包含了某个祖先即包含该对象）
+- 引用了上述对象的 Event（事件包含：Event 的 Action 指向该对象或其祖先）
+- 被修改的 Work Unit 额外展开其所有子孙
+然后只把命中的 Bank 传给 ak.wwise.core.soundbank.generate 的 soundbanks 参数。
+
+用法：
+    python IncrementalSoundBank.py watch
+    python IncrementalSoundBank.py build [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from pprint import pprint
+
+from waapi import WaapiClient, CannotConnectToWaapiException
+from GenerateSoundBank import query_platforms_languages, collect_error_logs, GENERATION_LOG
+from SoundBankGenerationLog import SoundBankLogCapture
+
+STATE_JSON = "IncrementalSoundBankState.json"
+
+# 订阅的变更通知，以及每个通知中代表「被修改对象」的字段
+CHANGE_TOPICS = {
+    "ak.wwise.core.object.propertyChanged": ["object"],
+    "ak.wwise.core.object.nameChanged": ["object"],
+    "ak.wwise.core.object.notesChanged": ["object"],
+    "ak.wwise.core.object.referenceChanged": ["object"],
+    "ak.wwise.core.object.attenuationCurveChanged": ["object"],
+    "ak.wwise.core.object.curveChanged": ["object"],
+    "ak.wwise.core.object.created": ["object"],
+    "ak.wwise.core.object.childAdded": ["parent", "child"],
+    # 被删除的子对象已经无法查询，只记录父对象
+    "ak.wwise.core.object.childRemoved": ["parent"],
+    "ak.wwise.core.audio.imported": ["object"],
+}
+
+
+# ============================================================
+# 状态文件
+# ============================================================
+def load_state(path=STATE_JSON):
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            state.setdefault("changed_ids", [])
+            state.setdefault("work_units", None)
+            return state
+        except json.JSONDecodeError:
+            print(f"[警告] 状态文件 {path} 损坏，按首次运行处理")
+    return {"changed_ids": [], "work_units": None}
+
+
+def save_state(state, path=STATE_JSON):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def mark_built(built_ids, snapshot, path=STATE_JSON):
+    """生成成功后只移除本次已处理的 ID；生成期间 watch 新记录的变更重新读取后保留"""
+    state = load_state(path)
+    built = set(built_ids)
+    state["changed_ids"] = [object_id for object_id in state["changed_ids"] if object_id not in built]
+    state["work_units"] = snapshot
+    save_state(state, path)
+
+
+# ============================================================
+# 变更来源
+# ============================================================
+class ChangeTracker:
+    """订阅 WAAPI 变更通知，记录被修改对象的 ID"""
+
+    def __init__(self, client, state_path=STATE_JSON):
+        self.client = client
+        self.state_path = state_path
+        self.state = load_state(state_path)
+        self.changed_ids = set(self.state["changed_ids"])
+        self.handlers = []
+
+    def start(self):
+        for topic, keys in CHANGE_TOPICS.items():
+            try:
+                handler = self.client.subscribe(topic, self._make_callback(topic, keys),
+                                                {"return": ["id", "name", "type"]})
+                self.handlers.append(handler)
+            except Exception as e:
+                print(f"[警告] 订阅 {topic} 失败: {e}")
+
+    def stop(self):
+        for handler in self.handlers:
+            try:
+                handler.unsubscribe()
+            except Exception:
+                pass
+        self.handlers.clear()
+
+    def _make_callback(self, topic, keys):
+        def on_change(*args, **kwargs):
+            self._record(topic, [kwargs.get(key) for key in keys])
+        return on_change
+
+    def _record(self, topic, objects):
+        # build 可能在监听期间清空过状态，每次都以文件为准合并
+        self.state = load_state(self.state_path)
+        self.changed_ids = set(self.state["changed_ids"])
+        new_ids = [obj["id"] for obj in objects if obj and obj.get("id") and obj["id"] not in self.changed_ids]
+        if not new_ids:
+            return
+        self.changed_ids.update(new_ids)
+        self.state["changed_ids"] = sorted(self.changed_ids)
+        save_state(self.state, self.state_path)
+        for obj in objects:
+            if obj and obj.get("id") in new_ids:
+                print(f"[变更] {topic.rsplit('.', 1)[-1]}: {obj.get('name', obj['id'])} [{obj.get('type', '?')}]")
+
+
+def scan_work_units(project_root):
+    """返回 {wwu 路径: [mtime_ns, size]} 快照"""
+    snapshot = {}
+    for wwu in Path(project_root).rglob("*.wwu"):
+        stat = wwu.stat()
+        snapshot[wwu.as_posix()] = [stat.st_mtime_ns, stat.st_size]
+    return snapshot
+
+
+def diff_work_units(old_snapshot, new_snapshot):
+    """返回有变化（新增或修改）的 wwu 路径列表；删除的 wwu 由其父 Work Unit 的变化覆盖"""
+    return [path for path, sig in new_snapshot.items() if old_snapshot.get(path) != sig]
+
+
+def resolve_work_unit_ids(client, wwu_paths):
+    """把 .wwu 文件路径映射回 WorkUnit 对象 ID"""
+    if not wwu_paths:
+        return []
+    wanted = {os.path.normcase(os.path.normpath(p)) for p in wwu_paths}
+    result = client.call("ak.wwise.core.object.get", {
+        "waql": "$ from type WorkUnit"
+    }, options={"return": ["id", "filePath"]})
+
+    return [
+        obj["id"] for obj in result.get("return", [])
+        if obj.get("filePath") and os.path.normcase(os.path.normpath(obj["filePath"])) in wanted
+    ]
+
+
+# ============================================================
+# 变更对象 → Bank
+# ============================================================
+def _get_ids(client, ids, select):
+    if not ids:
+        return set()
+    args = {
+        "from": {"id": list(ids)},
+        "transform": [{"select": [select]}],
+        "options": {"return": ["id"]}
+    }
+    try:
+        result = client.call("ak.wwise.core.object.get", args)
+    except Exception:
+        # 记录的对象可能已被删除，整批查询失败时逐个查询并跳过失效 ID
+        found = set()
+        for object_id in ids:
+            args["from"] = {"id": [object_id]}
+            try:
+                result = client.call("ak.wwise.core.object.get", args)
+            except Exception:
+                continue
+            found |= {obj["id"] for obj in (result or {}).get("return", [])}
+        return found
+    return {obj["id"] for obj in (result or {}).get("return", [])}
+
+
+def build_inclusion_index(client):
+    """返回 {被包含对象 ID: {Bank 名}}"""
+    banks = client.call("ak.wwise.core.object.get", {
+        "waql": "$ from type SoundBank"
+    }, options={"return": ["id", "name"]}).get("return", [])
+
+    index = {}
+    for bank in banks:
+        result = client.call("ak.wwise.core.soundbank.getInclusions", {"soundbank": bank["id"]})
+        for inclusion in result.get("inclusions", []):
+            index.setdefault(inclusion["object"], set()).add(bank["name"])
+    return index, [bank["name"] for bank in banks]
+
+
+def map_changes_to_banks(client, changed_ids, work_unit_ids=()):
+    """计算受变更影响的 Bank 名列表"""
+    affected = set(changed_ids) | set(work_unit_ids)
+    affected |= _get_ids(client, affected, "ancestors")
+    # 修改了的 Work Unit 内任意对象都可能被 Bank 单独包含
+    affected |= _get_ids(client, work_unit_ids, "descendants")
+
+    # 引用了这些对象的 Action 所在的 Event
+    actions = _get_ids(client, affected, "referencesTo")
+    affected |= actions
+    affected |= _get_ids(client, actions, "parent")
+
+    index, all_banks = build_inclusion_index(client)
+    banks = set()
+    for object_id in affected:
+        banks |= index.get(object_id, set())
+    return sorted(banks), all_banks
+
+
+# ============================================================
+# 生成
+# ============================================================
+def generate_banks(client, bank_names=None):
+    """生成指定的 Bank，bank_names 为 None 时生成全部"""
+    platforms, languages = query_platforms_languages(client)
+    args = {
+        "platforms": platforms,
+        "languages": languages,
+        "writeToDisk": True
+    }
+    if bank_names is not None:
+        args["soundbanks"] = [{"name": name} for name in bank_names]
+    with SoundBankLogCapture(client, GENERATION_LOG) as capture:
+        result = client.call("ak.wwise.core.soundbank.generate", args)
+    capture.print_profile()
+    return collect_error_logs(result) or capture.errors
+
+
+def watch(client, state_path=STATE_JSON):
+    """持续记录变更，Ctrl+C 结束"""
+    tracker = ChangeTracker(client, state_path)
+    tracker.start()
+    print(f"正在监听 Wwise 变更，已记录 {len(tracker.changed_ids)} 个对象，Ctrl+C 退出...")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tracker.stop()
+    print(f"共记录 {len(tracker.changed_ids)} 个变更对象 → {state_path}")
+
+
+def build(client, state_path=STATE_JSON, dry_run=False):
+    state = load_state(state_path)
+    project_root = client.call("ak.wwise.core.getProjectInfo")["directories"]["root"]
+    snapshot = scan_work_units(project_root)
+
+    changed_ids = state["changed_ids"]
+
+    start = time.perf_counter()
+    if state["work_units"] is None:
+        # 没有快照：无法判断变更范围，生成全部 Bank
+        print("首次运行，没有 Work Unit 快照，生成全部 SoundBank")
+        bank_names = None
+    else:
+        changed_wwu = diff_work_units(state["work_units"], snapshot)
+        work_unit_ids = resolve_work_unit_ids(client, changed_wwu)
+
+        print(f"变更对象: {len(changed_ids)} 个, 变更 Work Unit: {len(changed_wwu)} 个")
+        for path in changed_wwu:
+            print(f"  - {path}")
+
+        if not changed_ids and not work_unit_ids:
+            print("没有任何变更，无需生成")
+            return
+
+        bank_names, all_banks = map_changes_to_banks(client, changed_ids, work_unit_ids)
+        print(f"需要重新生成的 SoundBank: {len(bank_names)}/{len(all_banks)} ({time.perf_counter() - start:.2f}s)")
+        pprint(bank_names)
+
+        if not bank_names:
+            # 变更没有落在任何 Bank 中，只更新快照
+            if not dry_run:
+                mark_built(changed_ids, snapshot, state_path)
+            return
+
+    if dry_run:
+        return
+
+    errors = generate_banks(client, bank_names)
+
+    print(f"生成耗时: {time.perf_counter() - start:.1f}s")
+    if errors:
+        # 失败时保留变更记录，下次继续重试
+        pprint("生成失败")
+        return
+
+    mark_built(changed_ids, snapshot, state_path)
+    pprint("生成结果:成功")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="增量生成 SoundBank")
+    parser.add_argument("mode", choices=["watch", "build"])
+    parser.add_argument("--url", default="ws://127.0.0.1:8080/waapi")
+    parser.add_argument("--state", default=STATE_JSON, help="变更状态文件路径")
+    parser.add_argument("--dry-run", action="store_true", help="只列出需要生成的 Bank")
+    args = parser.parse_args()
+
+    try:
+        with WaapiClient(url=args.url) as client:
+            if args.mode == "watch":
+                watch(client, args.state)
+            else:
+                build(client, args.state, args.dry_run)
+    except CannotConnectToWaapiException:
+        print("无法连接到Wwise，请确保Wwise作者工具正在运行。")
+
+
+if __name__ == "__main__":
+    main()
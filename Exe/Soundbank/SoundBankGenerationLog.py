@@ -0,0 +1,206 @@
+"""
+SoundBank 生成日志实时采集
+
+生成期间订阅 WAAPI 通知，把每个 Bank 的完成时间、大小和日志实时写入 JSON Lines：
+- ak.wwise.core.soundbank.generated       每个 Bank（每个平台/语言）生成完成
+- ak.wwise.core.log.itemAdded             生成日志（只保留 soundbankGenerate 通道）
+- ak.wwise.core.soundbank.generationDone  整体生成结束
+
+每行一个 JSON 对象，t 为距离开始采集的秒数：
+    {"t": 3.52, "event": "bank", "bank": "Music", "platform": "Windows", "language": "SFX", "duration": 1.21, "size": 102400}
+    {"t": 3.60, "event": "log", "severity": "Warning", "message": "..."}
+    {"t": 9.01, "event": "done", "error": null}
+
+duration 为同一平台/语言下距上一个 Bank 完成的时间，用于分析每个 Bank 的生成耗时。
+bank 取自通知中的 soundbank 对象（订阅时 return 的字段）；size 为写出的 .bnk 文件大小：
+订阅时带上 infoFile，按其中的 SoundBanksRoot + Path 找到文件（不传 bankData，避免整个 Bank 经 WebSocket 传一遍），
+没有写入磁盘时为 null。
+
+用法：
+    with WaapiClient() as client:
+        with SoundBankLogCapture(client, "SoundBankGeneration.jsonl") as capture:
+            client.call("ak.wwise.core.soundbank.generate", {...})
+        capture.print_profile()
+"""
+
+import json
+import os
+import threading
+import time
+
+LOG_CHANNEL = "soundbankGenerate"
+ERROR_SEVERITIES = ("Error", "Fatal Error")
+
+
+def bank_file_size(info_file):
+    """
+    从 generated 通知的 infoFile（该 Bank 的 SoundbanksInfo）找到写出的 .bnk，返回字节数
+
+    Returns:
+        int: 文件大小；没有 infoFile 或文件不存在时返回 None
+    """
+    info = (info_file or {}).get("SoundBanksInfo") or {}
+    root = (info.get("RootPaths") or {}).get("SoundBanksRoot")
+    banks = info.get("SoundBanks") or []
+    if not root or not banks or not banks[0].get("Path"):
+        return None
+    try:
+        return os.path.getsize(os.path.join(root, banks[0]["Path"]))
+    except OSError:
+        return None
+
+
+class SoundBankLogCapture:
+    """订阅生成通知并写入 JSON Lines 的上下文管理器"""
+
+    def __init__(self, client, jsonl_path="SoundBankGeneration.jsonl", on_error=None, echo=True, tags=None):
+        """
+        Args:
+            client: 已连接的 WaapiClient
+            jsonl_path: 输出文件路径（追加写入）
+            on_error: 收到 Error 日志时立即调用的回调 on_error(record)
+            echo: 是否同时打印到控制台
+            tags: 附加到每行记录上的字段，例如 {"job": "Windows"}
+        """
+        self.client = client
+        self.jsonl_path = jsonl_path
+        self.on_error = on_error
+        self.echo = echo
+        self.tags = tags or {}
+
+        self.lock = threading.Lock()
+        self.handlers = []
+        self.file = None
+        self.start_time = 0.0
+        self.last_done = {}
+        self.banks = []
+        self.errors = []
+        self.finished = threading.Event()
+
+    # --------------------------------------------------------
+    # 上下文管理
+    # --------------------------------------------------------
+    def __enter__(self):
+        self.file = open(self.jsonl_path, "a", encoding="utf-8")
+        self.start_time = time.perf_counter()
+        self._write({"event": "start"})
+
+        for topic, callback, options in [
+            ("ak.wwise.core.soundbank.generated", self._on_generated, {"return": ["id", "name"], "infoFile": True}),
+            ("ak.wwise.core.log.itemAdded", self._on_log, {}),
+            ("ak.wwise.core.soundbank.generationDone", self._on_done, {}),
+        ]:
+            try:
+                self.handlers.append(self.client.subscribe(topic, callback, options))
+            except Exception as e:
+                print(f"[警告] 订阅 {topic} 失败: {e}")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # generate 调用返回时 generationDone 可能还在路上，稍等一下
+        self.finished.wait(timeout=2.0)
+        for handler in self.handlers:
+            try:
+                handler.unsubscribe()
+            except Exception:
+                pass
+        self.handlers.clear()
+
+        with self.lock:
+            self.file.close()
+            self.file = None
+        return False
+
+    @property
+    def failed(self):
+        return bool(self.errors)
+
+    # --------------------------------------------------------
+    # 通知回调（在 WAAPI 事件线程中执行）
+    # --------------------------------------------------------
+    def _on_generated(self, *args, **kwargs):
+        soundbank = kwargs.get("soundbank") or {}
+        platform = (kwargs.get("platform") or {}).get("name")
+        language = (kwargs.get("language") or {}).get("name")
+
+        now = self._elapsed()
+        key = (platform, language)
+        duration = now - self.last_done.get(key, 0.0)
+        self.last_done[key] = now
+
+        bank_data = kwargs.get("bankData")
+        if isinstance(bank_data, dict) and bank_data.get("size") is not None:
+            size = bank_data["size"]
+        else:
+            size = bank_file_size(kwargs.get("infoFile"))
+
+        record = {
+            "event": "bank",
+            "bank": soundbank.get("name"),
+            "platform": platform,
+            "language": language,
+            "duration": round(duration, 3),
+            "size": size,
+        }
+        if kwargs.get("error"):
+            record["error"] = kwargs["error"]
+            self._error(record)
+
+        with self.lock:
+            self.banks.append(record)
+        self._write(record, now)
+
+        if self.echo:
+            size_text = f" {size / 1024:.1f} KB" if size else ""
+            print(f"[Bank] {record['bank']} ({platform}/{language}) {duration:.2f}s{size_text}")
+
+    def _on_log(self, *args, **kwargs):
+        if kwargs.get("channel") != LOG_CHANNEL:
+            return
+        item = kwargs.get("item") or {}
+        record = {
+            "event": "log",
+            "severity": item.get("severity"),
+            "message": item.get("message"),
+        }
+        self._write(record)
+
+        if record["severity"] in ERROR_SEVERITIES:
+            self._error(record)
+        elif self.echo and record["severity"] == "Warning":
+            print(f"\033[93m[Warning] {record['message']}\033[0m")
+
+    def _on_done(self, *args, **kwargs):
+        self._write({"event": "done", "error": kwargs.get("error")})
+        self.finished.set()
+
+    def _error(self, record):
+        with self.lock:
+            self.errors.append(record)
+        if self.echo:
+            print(f"\033[91m[{record.get('severity', 'Error')}] {record.get('message') or record.get('error')}\033[0m")
+        if self.on_error:
+            self.on_error(record)
+
+    # --------------------------------------------------------
+    # 输出
+    # --------------------------------------------------------
+    def _elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def _write(self, record, t=None):
+        line = json.dumps({"t": round(self._elapsed() if t is None else t, 3), **self.tags, **record},
+                          ensure_ascii=False)
+        with self.lock:
+            if self.file:
+                self.file.write(line + "\n")
+                self.file.flush()
+
+    def print_profile(self, top=10):
+        """打印耗时最长的 Bank"""
+        banks = sorted(self.banks, key=lambda r: r["duration"], reverse=True)
+        print(f"\n========== Bank 耗时 Top {min(top, len(banks))} / {len(banks)} ==========")
+        for record in banks[:top]:
+            print(f"  {record['duration']:8.2f}s  {record['bank']} ({record['platform']}/{record['language']})")
+        if self.errors:
+            print(f"错误 {len(self.errors)} 条，详见 {self.jsonl_path}")
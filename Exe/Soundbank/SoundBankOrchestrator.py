@@ -0,0 +1,333 @@
+"""
+SoundBank 并行生成调度器
+
+把「全部平台 × 全部语言」的一次阻塞生成拆成按平台 / 按语言的小任务，
+分发到多个执行端并行生成，最后合并日志并输出每个任务的耗时。
+
+执行端两种：
+- WAAPI 端口：每个端口对应一个已打开同一工程的 Wwise 实例（例如 8080 / 8081）
+- WwiseConsole：每个 worker 启动一个 WwiseConsole.exe generate-soundbank 进程
+
+同一平台的任务写入同一个输出目录，且每个语言任务都会重新生成该平台的 SFX Bank 和 SoundbanksInfo，
+并行执行会同时写同一批文件。因此多个执行端并行时只允许 --split platform（各任务平台互不重叠），
+language / both 拆分只能用一个执行端顺序执行。
+
+用法：
+    python SoundBankOrchestrator.py --split platform --ports 8080 8081
+    python SoundBankOrchestrator.py --split platform --console "C:/Audiokinetic/.../WwiseConsole.exe" \\
+        --project "D:/Project/Project.wproj" --workers 4
+    python SoundBankOrchestrator.py --split language --ports 8080          # 按语言拆分只能用一个执行端
+"""
+
+import argparse
+import json
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pprint import pprint
+from queue import Queue, Empty
+
+from waapi import WaapiClient, CannotConnectToWaapiException
+from GenerateSoundBank import query_platforms_languages
+from SoundBankGenerationLog import SoundBankLogCapture
+
+DEFAULT_PORTS = [8080, 8081]
+
+
+def waapi_url(port):
+    return f"ws://127.0.0.1:{port}/waapi"
+
+
+@dataclass
+class SoundBankJob:
+    """单个生成任务：一组平台 × 一组语言"""
+    name: str
+    platforms: list
+    languages: list
+    worker: str = ""
+    elapsed: float = 0.0
+    logs: list = field(default_factory=list)
+    error: str = ""
+
+    @property
+    def failed(self):
+        return bool(self.error) or any(log.get("severity") in ("Error", "Fatal Error") for log in self.logs)
+
+
+def build_jobs(platforms, languages, split="platform"):
+    """
+    按平台或语言拆分任务
+
+    Args:
+        platforms: 平台名列表
+        languages: 语言名列表
+        split: "platform" | "language" | "both"
+
+    Returns:
+        list[SoundBankJob]
+    """
+    if split == "platform":
+        return [SoundBankJob(p, [p], list(languages)) for p in platforms]
+    if split == "language":
+        return [SoundBankJob(lang, list(platforms), [lang]) for lang in languages]
+    if split == "both":
+        return [SoundBankJob(f"{p}/{lang}", [p], [lang]) for p in platforms for lang in languages]
+    raise ValueError(f"未知的拆分方式: {split}")
+
+
+def check_parallel_jobs(jobs, worker_count):
+    """多个执行端并行时，任意两个任务的平台不能重叠（同一平台共用输出目录），否则抛出 ValueError"""
+    if worker_count <= 1:
+        return
+    owners = {}
+    for job in jobs:
+        for platform in job.platforms:
+            if platform in owners:
+                raise ValueError(
+                    f"任务 {owners[platform]} 与 {job.name} 都会生成平台 {platform} 的 SFX Bank 和 SoundbanksInfo，"
+                    f"并行执行会同时写同一个输出目录；请使用 --split platform，或只用一个执行端"
+                )
+            owners[platform] = job.name
+
+
+# ============================================================
+# 执行端
+# ============================================================
+def run_job_waapi(client, job, jsonl_path=None):
+    """在一个已连接的 Wwise 实例上执行任务，指定 jsonl_path 时实时记录每个 Bank"""
+    args = {
+        "platforms": job.platforms,
+        "languages": job.languages,
+        "writeToDisk": True
+    }
+    if jsonl_path:
+        with SoundBankLogCapture(client, jsonl_path, echo=False, tags={"job": job.name}):
+            result = client.call("ak.wwise.core.soundbank.generate", args)
+    else:
+        result = client.call("ak.wwise.core.soundbank.generate", args)
+    return [
+        {"severity": log.get("severity"), "message": log.get("message")}
+        for log in (result or {}).get("logs", [])
+    ]
+
+
+def run_job_console(console_path, project_path, job):
+    """启动一个 WwiseConsole 进程执行任务，解析其标准输出中的日志"""
+    cmd = [console_path, "generate-soundbank", project_path]
+    for platform in job.platforms:
+        cmd += ["--platform", platform]
+    for language in job.languages:
+        cmd += ["--language", language]
+
+    proc = subprocess.run(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="ignore"
+    )
+
+    logs = []
+    for line in proc.stdout.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if "Fatal Error" in line:
+            severity = "Fatal Error"
+        elif "Error" in line:
+            severity = "Error"
+        elif "Warning" in line:
+            severity = "Warning"
+        else:
+            continue
+        logs.append({"severity": severity, "message": line})
+
+    if proc.returncode != 0 and not logs:
+        logs.append({"severity": "Error", "message": f"WwiseConsole 退出码 {proc.returncode}"})
+    return logs
+
+
+def _waapi_worker(port, jobs, done, lock, stream_log=False):
+    """一个端口一个线程：保持连接，从队列中持续取任务"""
+    worker_name = f"waapi:{port}"
+    jsonl_path = f"SoundBankGeneration_{port}.jsonl" if stream_log else None
+    try:
+        with WaapiClient(url=waapi_url(port)) as client:
+            while True:
+                try:
+                    job = jobs.get_nowait()
+                except Empty:
+                    return
+                _run_timed(job, worker_name, lambda j: run_job_waapi(client, j, jsonl_path), done, lock)
+    except CannotConnectToWaapiException:
+        print(f"[警告] 无法连接 {waapi_url(port)}，该端口不参与生成")
+
+
+def _console_worker(index, console_path, project_path, jobs, done, lock):
+    worker_name = f"console:{index}"
+    while True:
+        try:
+            job = jobs.get_nowait()
+        except Empty:
+            return
+        _run_timed(job, worker_name, lambda j: run_job_console(console_path, project_path, j), done, lock)
+
+
+def _run_timed(job, worker_name, runner, done, lock):
+    job.worker = worker_name
+    start = time.perf_counter()
+    try:
+        job.logs = runner(job)
+    except Exception as e:
+        job.error = str(e)
+    job.elapsed = time.perf_counter() - start
+
+    status = "失败" if job.failed else "完成"
+    print(f"[{worker_name}] {job.name} {status} ({job.elapsed:.1f}s)")
+    with lock:
+        done.append(job)
+
+
+# ============================================================
+# 调度
+# ============================================================
+def orchestrate(jobs, ports=None, console_path=None, project_path=None, workers=None, stream_log=False):
+    """
+    并行执行所有任务
+
+    指定 console_path 时使用 WwiseConsole，否则使用 ports 中的 WAAPI 端口。
+    stream_log 为 True 时每个端口把 Bank 完成情况实时写入 SoundBankGeneration_<端口>.jsonl。
+    多个执行端时任务的平台不能重叠（见 check_parallel_jobs）。
+
+    Returns:
+        tuple: (已完成任务列表, 总耗时)
+    """
+    ports = ports or DEFAULT_PORTS
+    count = (workers or 2) if console_path else len(ports)
+    check_parallel_jobs(jobs, count)
+
+    queue = Queue()
+    for job in jobs:
+        queue.put(job)
+
+    done = []
+    lock = threading.Lock()
+
+    start = time.perf_counter()
+    if console_path:
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            for i in range(count):
+                executor.submit(_console_worker, i, console_path, project_path, queue, done, lock)
+    else:
+        with ThreadPoolExecutor(max_workers=len(ports)) as executor:
+            for port in ports:
+                executor.submit(_waapi_worker, port, queue, done, lock, stream_log)
+    total = time.perf_counter() - start
+
+    # 所有端口都连不上时，剩余任务留在队列里
+    while True:
+        try:
+            job = queue.get_nowait()
+        except Empty:
+            break
+        job.error = "没有可用的执行端"
+        done.append(job)
+
+    return done, total
+
+
+def merge_logs(jobs):
+    """合并所有任务的日志，每条日志带上任务名"""
+    merged = []
+    for job in jobs:
+        if job.error:
+            merged.append({"job": job.name, "severity": "Error", "message": job.error})
+        for log in job.logs:
+            merged.append({"job": job.name, **log})
+    return merged
+
+
+def print_report(jobs, total):
+    print("\n========== 任务耗时 ==========")
+    for job in sorted(jobs, key=lambda j: j.elapsed, reverse=True):
+        status = "FAIL" if job.failed else "OK"
+        print(f"  {status:<4} {job.elapsed:8.1f}s  {job.worker:<12} {job.name}")
+
+    serial = sum(job.elapsed for job in jobs)
+    print("-" * 30)
+    print(f"任务数: {len(jobs)}")
+    print(f"串行耗时合计: {serial:.1f}s")
+    print(f"实际耗时: {total:.1f}s")
+    if total > 0:
+        print(f"并行加速比: {serial / total:.2f}x")
+
+    errors = [log for log in merge_logs(jobs) if log.get("severity") in ("Error", "Fatal Error")]
+    for log in errors:
+        print(f"[{log['severity']}] ({log['job']}) {log['message']}")
+    if errors:
+        pprint("生成失败")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并行生成 SoundBank")
+    parser.add_argument("--split", choices=["platform", "language", "both"], default="platform")
+    parser.add_argument("--ports", type=int, nargs="+", default=DEFAULT_PORTS)
+    parser.add_argument("--console", help="WwiseConsole.exe 路径，指定后使用命令行生成")
+    parser.add_argument("--project", help="使用 WwiseConsole 时的 .wproj 路径")
+    parser.add_argument("--workers", type=int, help="WwiseConsole 并行进程数")
+    parser.add_argument("--platforms", nargs="+", help="只生成指定平台")
+    parser.add_argument("--languages", nargs="+", help="只生成指定语言")
+    parser.add_argument("--log", help="合并后的日志输出路径 (JSON)")
+    parser.add_argument("--stream-log", action="store_true", help="WAAPI 模式下实时记录每个 Bank 的 JSON Lines 日志")
+    args = parser.parse_args()
+
+    if args.console and not args.project:
+        parser.error("使用 --console 时必须指定 --project")
+
+    platforms, languages = args.platforms, args.languages
+    if not platforms or not languages:
+        # 只用第一个端口查询一次
+        try:
+            with WaapiClient(url=waapi_url(args.ports[0])) as client:
+                queried_platforms, queried_languages = query_platforms_languages(client)
+        except CannotConnectToWaapiException:
+            print("无法连接到Wwise，请确保Wwise作者工具正在运行，或使用 --platforms/--languages 指定。")
+            return
+        platforms = platforms or queried_platforms
+        languages = languages or queried_languages
+
+    jobs = build_jobs(platforms, languages, args.split)
+    try:
+        check_parallel_jobs(jobs, (args.workers or 2) if args.console else len(args.ports))
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"共 {len(jobs)} 个任务: {[job.name for job in jobs]}")
+
+    done, total = orchestrate(
+        jobs,
+        ports=args.ports,
+        console_path=args.console,
+        project_path=args.project,
+        workers=args.workers,
+        stream_log=args.stream_log
+    )
+    print_report(done, total)
+
+    if args.log:
+        with open(args.log, "w", encoding="utf-8") as f:
+            json.dump({
+                "total_seconds": total,
+                "jobs": [
+                    {"name": j.name, "worker": j.worker, "seconds": j.elapsed, "failed": j.failed}
+                    for j in done
+                ],
+                "logs": merge_logs(done)
+            }, f, indent=4, ensure_ascii=False)
+        print(f"日志已写入 {args.log}")
+
+
+if __name__ == "__main__":
+    main()
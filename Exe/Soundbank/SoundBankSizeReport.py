@@ -0,0 +1,363 @@
+"""
+SoundBank 大小 / 媒体预算分析
+
+流式解析生成后的 SoundbanksInfo.json / SoundbanksInfo.xml（每个平台目录一份），统计：
+- 每个 Bank 的大小（.bnk 文件）和包含的媒体数量/大小
+- 按平台、按语言汇总（Bank + 松散/流式媒体）
+- 最大的 N 个媒体文件
+
+并与上一次构建保存的汇总对比，列出每个变化的 Bank 中新增 / 移除 / 大小变化的媒体，
+Bank 增长超过阈值时返回非 0 退出码，供 CI 使用。
+
+XML 使用 iterparse 逐个 SoundBank 解析并释放；JSON 在安装了 ijson 时逐个 Bank 解析，
+否则退回 json.load。
+
+用法：
+    python SoundBankSizeReport.py "D:/Project/GeneratedSoundBanks" --summary BankSizes.json
+    python SoundBankSizeReport.py "D:/Project/GeneratedSoundBanks" --baseline BankSizes_prev.json --fail-percent 5
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+INFO_NAMES = ("SoundbanksInfo.json", "SoundbanksInfo.xml")
+SIZE_KEYS = ("Size", "MediaSize", "DataSize")
+
+
+# ============================================================
+# 解析
+# ============================================================
+def find_info_files(root):
+    """在生成目录下查找每个平台的 SoundbanksInfo，同一目录优先使用 JSON"""
+    root = Path(root)
+    if root.is_file():
+        return [root]
+
+    found = {}
+    for name in INFO_NAMES:
+        for path in root.rglob(name):
+            found.setdefault(path.parent, path)
+    return sorted(found.values())
+
+
+def _json_platform(path):
+    """Platform 字段位于文件开头，只读取前 4KB"""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        match = re.search(r'"Platform"\s*:\s*"([^"]+)"', f.read(4096))
+    return match.group(1) if match else path.parent.name
+
+
+def iter_banks_json(path):
+    """逐个产出 (platform, bank_dict)"""
+    platform = _json_platform(path)
+    if ijson is not None:
+        with open(path, "rb") as f:
+            for bank in ijson.items(f, "SoundBanksInfo.SoundBanks.item"):
+                yield platform, bank
+        return
+
+    with open(path, "r", encoding="utf-8-sig") as f:
+        data = json.load(f)
+    for bank in data.get("SoundBanksInfo", {}).get("SoundBanks", []):
+        yield platform, bank
+
+
+def _xml_file(elem):
+    """把 XML 的 <File> 元素转成与 JSON 相同结构的 dict"""
+    media = dict(elem.attrib)
+    for child in elem:
+        media[child.tag] = child.text
+    return media
+
+
+def iter_banks_xml(path):
+    """逐个产出 (platform, bank_dict)，解析完一个 SoundBank 就释放"""
+    platform = path.parent.name
+    context = ET.iterparse(path, events=("start", "end"))
+    for event, elem in context:
+        if event == "start":
+            if elem.tag == "SoundBanksInfo":
+                platform = elem.attrib.get("Platform", platform)
+            continue
+        if elem.tag != "SoundBank":
+            continue
+
+        bank = dict(elem.attrib)
+        bank["ShortName"] = elem.findtext("ShortName")
+        bank["Path"] = elem.findtext("Path")
+        # 新版本为 <Media>，旧版本为 <IncludedMemoryFiles>
+        media_parent = elem.find("Media")
+        if media_parent is None:
+            media_parent = elem.find("IncludedMemoryFiles")
+        bank["Media"] = [_xml_file(f) for f in media_parent] if media_parent is not None else []
+
+        yield platform, bank
+        elem.clear()
+
+
+def iter_banks(path):
+    path = Path(path)
+    if path.suffix.lower() == ".xml":
+        return iter_banks_xml(path)
+    return iter_banks_json(path)
+
+
+# ============================================================
+# 统计
+# ============================================================
+def _file_size(*candidates):
+    for candidate in candidates:
+        if candidate and os.path.isfile(candidate):
+            return os.path.getsize(candidate)
+    return 0
+
+
+def media_size(media, info_dir, cache_root=None):
+    """优先使用信息文件里的大小字段，否则读取松散媒体或 .cache 中转码后文件的大小"""
+    for key in SIZE_KEYS:
+        if media.get(key):
+            return int(media[key])
+
+    candidates = []
+    if media.get("Path"):
+        candidates.append(info_dir / media["Path"])
+    if cache_root and media.get("CachePath"):
+        candidates.append(Path(cache_root) / media["CachePath"])
+    return _file_size(*candidates)
+
+
+def analyze(info_files, cache_root=None, top=20):
+    """
+    Returns:
+        dict: {"platforms", "languages", "banks", "top_media"}，大小单位为字节
+    """
+    platforms, languages, banks = {}, {}, {}
+    top_media = []  # 小顶堆 (size, key, record)
+    seen_media = set()
+
+    for info_file in info_files:
+        info_file = Path(info_file)
+        info_dir = info_file.parent
+        print(f"解析 {info_file}")
+
+        for platform, bank in iter_banks(info_file):
+            language = bank.get("Language", "SFX")
+            name = bank.get("ShortName") or bank.get("Id")
+            bank_size = _file_size(info_dir / bank["Path"]) if bank.get("Path") else 0
+
+            included_size = 0
+            loose_size = 0
+            bank_media = {}
+            media_list = bank.get("Media") or []
+            for media in media_list:
+                size = media_size(media, info_dir, cache_root)
+                location = media.get("Location", "Memory")
+                if location == "Memory":
+                    included_size += size
+                # 用于与基线对比 Bank 内部的变化：{媒体 ID: [名称, 大小, 位置]}
+                bank_media[str(media.get("Id"))] = [media.get("ShortName"), size, location]
+
+                media_key = (platform, media.get("Id"), location)
+                if media_key in seen_media:
+                    continue
+                seen_media.add(media_key)
+
+                media_language = media.get("Language", language)
+                if location != "Memory":
+                    # 松散/流式媒体不在 .bnk 中，单独计入平台和语言
+                    loose_size += size
+                    languages[media_language] = languages.get(media_language, 0) + size
+
+                record = {
+                    "platform": platform,
+                    "bank": name,
+                    "language": media_language,
+                    "media": media.get("ShortName"),
+                    "location": location,
+                    "size": size,
+                }
+                entry = (size, f"{platform}/{media.get('Id')}", record)
+                if len(top_media) < top:
+                    heapq.heappush(top_media, entry)
+                elif size > top_media[0][0]:
+                    heapq.heapreplace(top_media, entry)
+
+            banks[f"{platform}/{language}/{name}"] = {
+                "size": bank_size,
+                "media_count": len(media_list),
+                "media_size": included_size,
+                "media": bank_media,
+            }
+            platforms[platform] = platforms.get(platform, 0) + bank_size + loose_size
+            languages[language] = languages.get(language, 0) + bank_size
+
+    return {
+        "platforms": platforms,
+        "languages": languages,
+        "banks": banks,
+        "top_media": [entry[2] for entry in sorted(top_media, key=lambda e: e[0], reverse=True)],
+    }
+
+
+def diff_bank_media(old_media, new_media):
+    """
+    对比同一个 Bank 两次构建包含的媒体
+
+    Returns:
+        list: [{"media", "location", "before", "after", "delta"}]，按变化量绝对值从大到小排序；
+              新增的 before 为 None，移除的 after 为 None
+    """
+    changes = []
+    for media_id in set(old_media) | set(new_media):
+        old_name, before, old_location = old_media.get(media_id, (None, None, None))
+        new_name, after, new_location = new_media.get(media_id, (None, None, None))
+        if before == after and old_location == new_location:
+            continue
+        changes.append({
+            "media": new_name or old_name or media_id,
+            "location": new_location or old_location,
+            "before": before,
+            "after": after,
+            "delta": (after or 0) - (before or 0),
+        })
+    changes.sort(key=lambda c: -abs(c["delta"]))
+    return changes
+
+
+def diff_summaries(old, new, fail_percent=None, fail_bytes=None):
+    """
+    对比两次构建的 Bank 大小，以及每个变化的 Bank 内部的媒体变化
+    （旧版本保存的汇总没有 media 字段时媒体变化为空）
+
+    Returns:
+        tuple: (变化列表, 超出阈值的变化列表)
+    """
+    changes, regressions = [], []
+    old_banks, new_banks = old.get("banks", {}), new.get("banks", {})
+
+    for key in sorted(set(old_banks) | set(new_banks)):
+        before = old_banks.get(key, {}).get("size")
+        after = new_banks.get(key, {}).get("size")
+        media = diff_bank_media(old_banks.get(key, {}).get("media", {}), new_banks.get(key, {}).get("media", {}))
+        # .bnk 大小不变时流式媒体仍可能变化
+        if before == after and not media:
+            continue
+
+        delta = (after or 0) - (before or 0)
+        percent = delta / before * 100 if before else None
+        change = {"bank": key, "before": before, "after": after, "delta": delta, "percent": percent, "media": media}
+        changes.append(change)
+
+        if delta <= 0:
+            continue
+        if (fail_percent is not None and (percent is None or percent > fail_percent)) or \
+                (fail_bytes is not None and delta > fail_bytes):
+            regressions.append(change)
+
+    return changes, regressions
+
+
+# ============================================================
+# 输出
+# ============================================================
+def format_size(size):
+    if size is None:
+        return "-"
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def print_summary(summary, top_banks=20):
+    print("\n========== 平台 ==========")
+    for platform, size in sorted(summary["platforms"].items(), key=lambda kv: -kv[1]):
+        print(f"  {format_size(size):>10}  {platform}")
+
+    print("\n========== 语言 ==========")
+    for language, size in sorted(summary["languages"].items(), key=lambda kv: -kv[1]):
+        print(f"  {format_size(size):>10}  {language}")
+
+    print(f"\n========== 最大的 {top_banks} 个 Bank ==========")
+    banks = sorted(summary["banks"].items(), key=lambda kv: -kv[1]["size"])
+    for key, info in banks[:top_banks]:
+        print(f"  {format_size(info['size']):>10}  {key}  (媒体 {info['media_count']} 个, {format_size(info['media_size'])})")
+
+    print(f"\n========== 最大的 {len(summary['top_media'])} 个媒体 ==========")
+    for media in summary["top_media"]:
+        print(f"  {format_size(media['size']):>10}  {media['media']}  [{media['platform']}/{media['bank']}, {media['location']}]")
+
+
+def print_diff(changes, regressions, top_media=10):
+    print(f"\n========== 与基线对比: {len(changes)} 个 Bank 变化 ==========")
+    for change in sorted(changes, key=lambda c: -abs(c["delta"])):
+        percent = f"{change['percent']:+.1f}%" if change["percent"] is not None else "新增"
+        if change["after"] is None:
+            percent = "删除"
+        print(f"  {change['delta']:+12d} B  {percent:>8}  {change['bank']}")
+
+        media = change.get("media", [])
+        for item in media[:top_media]:
+            if item["before"] is None:
+                kind = "+"
+            elif item["after"] is None:
+                kind = "-"
+            else:
+                kind = "~"
+            print(f"      {kind} {item['delta']:+12d} B  {item['media']}  [{item['location']}]")
+        if len(media) > top_media:
+            print(f"      ... 另有 {len(media) - top_media} 个媒体变化")
+
+    if regressions:
+        print(f"\n\033[91m[错误] {len(regressions)} 个 Bank 超出增长阈值\033[0m")
+        for change in regressions:
+            print(f"  {change['bank']}: {format_size(change['before'])} → {format_size(change['after'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SoundBank 大小 / 媒体预算分析")
+    parser.add_argument("path", help="GeneratedSoundBanks 目录或单个 SoundbanksInfo 文件")
+    parser.add_argument("--cache-root", help="工程 .cache/<平台> 目录，用于统计已打包进 Bank 的媒体大小")
+    parser.add_argument("--summary", help="保存本次汇总的 JSON 路径")
+    parser.add_argument("--baseline", help="上一次构建保存的汇总 JSON")
+    parser.add_argument("--fail-percent", type=float, help="Bank 增长超过该百分比时失败")
+    parser.add_argument("--fail-bytes", type=int, help="Bank 增长超过该字节数时失败")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    info_files = find_info_files(args.path)
+    if not info_files:
+        print(f"[错误] 在 {args.path} 下没有找到 SoundbanksInfo.json / .xml")
+        sys.exit(2)
+
+    summary = analyze(info_files, args.cache_root, args.top)
+    print_summary(summary, args.top)
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=4, ensure_ascii=False)
+        print(f"\n汇总已写入 {args.summary}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        changes, regressions = diff_summaries(baseline, summary, args.fail_percent, args.fail_bytes)
+        print_diff(changes, regressions, args.top)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
-﻿import sys
+﻿import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from startup_report import STARTUP
+
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QTableWidget, QTableWidgetItem, QPushButton, QLineEdit,
     QHeaderView, QMenu
 )
-from PySide6.QtCore import Qt
-from waapi import WaapiClient, CannotConnectToWaapiException
+from PySide6.QtCore import Qt, QTimer
 
 class WwiseTableExplorer(QWidget):
     def __init__(self):
@@ -90,6 +94,8 @@ class WwiseTableExplorer(QWidget):
 
         self.info_table.setRowCount(0)
 
+        # waapi 在第一次查询时才导入，窗口显示不等它
+        from waapi import WaapiClient, CannotConnectToWaapiException
         try:
             if not self.client:
                 self.client = WaapiClient()
@@ -132,4 +138,8 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = WwiseTableExplorer()
     window.show()
+    STARTUP.mark("window shown")
+    if STARTUP.exit_at_checkpoint:
+        # 事件循环跑起来（首帧绘制）后输出报告并退出；槽函数里抛 SystemExit 不会结束事件循环
+        QTimer.singleShot(0, lambda: (STARTUP.mark("event loop started"), STARTUP.print_report(), app.quit()))
     sys.exit(app.exec())
@@ -0,0 +1,164 @@
+"""
+Exe 工具冷启动基准
+
+逐个以 --startup-exit 运行各 Exe 入口（脚本或打包后的 exe），记录：
+- 进程总耗时（启动 → 到达第一个关键节点后退出）
+- 入口内部的关键节点耗时与最慢的顶层 import（来自 startup_report 的 STARTUP_JSON）
+结果追加到 StartupBenchmark.jsonl，并与上一次运行的中位数对比。
+
+说明：
+- 需要 WAAPI 的入口在 Wwise 未运行时会在连接处失败，此时只记录进程总耗时
+- GUI 入口使用 QT_QPA_PLATFORM=offscreen，显示窗口后立即退出
+- 入口中的 input() 由标准输入喂入的空行直接返回
+
+用法：
+    python benchmark_startup.py                 # 每个入口跑 5 次
+    python benchmark_startup.py -n 10 --exe-dir dist   # 测打包后的 exe（dist/<名称>.exe）
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+EXE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(EXE_DIR)
+HISTORY_PATH = os.path.join(EXE_DIR, "StartupBenchmark.jsonl")
+
+# 名称 -> 脚本路径（相对仓库根目录）
+ENTRIES = {
+    "CheckFileLoudness": "Exe/CheckLoundness/CheckFileLoudness.py",
+    "8080_ebur128FileLoudness": "Exe/CheckLoundness/8080_ebur128FileLoudness.py",
+    "8081_ebur128FileLoudness": "Exe/CheckLoundness/8081_ebur128FileLoudness.py",
+    "copyName": "Exe/CopyName/copyName.py",
+    "CheckOutChannelSetting": "Exe/Save/CheckOutChannelSetting.py",
+    "getSelectedObjects": "Exe/SetChannelConfiguration/getSelectedObjects.py",
+    "GenerateSoundBank": "Exe/Soundbank/GenerateSoundBank.py",
+    "WwiseShortIDExplorer": "Exe/WwiseShortIDExplorer/WwiseShortIDExplorer.py",
+    "ffmepgCheckEbu128": "FFmpeg/ffmepgCheckEbu128.py",
+}
+
+
+def build_command(name, script, exe_dir=None):
+    if exe_dir:
+        return [os.path.join(exe_dir, f"{name}.exe"), "--startup-exit"]
+    return [sys.executable, os.path.join(REPO_DIR, script), "--startup-exit"]
+
+
+def run_once(command, cwd, timeout):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(command, cwd=cwd, input="\n" * 10, capture_output=True,
+                              text=True, encoding="utf-8", errors="replace", env=env, timeout=timeout)
+        output = proc.stdout
+    except subprocess.TimeoutExpired:
+        return {"wall": None, "error": "timeout"}
+    except OSError as e:
+        return {"wall": None, "error": str(e)}
+    wall = time.perf_counter() - start
+
+    report = None
+    for line in output.splitlines():
+        if line.startswith("STARTUP_JSON "):
+            report = json.loads(line[len("STARTUP_JSON "):])
+
+    result = {"wall": round(wall, 4)}
+    if report:
+        result["marks"] = report["marks"]
+        result["imports"] = report["imports"]
+    else:
+        result["error"] = "no startup report"
+    return result
+
+
+def summarize(runs):
+    walls = [run["wall"] for run in runs if run.get("wall") is not None]
+    summary = {"median": round(statistics.median(walls), 4) if walls else None, "runs": len(walls)}
+
+    marks = {}
+    for run in runs:
+        for label, elapsed in run.get("marks", {}).items():
+            marks.setdefault(label, []).append(elapsed)
+    summary["marks"] = {label: round(statistics.median(values), 4) for label, values in marks.items()}
+
+    imports = {}
+    for run in runs:
+        for module, elapsed in run.get("imports", {}).items():
+            imports.setdefault(module, []).append(elapsed)
+    slowest = sorted(((statistics.median(v), k) for k, v in imports.items()), reverse=True)[:5]
+    summary["slowest_imports"] = {module: round(elapsed, 4) for elapsed, module in slowest}
+
+    errors = {run["error"] for run in runs if run.get("error")}
+    if errors:
+        summary["errors"] = sorted(errors)
+    return summary
+
+
+def load_previous(path):
+    """读取上一次运行的结果 {名称: 中位数}"""
+    if not os.path.exists(path):
+        return {}
+    last = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                last = json.loads(line)
+    return {name: entry["median"] for name, entry in (last or {}).get("entries", {}).items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exe 工具冷启动基准")
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--exe-dir", help="打包后 exe 所在目录，不指定时直接运行 .py")
+    parser.add_argument("--only", nargs="*", help="只测试指定入口")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--history", default=HISTORY_PATH)
+    args = parser.parse_args()
+
+    previous = load_previous(args.history)
+    entries = {}
+
+    for name, script in ENTRIES.items():
+        if args.only and name not in args.only:
+            continue
+        command = build_command(name, script, args.exe_dir)
+        # 各入口按自身目录运行（相对路径的 JSON 文件等）
+        cwd = args.exe_dir or os.path.dirname(os.path.join(REPO_DIR, script))
+        runs = [run_once(command, cwd, args.timeout) for _ in range(args.runs)]
+        entries[name] = summarize(runs)
+
+        summary = entries[name]
+        median = summary["median"]
+        before = previous.get(name)
+        change = ""
+        if median is not None and before:
+            change = f"  ({(median - before) / before * 100:+.1f}% vs 上次 {before * 1000:.0f} ms)"
+        median_text = f"{median * 1000:8.0f} ms" if median is not None else "       失败"
+        print(f"{median_text}  {name}{change}")
+        for label, elapsed in summary["marks"].items():
+            print(f"            {elapsed * 1000:8.0f} ms  {label}")
+        if summary["slowest_imports"]:
+            print("            最慢 import: " + ", ".join(
+                f"{module} {elapsed * 1000:.0f} ms" for module, elapsed in summary["slowest_imports"].items()))
+        if summary.get("errors"):
+            print(f"            [警告] {', '.join(summary['errors'])}")
+
+    record = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "exe_dir": args.exe_dir,
+        "runs": args.runs,
+        "entries": entries,
+    }
+    with open(args.history, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"\n结果已追加到 {args.history}")
+
+
+if __name__ == "__main__":
+    main()
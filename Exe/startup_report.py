@@ -0,0 +1,126 @@
+"""
+Exe 工具启动耗时报告
+
+在任一 Exe 入口加上 --startup-report 参数运行，会统计：
+- 各顶层 import 的累计耗时（类似 python -X importtime，打包后的 exe 中同样可用）
+- 关键节点耗时（导入完成、WAAPI 连接成功、窗口显示……）
+再加 --startup-exit 时到达第一个关键节点（如 WAAPI 连接成功）后立即退出，供 benchmark_startup.py 统计冷启动。
+
+报告最后一行为机器可读的 JSON，以 STARTUP_JSON 开头。
+
+入口脚本用法：
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from startup_report import STARTUP
+
+    ...
+    # waapi / PySide6 等重模块尽量在用到的地方才导入，报告中单独显示
+    from waapi import WaapiClient
+    STARTUP.mark("waapi imported")
+    with WaapiClient() as client:
+        STARTUP.checkpoint("WAAPI connected")
+
+PyInstaller 打包时需加 --paths .. 让分析阶段找到本模块。
+"""
+
+import builtins
+import json
+import sys
+import time
+
+REPORT_FLAG = "--startup-report"
+EXIT_FLAG = "--startup-exit"
+
+
+class StartupReport:
+    def __init__(self, enabled=False, exit_at_checkpoint=False):
+        # 尽量贴近进程启动时刻：本模块应在入口最前面导入
+        self.t0 = time.perf_counter()
+        self.enabled = enabled
+        self.exit_at_checkpoint = exit_at_checkpoint
+        self.marks = []
+        self.imports = {}
+        self._depth = 0
+        self._original_import = None
+        self._reported = False
+        if enabled:
+            self._install_import_hook()
+
+    @classmethod
+    def from_argv(cls, argv=None):
+        """读取并移除启动报告相关参数，避免影响入口原有的 sys.argv 下标"""
+        argv = sys.argv if argv is None else argv
+        enabled = REPORT_FLAG in argv or EXIT_FLAG in argv
+        exit_at_checkpoint = EXIT_FLAG in argv
+        argv[:] = [arg for arg in argv if arg not in (REPORT_FLAG, EXIT_FLAG)]
+        return cls(enabled, exit_at_checkpoint)
+
+    # --------------------------------------------------------
+    # import 计时
+    # --------------------------------------------------------
+    def _install_import_hook(self):
+        self._original_import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if name in sys.modules or level:
+                return self._original_import(name, globals, locals, fromlist, level)
+
+            self._depth += 1
+            start = time.perf_counter()
+            try:
+                return self._original_import(name, globals, locals, fromlist, level)
+            finally:
+                self._depth -= 1
+                # 只记录入口直接触发的 import，子依赖算进其累计耗时
+                if self._depth == 0:
+                    top = name.split(".")[0]
+                    self.imports[top] = self.imports.get(top, 0.0) + time.perf_counter() - start
+
+        builtins.__import__ = timed_import
+
+    def _remove_import_hook(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    # --------------------------------------------------------
+    # 关键节点
+    # --------------------------------------------------------
+    def mark(self, label):
+        """记录一个节点"""
+        if self.enabled:
+            self.marks.append((label, time.perf_counter() - self.t0))
+
+    def checkpoint(self, label):
+        """记录节点；指定了 --startup-exit 时输出报告并退出"""
+        if not self.enabled:
+            return
+        self.mark(label)
+        if self.exit_at_checkpoint:
+            self.print_report()
+            sys.stdout.flush()
+            raise SystemExit(0)
+
+    def print_report(self, top=15):
+        # checkpoint 退出后入口的 finally 可能再调用一次，只输出一份
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+        self._remove_import_hook()
+
+        print("\n========== Startup Report ==========")
+        for label, elapsed in self.marks:
+            print(f"  {elapsed * 1000:9.1f} ms  {label}")
+
+        print("-" * 36)
+        print(f"  {'import':<24} {'cumulative':>10}")
+        for name, elapsed in sorted(self.imports.items(), key=lambda kv: -kv[1])[:top]:
+            print(f"  {name:<24} {elapsed * 1000:8.1f} ms")
+
+        print("STARTUP_JSON " + json.dumps({
+            "marks": {label: round(elapsed, 4) for label, elapsed in self.marks},
+            "imports": {name: round(elapsed, 4) for name, elapsed in self.imports.items()},
+        }, ensure_ascii=False))
+
+
+STARTUP = StartupReport.from_argv()
@@ -0,0 +1,310 @@
+"""
+响度归一化：按分类目标批量写入 Volume / MakeUpGain
+
+流程：
+1. 收集选中对象下的所有 Sound（与 ffmepgCheckEbu128.py 相同的 BFS）
+2. 用 ffmpeg 批量测量 Momentary Max（iter_loudness_batch，不足 400 ms 的短音频使用 Short_Loudness 的估算值）
+3. 按配置的分类规则（Actor-Mixer 路径前缀 / 名称正则）确定每个 Sound 的目标响度，
+   测量的是原始 WAV，@Volume（或 @MakeUpGain）直接设为 目标 - 测量值（绝对值，重复运行结果不变），
+   当前生效的响度按 测量值 + 当前属性值 计算
+4. 输出差异预览，确认后在一个 Undo Group 里用批量 object.set 写入（Ctrl+Z 一次即可撤销）
+
+分类配置为同目录的 LoudnessTargets.json，不存在时自动生成示例：
+    {
+      "property": "Volume",            # Volume 或 MakeUpGain
+      "default_target": -18.0,         # 不匹配任何分类时的目标，null 表示不调整
+      "tolerance": 0.5,                # 偏差小于该值不调整
+      "max_adjust": 12.0,              # 单次最多调整多少 dB
+      "categories": [                  # 按顺序匹配，第一个命中的生效
+        {"name": "UI", "path_prefix": "/Actor-Mixer Hierarchy/Default Work Unit/UI", "target": -20.0},
+        {"name": "Footstep", "pattern": "^FS_", "target": -24.0}
+      ]
+    }
+path_prefix 用 / 或 \\ 分隔均可，不区分大小写，按整级路径匹配（.../Voice 不匹配 .../Voices_Old）；
+同时写 path_prefix 和 pattern 时两者都要满足。
+
+用法：
+    python NormalizeLoudness.py                   # 测量 → 预览 → 确认后写入
+    python NormalizeLoudness.py --dry-run         # 只预览
+    python NormalizeLoudness.py --yes             # 不询问直接写入
+    python NormalizeLoudness.py --config xxx.json
+"""
+
+import json
+import math
+import os
+import re
+import sys
+import time
+import traceback
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Exe"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from startup_report import STARTUP
+from Wwise_Log import log_sink
+
+from waapi import WaapiClient, CannotConnectToWaapiException
+
+from ffmepgCheckEbu128 import (
+    TARGET_TYPE, WAAPI_URL, check_ffmpeg, wwise_log,
+    get_selected_objects, get_object_info, bfs_collect_objects, iter_loudness_batch,
+)
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "LoudnessTargets.json")
+DEFAULT_CONFIG = {
+    "property": "Volume",
+    "default_target": -18.0,
+    "tolerance": 0.5,
+    "max_adjust": 12.0,
+    "categories": [
+        {"name": "UI", "path_prefix": "/Actor-Mixer Hierarchy/Default Work Unit/UI", "target": -20.0},
+        {"name": "Footstep", "pattern": "^FS_", "target": -24.0},
+    ],
+}
+# Wwise 中属性的取值范围
+PROPERTY_RANGES = {
+    "Volume": (-200.0, 200.0),
+    "MakeUpGain": (-96.0, 96.0),
+}
+GET_BATCH_SIZE = 500
+SET_BATCH_SIZE = 500
+
+
+# ============================================================
+# 配置
+# ============================================================
+def load_config(path=CONFIG_PATH):
+    """读取分类配置，文件不存在时写出示例配置"""
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(DEFAULT_CONFIG, f, ensure_ascii=False, indent=4)
+        print(f"已生成示例配置: {path}")
+
+    with open(path, "r", encoding="utf-8-sig") as f:
+        config = {**DEFAULT_CONFIG, **json.load(f)}
+
+    if config["property"] not in PROPERTY_RANGES:
+        raise ValueError(f"property 只能是 {' / '.join(PROPERTY_RANGES)}，当前为 {config['property']}")
+
+    # 预处理为 (分类名, 路径前缀, 正则, 目标)
+    rules = []
+    for category in config["categories"]:
+        if "path_prefix" not in category and "pattern" not in category:
+            raise ValueError(f"分类 {category.get('name')} 需要 path_prefix 或 pattern")
+        prefix = _normalize_path(category["path_prefix"]).rstrip("\\") if "path_prefix" in category else None
+        regex = re.compile(category["pattern"]) if "pattern" in category else None
+        rules.append((category.get("name", "?"), prefix, regex, category["target"]))
+    config["rules"] = rules
+    return config
+
+
+def _normalize_path(path):
+    return (path or "").replace("/", "\\").lower()
+
+
+def match_category(config, name, path):
+    """返回 (分类名, 目标响度)，第一个命中的分类生效；都不命中时使用 default_target"""
+    path = _normalize_path(path)
+    for category, prefix, regex, target in config["rules"]:
+        if prefix is not None and not (path == prefix or path.startswith(prefix + "\\")):
+            continue
+        if regex is not None and not regex.search(name):
+            continue
+        return category, target
+    return "default", config["default_target"]
+
+
+# ============================================================
+# WAAPI
+# ============================================================
+def get_gain_info(client, object_ids, prop):
+    """批量获取 Sound 的路径和当前属性值，返回 {id: (path, value)}"""
+    info = {}
+    for start in range(0, len(object_ids), GET_BATCH_SIZE):
+        result = client.call("ak.wwise.core.object.get", {
+            "from": {"id": object_ids[start:start + GET_BATCH_SIZE]},
+            "options": {"return": ["id", "path", f"@{prop}"]}
+        })
+        for obj in result.get("return", []):
+            info[obj["id"]] = (obj.get("path", ""), float(obj.get(f"@{prop}", 0.0)))
+    return info
+
+
+def set_gains(client, entries, prop):
+    """一次 ak.wwise.core.object.set 写入多个对象的属性，entries: [(object_id, value), ...]"""
+    client.call("ak.wwise.core.object.set", {
+        "objects": [{"object": object_id, f"@{prop}": value} for object_id, value in entries]
+    })
+
+
+# ============================================================
+# 计划 / 预览 / 写入
+# ============================================================
+def plan_normalization(sounds, measurements, gain_info, config):
+    """
+    计算每个 Sound 的调整量
+
+    Args:
+        sounds: Sound 列表
+        measurements: {wav 路径: Momentary Max}
+        gain_info: get_gain_info 的返回值
+
+    Returns:
+        list: [{"id", "name", "category", "measured", "target", "current", "new", "delta", "limited"}]
+              只包含需要调整的 Sound
+              new = 目标 - 测量值（原始 WAV），再按 max_adjust（相对 current）和属性范围限幅；
+              current 已经生效，偏差 = 测量值 + current - 目标
+    """
+    low, high = PROPERTY_RANGES[config["property"]]
+    max_adjust = config["max_adjust"]
+    plan = []
+
+    for sound in sounds:
+        measured = measurements.get(sound["originalWavFilePath"])
+        if measured is None or not math.isfinite(measured) or sound["id"] not in gain_info:
+            continue
+
+        path, current = gain_info[sound["id"]]
+        category, target = match_category(config, sound["name"], path)
+        if target is None:
+            continue
+
+        if abs(measured + current - target) < config["tolerance"]:
+            continue
+
+        wanted = target - measured
+        new = max(current - max_adjust, min(current + max_adjust, wanted))
+        new = round(max(low, min(high, new)), 2)
+        if new == current:
+            continue
+
+        plan.append({
+            "id": sound["id"],
+            "name": sound["name"],
+            "category": category,
+            "measured": measured,
+            "target": target,
+            "current": current,
+            "new": new,
+            "delta": new - current,
+            "limited": abs(new - wanted) >= 0.01,
+        })
+    return plan
+
+
+def print_preview(plan, prop):
+    name_width = min(max((len(entry["name"]) for entry in plan), default=4), 48)
+    print(f"\n{'Sound':<{name_width}}  {'分类':<10} {'测量':>8} {'目标':>8}   {prop}")
+    print("-" * (name_width + 60))
+    for entry in sorted(plan, key=lambda e: (e["category"], e["name"])):
+        mark = "  (已限幅)" if entry["limited"] else ""
+        print(f"{entry['name'][:name_width]:<{name_width}}  {entry['category']:<10} "
+              f"{entry['measured']:>8.2f} {entry['target']:>8.2f}   "
+              f"{entry['current']:+.2f} → {entry['new']:+.2f} ({entry['delta']:+.2f} dB){mark}")
+    print("-" * (name_width + 60))
+    print(f"共 {len(plan)} 个 Sound 需要调整，其中 {sum(e['limited'] for e in plan)} 个超出范围被限幅")
+
+
+def apply_plan(client, plan, prop):
+    """在一个 Undo Group 中批量写入，返回 (成功数, 失败数, object.set 调用次数)"""
+    written = failed = calls = 0
+    client.call("ak.wwise.core.undo.beginGroup")
+    try:
+        for start in range(0, len(plan), SET_BATCH_SIZE):
+            entries = [(entry["id"], entry["new"]) for entry in plan[start:start + SET_BATCH_SIZE]]
+            try:
+                calls += 1
+                set_gains(client, entries, prop)
+                written += len(entries)
+            except Exception as e:
+                # 整批失败时逐个写入，找出出错的对象
+                print(f"[WARN] 批量写入 {prop} 失败 ({len(entries)} 个)，改为逐个写入: {e}")
+                for entry in entries:
+                    try:
+                        calls += 1
+                        set_gains(client, [entry], prop)
+                        written += 1
+                    except Exception as e:
+                        failed += 1
+                        print(f"[ERROR] 写入 {prop} 失败 {entry[0]}: {e}")
+    finally:
+        client.call("ak.wwise.core.undo.endGroup", {"displayName": f"Loudness Normalize ({prop})"})
+    return written, failed, calls
+
+
+# ============================================================
+# Main
+# ============================================================
+def collect_sounds(client):
+    sounds = []
+    for obj in get_selected_objects(client):
+        info = get_object_info(client, obj["id"])
+        if not info:
+            continue
+        if info["type"] == TARGET_TYPE:
+            sounds.append(info)
+        else:
+            sounds.extend(bfs_collect_objects(client, obj["id"], TARGET_TYPE))
+
+    # 去重（选中的对象可能互相包含），并过滤没有原始文件的 Sound
+    unique = {}
+    for sound in sounds:
+        wav_path = sound.get("originalWavFilePath")
+        if wav_path and os.path.exists(wav_path):
+            unique[sound["id"]] = sound
+    return list(unique.values())
+
+
+def main():
+    config_path = sys.argv[sys.argv.index("--config") + 1] if "--config" in sys.argv else CONFIG_PATH
+    config = load_config(config_path)
+    prop = config["property"]
+
+    with WaapiClient(url=WAAPI_URL) as client, log_sink(client):
+        STARTUP.checkpoint("WAAPI connected")
+        sounds = collect_sounds(client)
+        if not sounds:
+            wwise_log(client, "选中的对象下没有带原始 WAV 的 Sound", "error")
+            return
+
+        start = time.perf_counter()
+        wav_paths = sorted({sound["originalWavFilePath"] for sound in sounds})
+        measurements = {}
+        for wav_path, lufs, error, _ in iter_loudness_batch(wav_paths):
+            if error:
+                wwise_log(client, f"{os.path.basename(wav_path)} - {error}", "warning")
+            measurements[wav_path] = lufs
+        wwise_log(client, f"测量完成: {len(wav_paths)} 个文件，{time.perf_counter() - start:.2f} 秒")
+
+        gain_info = get_gain_info(client, [sound["id"] for sound in sounds], prop)
+        plan = plan_normalization(sounds, measurements, gain_info, config)
+        if not plan:
+            wwise_log(client, f"{len(sounds)} 个 Sound 均已在目标范围内，无需调整")
+            return
+
+        print_preview(plan, prop)
+        if "--dry-run" in sys.argv:
+            return
+        if "--yes" not in sys.argv and input(f"写入 {len(plan)} 个 Sound 的 {prop}? (y/N) ").strip().lower() != "y":
+            print("已取消")
+            return
+
+        start = time.perf_counter()
+        written, failed, calls = apply_plan(client, plan, prop)
+        wwise_log(client, f"{prop} 已写入 {written} 个 Sound（{calls} 次 object.set，"
+                          f"{time.perf_counter() - start:.2f} 秒）" + (f"，失败 {failed} 个" if failed else ""),
+                  "error" if failed else "info")
+
+
+if __name__ == "__main__":
+    check_ffmpeg()
+    try:
+        main()
+    except CannotConnectToWaapiException:
+        print("无法连接 WAAPI")
+    except Exception as e:
+        print("发生未捕获异常:", e)
+        traceback.print_exc()
+    finally:
+        STARTUP.print_report()
+        input("按回车键退出...")
@@ -1,5 +1,9 @@
 ﻿import sys
 from waapi import WaapiClient, CannotConnectToWaapiException
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from Wwise_Log import get_log_sink, log_sink
+from Short_Loudness import estimate_short_loudness, format_estimate
 from pprint import pprint
 from collections import deque
 import soundfile as sf
@@ -15,39 +19,10 @@ def wwise_log(client, text, level="info"):
         warning → Warning
         error   → Error
         fatal   → Fatal Error
-    """
-
-    # CMD 颜色
-    color = ""
-    severity = "Message"
-
-    if level == "info":
-        color = "\033[92m"  # green
-        severity = "Message"
-
-    elif level == "warning":
-        color = "\033[93m"  # yellow
-        severity = "Warning"
-
-    elif level == "error":
-        color = "\033[91m"  # red
-        severity = "Error"
-
-    elif level == "fatal":
-        color = "\033[95m"  # magenta
-        severity = "Fatal Error"
-
-    # 输出到 CMD
-    print(f"{color}{text}\033[0m")
 
-    # 写入 Wwise Log
-    try:
-        client.call("ak.wwise.core.log.addItem", {
-            "severity": severity,
-            "message": text
-        })
-    except Exception as e:
-        print(f"\033[91m[ERROR] 写入 Wwise Log 失败: {e}\033[0m")
+    CMD 立即输出，Wwise Log 由后台线程批量写入（见 Wwise_Log.py）
+    """
+    get_log_sink(client).log(text, level)
 
 
 # ============================================================
@@ -108,12 +83,17 @@ def check_loudness(client, file_path, name):
         min_duration = 400
 
         if duration_ms < min_duration:
-            wwise_log(
-                client,
-                f"[警告]  {name}: 音频过短 ({duration_ms:.1f}ms < {min_duration}ms)，无法计算响度",
-                level="warning"
-            )
-            return None
+            # 过短的音频无法计算 Integrated / Momentary Max，补齐到 400ms 窗口估算（见 Short_Loudness.py）
+            estimate = estimate_short_loudness(audio, sr)
+            if estimate["lufs"] is None:
+                wwise_log(
+                    client,
+                    f"[警告]  {name}: 音频过短 ({duration_ms:.1f}ms < {min_duration}ms)，无法计算响度",
+                    level="warning"
+                )
+                return None
+            wwise_log(client, f"[估算]  {format_estimate(estimate)} - {name} ({duration_ms:.1f}ms)", level="info")
+            return estimate["lufs"]
 
         # 使用 ffmpeg 计算 Momentary Max 响度
         momentary_lufs = momentary_max(file_path)
@@ -181,7 +161,7 @@ def bfs_collect_objects(client, start_id, target_type):
 if __name__ == "__main__":
 
     try:
-        with WaapiClient() as client:
+        with WaapiClient() as client, log_sink(client):
 
             raw_string = sys.argv[2].strip()
             wav_ids = raw_string.split()
@@ -1,15 +1,31 @@
 import sys
 import os
-from waapi import WaapiClient, CannotConnectToWaapiException
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Exe"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from startup_report import STARTUP
+from Wwise_Log import get_log_sink, log_sink
+
 from collections import deque
-import soundfile as sf
 import subprocess
 import re
 from datetime import datetime
+import queue
+import tempfile
+import threading
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 TARGET_TYPE = "Sound"
 WAAPI_URL = "ws://127.0.0.1:8080/waapi"
+MIN_DURATION_MS = 400
+
+# 批量模式：多个短文件共用一个 ffmpeg 进程
+BATCH_SIZE = 32                 # 每个 ffmpeg 进程的输入数
+BATCH_MAX_SECONDS = 30          # 超过该时长的文件单独处理
+BATCH_MAX_CMD_LENGTH = 30000    # Windows 命令行长度上限 32767
+BATCH_WORKERS = max(1, (os.cpu_count() or 2) // 2)
 
 # ============================================================
 # 获取 ffmpeg 路径（当前 EXE/脚本同级目录）
@@ -27,44 +43,30 @@ def get_ffmpeg_path():
 FFMPEG_PATH = get_ffmpeg_path()
 
 # ============================================================
-# 检查 ffmpeg
+# 检查 ffmpeg（在入口调用，导入本模块时不做检查也不阻塞）
 # ============================================================
-if not os.path.exists(FFMPEG_PATH):
-    print(f"[ERROR] ffmpeg 不存在: {FFMPEG_PATH}")
-    input("按回车键退出...")
-    sys.exit(1)
-else:
-    print(f"[INFO] Using ffmpeg path: {FFMPEG_PATH}")
+def check_ffmpeg():
+    if not os.path.exists(FFMPEG_PATH):
+        print(f"[ERROR] ffmpeg 不存在: {FFMPEG_PATH}")
+        input("按回车键退出...")
+        sys.exit(1)
+    else:
+        print(f"[INFO] Using ffmpeg path: {FFMPEG_PATH}")
 
 # ============================================================
 # Wwise Log
 # ============================================================
 def wwise_log(client, text, level="info"):
-    color = ""
-    severity = "Message"
-
-    if level == "info":
-        color = "\033[92m"
-        severity = "Message"
-    elif level == "warning":
-        color = "\033[93m"
-        severity = "Warning"
-    elif level == "error":
-        color = "\033[91m"
-        severity = "Error"
-    elif level == "fatal":
-        color = "\033[95m"
-        severity = "Fatal Error"
-
-    print(f"{color}{text}\033[0m")
+    """
+    level 可选:
+        info    → Message
+        warning → Warning
+        error   → Error
+        fatal   → Fatal Error
 
-    try:
-        client.call("ak.wwise.core.log.addItem", {
-            "severity": severity,
-            "message": text
-        })
-    except Exception:
-        pass
+    CMD 立即输出，Wwise Log 由后台线程批量写入（见 Wwise_Log.py）
+    """
+    get_log_sink(client).log(text, level)
 
 # ============================================================
 # Loudness 计算
@@ -108,18 +110,189 @@ def momentary_max(file_path: str) -> float | None:
     except Exception:
         return None
 
+def _read_metadata_max(path, key="lavfi.r128.M="):
+    """读取 ametadata=mode=print 输出的文件，返回最大值"""
+    values = []
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if line.startswith(key):
+                values.append(float(line[len(key):]))
+    return max(values) if values else None
+
+
+def momentary_max_batch(files):
+    """
+    一个 ffmpeg 进程同时计算多个文件的 Momentary Max
+
+    每个输入一条 ebur128 → ametadata 链，把每帧的 lavfi.r128.M 写到单独的文件，
+    不需要再用正则解析 stderr 的文本输出。
+    asetnsamples 把帧长固定为 100 ms，与 ebur128 每 100 ms 一次的读数一一对应，
+    结果与单文件的 momentary_max 相同。
+
+    Args:
+        files: [(file_path, sample_rate), ...]
+
+    Returns:
+        dict: {file_path: lufs 或 None}；ffmpeg 整体失败时返回 None
+    """
+    with tempfile.TemporaryDirectory(prefix="ebur128_") as tmp_dir:
+        cmd = [FFMPEG_PATH, "-loglevel", "error", "-nostats"]
+        chains = []
+        for i, (file_path, sample_rate) in enumerate(files):
+            cmd += ["-i", file_path]
+            # 元数据文件使用相对路径（cwd=tmp_dir），避免滤镜参数里 Windows 路径的转义
+            chains.append(
+                f"[{i}:a]asetnsamples=n={max(sample_rate // 10, 1)},ebur128=metadata=1,"
+                f"ametadata=mode=print:key=lavfi.r128.M:file=m{i}.txt[o{i}]"
+            )
+        cmd += ["-filter_complex", ";".join(chains)]
+        for i in range(len(files)):
+            cmd += ["-map", f"[o{i}]"]
+        cmd += ["-f", "null", "-"]
+
+        try:
+            proc = subprocess.run(cmd, cwd=tmp_dir, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                  text=True, encoding="utf-8", errors="ignore")
+        except Exception:
+            return None
+        if proc.returncode != 0:
+            return None
+
+        results = {}
+        for i, (file_path, _) in enumerate(files):
+            metadata_path = os.path.join(tmp_dir, f"m{i}.txt")
+            results[file_path] = _read_metadata_max(metadata_path) if os.path.exists(metadata_path) else None
+        return results
+
+
+def _split_batches(files):
+    """按输入数和命令行长度分批"""
+    batch, length = [], 0
+    for file_path, sample_rate in files:
+        item_length = len(file_path) + 120  # -i 参数 + 滤镜链 + -map
+        if batch and (len(batch) >= BATCH_SIZE or length + item_length > BATCH_MAX_CMD_LENGTH):
+            yield batch
+            batch, length = [], 0
+        batch.append((file_path, sample_rate))
+        length += item_length
+    if batch:
+        yield batch
+
+
+def _measure_batch(batch):
+    results = momentary_max_batch(batch) if len(batch) > 1 else None
+    if results is None:
+        # 某个文件导致整批失败（或只有一个文件）时逐个计算
+        results = {file_path: momentary_max(file_path) for file_path, _ in batch}
+    return results
+
+
+def _estimate_short_files(file_paths):
+    """不足 400 ms 的文件一起用 Short_Loudness 估算，产出格式同 iter_loudness_batch"""
+    import soundfile as sf
+    from Short_Loudness import estimate_short_batch
+
+    clips = []
+    for file_path in file_paths:
+        try:
+            clips.append((file_path, sf.read(file_path, dtype="float32")))
+        except Exception as e:
+            yield file_path, None, f"读取音频失败: {e}", None
+
+    for (file_path, _), estimate in zip(clips, estimate_short_batch([clip for _, clip in clips])):
+        if estimate["lufs"] is None:
+            yield file_path, None, f"音频过短 ({estimate['duration_ms']:.1f} ms)，无法估算", None
+        else:
+            yield file_path, estimate["lufs"], None, estimate
+
+
+def iter_loudness_batch(file_paths):
+    """
+    批量检查多个文件，每批完成后立即产出结果（调用方可以边测量边写入）
+    不足 400 ms 的文件没有 Momentary 读数，补齐到 400 ms 窗口估算（见 Short_Loudness.py）
+
+    Yields:
+        tuple: (file_path, lufs, error, estimate)
+            lufs / error 与 check_loudness 的返回值相同
+            estimate: 短音频为 Short_Loudness 的估算结果（lufs 取其估算值），其它为 None
+    """
+    import soundfile as sf
+
+    too_short, short_files, long_files = [], [], []
+    for file_path in dict.fromkeys(file_paths):
+        if not os.path.exists(file_path):
+            yield file_path, None, f"文件不存在: {file_path}", None
+            continue
+        try:
+            info = sf.info(file_path)
+        except Exception as e:
+            yield file_path, None, f"读取音频失败: {e}", None
+            continue
+
+        duration_ms = info.frames / info.samplerate * 1000
+        if duration_ms < MIN_DURATION_MS:
+            too_short.append(file_path)
+        elif duration_ms > BATCH_MAX_SECONDS * 1000:
+            long_files.append((file_path, info.samplerate))
+        else:
+            short_files.append((file_path, info.samplerate))
+
+    batches = list(_split_batches(short_files)) + [[item] for item in long_files]
+    with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as executor:
+        # 按完成顺序产出，慢的批次（如长文件）不会挡住已经完成的批次
+        futures = [executor.submit(_measure_batch, batch) for batch in batches]
+        # ffmpeg 批次在后台运行时先估算短音频
+        yield from _estimate_short_files(too_short)
+        for future in as_completed(futures):
+            for file_path, lufs in future.result().items():
+                if lufs is None:
+                    yield file_path, None, "无法计算 Momentary Max 响度 (ffmpeg或文件问题)", None
+                else:
+                    yield file_path, lufs, None, None
+
+
+def check_loudness_batch(file_paths):
+    """
+    批量检查多个文件
+
+    Returns:
+        dict: {file_path: (lufs, error)}
+    """
+    return {file_path: (lufs, error) for file_path, lufs, error, _ in iter_loudness_batch(file_paths)}
+
+
+def verify_batch(file_paths, tolerance=0.01):
+    """对比批量模式与单文件模式的结果，返回不一致的文件列表"""
+    batch_results = check_loudness_batch(file_paths)
+    mismatches = []
+    for file_path in file_paths:
+        single = check_loudness(file_path)[0]
+        batch = batch_results.get(file_path, (None, None))[0]
+        same = (single is None and batch is None) or (
+            single is not None and batch is not None and abs(single - batch) <= tolerance)
+        print(f"{'OK  ' if same else 'DIFF'} {single} / {batch}  {file_path}")
+        if not same:
+            mismatches.append((file_path, single, batch))
+    return mismatches
+
+
 def check_loudness(file_path):
+    """返回 (lufs, error)；不足 400 ms 的文件返回 Short_Loudness 的估算值"""
     if not os.path.exists(file_path):
         return None, f"文件不存在: {file_path}"
 
+    # 只需要时长：读取文件头即可，不解码整个文件
+    import soundfile as sf
+
     try:
-        audio, sr = sf.read(file_path, dtype="float32")
-        duration_ms = len(audio) / sr * 1000
+        info = sf.info(file_path)
+        duration_ms = info.frames / info.samplerate * 1000
     except Exception as e:
         return None, f"读取音频失败: {e}"
 
-    if duration_ms < 400:
-        return None, f"音频过短 ({duration_ms:.1f} ms)"
+    if duration_ms < MIN_DURATION_MS:
+        _, lufs, error, _ = next(_estimate_short_files([file_path]))
+        return lufs, error
 
     lufs = momentary_max(file_path)
     if lufs is None:
@@ -158,12 +331,98 @@ def get_object_info(client, object_id):
     arr = result.get("return", [])
     return arr[0] if arr else None
 
-def set_notes(client, object_id, new_notes):
+def set_notes(client, entries):
+    """一次 ak.wwise.core.object.set 写入多个对象的 Notes，entries: [(object_id, notes), ...]"""
     client.call("ak.wwise.core.object.set", {
-        "object": object_id,
-        "notes": new_notes
+        "objects": [{"object": object_id, "notes": notes} for object_id, notes in entries]
     })
 
+# ============================================================
+# Notes 批量写入
+# ============================================================
+# 之前写入的检查结果（成功时三行，失败时一行），重新检查时替换而不是追加
+# 续行包括 "Momentary Max:" 和短音频的 "Momentary (估算):"
+LOUDNESS_NOTE_PATTERN = re.compile(
+    r"\[Loudness Check [^\]]*\][^\n]*\n?(?:(?:Momentary[^:\n]*|Source):[^\n]*\n?)*"
+)
+
+
+def merge_notes(existing, note_line):
+    """保留用户原有的 Notes，只替换上一次的响度检查结果"""
+    kept = LOUDNESS_NOTE_PATTERN.sub("", existing or "").strip()
+    note_line = note_line.strip()
+    return f"{kept}\n\n{note_line}" if kept else note_line
+
+
+class NotesWriter:
+    """
+    后台线程累积检查结果，每 batch_size 个或每 flush_interval 秒用一次 object.set 写入，
+    与响度测量并行进行，主循环只做一次入队。
+    """
+
+    def __init__(self, client, batch_size=500, flush_interval=1.0):
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.written = 0
+        self.failed = 0
+        self.calls = 0
+        self.elapsed = 0.0
+        self._thread = threading.Thread(target=self._run, name="NotesWriter", daemon=True)
+        self._thread.start()
+
+    def add(self, sound, note_line):
+        self.queue.put((sound["id"], merge_notes(sound.get("notes"), note_line)))
+
+    def close(self):
+        """写完剩余的结果"""
+        self.queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        pending = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            timed_out = False
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item, timed_out = None, True
+
+            if item is not None:
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            finished = item is None and not timed_out
+
+            if pending and (timed_out or finished or len(pending) >= self.batch_size):
+                self._write(pending)
+                pending = []
+                deadline = None
+            if finished:
+                return
+
+    def _write(self, entries):
+        start = time.perf_counter()
+        try:
+            self.calls += 1
+            set_notes(self.client, entries)
+            self.written += len(entries)
+        except Exception as e:
+            # 整批失败时逐个写入，找出出错的对象
+            print(f"[WARN] 批量写入 Notes 失败 ({len(entries)} 个)，改为逐个写入: {e}")
+            for entry in entries:
+                try:
+                    self.calls += 1
+                    set_notes(self.client, [entry])
+                    self.written += 1
+                except Exception as e:
+                    self.failed += 1
+                    print(f"[ERROR] 写入 Notes 失败 {entry[0]}: {e}")
+        self.elapsed += time.perf_counter() - start
+
 # ============================================================
 # BFS
 # ============================================================
@@ -186,9 +445,15 @@ def bfs_collect_objects(client, start_id, target_type):
 # Main
 # ============================================================
 if __name__ == "__main__":
+    check_ffmpeg()
+    # waapi（autobahn / asyncio）较重，放到连接前导入，启动报告中单独计时
+    from waapi import WaapiClient, CannotConnectToWaapiException
+    STARTUP.mark("waapi imported")
+    from Short_Loudness import format_estimate
     try:
         try:
-            with WaapiClient(url=WAAPI_URL) as client:
+            with WaapiClient(url=WAAPI_URL) as client, log_sink(client):
+                STARTUP.checkpoint("WAAPI connected")
                 selected = get_selected_objects(client)
 
                 if not selected:
@@ -213,25 +478,59 @@ if __name__ == "__main__":
 
                 wwise_log(client, f"Total Sound found: {len(total_sounds)}")
 
+                valid_sounds = []
                 for sound in total_sounds:
                     wav_path = sound.get("originalWavFilePath")
                     if not wav_path or not os.path.exists(wav_path):
                         wwise_log(client, f"{sound['name']} 没有原始 WAV 文件或路径无效", "warning")
                         continue
+                    valid_sounds.append(sound)
 
-                    lufs, error = check_loudness(wav_path)
-                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                wav_paths = [sound["originalWavFilePath"] for sound in valid_sounds]
+                if "--verify" in sys.argv:
+                    # 校验批量模式与单文件模式结果一致，不写 Notes
+                    mismatches = verify_batch(wav_paths)
+                    wwise_log(client, f"批量/单文件结果不一致: {len(mismatches)} 个",
+                              "error" if mismatches else "info")
+                    sys.exit(1 if mismatches else 0)
 
-                    if error:
-                        note_line = f"[Loudness Check {timestamp}] FAILED: {error}"
-                        wwise_log(client, f"{sound['name']} - {error}", "warning")
-                    else:
-                        note_line = (
-                            f"[Loudness Check {timestamp}]\n"
-                            f"Momentary Max: {lufs:.2f} LUFS\n"
-                            f"Source: {wav_path}\n"
-                        )
-                        wwise_log(client, f"{sound['name']} Momentary Max: {lufs:.2f} LUFS", "info")
+                # 同一个 WAV 可能被多个 Sound 引用
+                sounds_by_path = {}
+                for sound in valid_sounds:
+                    sounds_by_path.setdefault(sound["originalWavFilePath"], []).append(sound)
+
+                measure_start = time.perf_counter()
+                notes_writer = NotesWriter(client)
+
+                for wav_path, lufs, error, estimate in iter_loudness_batch(wav_paths):
+                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    for sound in sounds_by_path[wav_path]:
+                        if error:
+                            note_line = f"[Loudness Check {timestamp}] FAILED: {error}"
+                            wwise_log(client, f"{sound['name']} - {error}", "warning")
+                        elif estimate:
+                            note_line = (
+                                f"[Loudness Check {timestamp}]\n"
+                                f"Momentary (估算): {format_estimate(estimate)}\n"
+                                f"Source: {wav_path}\n"
+                            )
+                            wwise_log(client, f"{sound['name']} [估算] {format_estimate(estimate)} "
+                                              f"({estimate['duration_ms']:.1f} ms)", "info")
+                        else:
+                            note_line = (
+                                f"[Loudness Check {timestamp}]\n"
+                                f"Momentary Max: {lufs:.2f} LUFS\n"
+                                f"Source: {wav_path}\n"
+                            )
+                            wwise_log(client, f"{sound['name']} Momentary Max: {lufs:.2f} LUFS", "info")
+
+                        notes_writer.add(sound, note_line)
+
+                wwise_log(client, f"测量完成: {len(sounds_by_path)} 个文件，{time.perf_counter() - measure_start:.2f} 秒")
+                notes_writer.close()
+                wwise_log(client, f"Notes 已写入 {notes_writer.written} 个 Sound"
+                                  f"（{notes_writer.calls} 次 object.set，{notes_writer.elapsed:.2f} 秒）"
+                                  + (f"，失败 {notes_writer.failed} 个" if notes_writer.failed else ""))
 
         except CannotConnectToWaapiException:
             print("无法连接 WAAPI")
@@ -241,4 +540,5 @@ if __name__ == "__main__":
         traceback.print_exc()
 
     finally:
+        STARTUP.print_report()
         input("按回车键退出...")
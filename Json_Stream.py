@@ -0,0 +1,150 @@
+"""
+流式、原子的 JSON 写入 / 读取
+
+原来的写法是先清空文件，再把整个列表 json.dump(indent=4) 一次写入：
+结果越多占用内存越大，写到一半崩溃还会留下被截断的文件。
+
+StreamingJsonWriter 边遍历边写：
+- 写入同目录的临时文件，正常结束后 os.replace 替换目标文件；出错时删除临时文件，原文件保持不变
+- JSON 数组格式：每个元素独占一行，可选外层键，如 {"sounds": [...]}，仍是普通 JSON，旧的读取代码不受影响
+- JSON Lines 格式（jsonl=True）：每行一条记录
+
+iter_json_records 按相同格式逐条读取，不把整个文件载入内存。
+不是本模块写出的文件（如手工编辑过的）会退回 ijson（已安装时）或 json.load。
+
+用法：
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).resolve().parents[N]))  # 仓库根目录
+    from Json_Stream import StreamingJsonWriter, iter_json_records
+
+    with StreamingJsonWriter("CollectedSounds.json", array_key="sounds") as writer:
+        for sound in traverse():
+            writer.write(sound)
+
+    for sound in iter_json_records("CollectedSounds.json", array_key="sounds"):
+        ...
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def _array_header(array_key):
+    return "[" if array_key is None else "{" + json.dumps(array_key, ensure_ascii=False) + ": ["
+
+
+def _array_footer(array_key):
+    return "]" if array_key is None else "]}"
+
+
+class StreamingJsonWriter:
+    def __init__(self, path, array_key=None, jsonl=False, default=None):
+        """
+        Args:
+            path: 目标文件
+            array_key: JSON 数组格式时的外层键，None 表示顶层就是数组
+            jsonl: 使用 JSON Lines 格式
+            default: 传给 json.dumps 的 default（序列化自定义对象）
+        """
+        self.path = os.fspath(path)
+        self.array_key = array_key
+        self.jsonl = jsonl
+        self.default = default
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._tmp_path = None
+
+    def __enter__(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp", dir=directory)
+        self._file = os.fdopen(fd, "w", encoding="utf-8", newline="\n")
+        if not self.jsonl:
+            self._file.write(_array_header(self.array_key) + "\n")
+        return self
+
+    def write(self, record):
+        """写入一条记录，可在多个线程中调用"""
+        line = json.dumps(record, ensure_ascii=False, default=self.default)
+        with self._lock:
+            if not self.jsonl and self.count:
+                self._file.write(",\n")
+            self._file.write(line if not self.jsonl else line + "\n")
+            self.count += 1
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                if not self.jsonl:
+                    self._file.write(("\n" if self.count else "") + _array_footer(self.array_key) + "\n")
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._file.close()
+            if exc_type is None:
+                os.replace(self._tmp_path, self.path)
+        finally:
+            if os.path.exists(self._tmp_path):
+                os.remove(self._tmp_path)
+        return False
+
+
+def iter_json_records(path, array_key=None, jsonl=None):
+    """
+    逐条读取记录
+
+    Args:
+        path: 文件路径
+        array_key: JSON 数组格式时的外层键
+        jsonl: 是否为 JSON Lines，None 时按扩展名判断
+
+    Raises:
+        FileNotFoundError: 文件不存在
+        json.JSONDecodeError: 文件不是有效 JSON
+    """
+    path = os.fspath(path)
+    if jsonl is None:
+        jsonl = path.lower().endswith(".jsonl")
+
+    with open(path, "r", encoding="utf-8-sig") as f:
+        if jsonl:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        # StreamingJsonWriter 写出的文件：首行是数组头，之后每行一个元素
+        if f.readline().strip() == _array_header(array_key):
+            footer = _array_footer(array_key)
+            for line in f:
+                line = line.strip()
+                if not line or line == footer:
+                    continue
+                yield json.loads(line[:-1] if line.endswith(",") else line)
+            return
+
+    # 其它来源的文件
+    if ijson is not None:
+        prefix = "item" if array_key is None else f"{array_key}.item"
+        with open(path, "rb") as f:
+            try:
+                yield from ijson.items(f, prefix)
+            except ijson.JSONError as e:
+                raise json.JSONDecodeError(str(e), "", 0) from e
+        return
+
+    with open(path, "r", encoding="utf-8-sig") as f:
+        data = json.load(f)
+    yield from (data if array_key is None else data.get(array_key, []))
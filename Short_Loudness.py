@@ -0,0 +1,165 @@
+"""
+短音频（< 400 ms）响度估算
+
+Integrated Loudness 至少需要一个 400 ms 的测量块，UI 点击、脚步、撞击这类短音频原来一律返回"音频过短"。
+这里把短音频补齐到一个 400 ms 窗口，按 BS.1770 的 K 加权计算该窗口的 Momentary 响度：
+- loop（默认）：循环拼接到窗口长度，得到"持续发声时"的响度；先滤波两个窗口，只取后一个窗口，避开滤波器起振
+- pad：末尾补零，相当于 ebur128 对整个短文件测得的 Momentary 响度（能量被平均到 400 ms，数值偏低）
+同时给出 Peak / RMS（dBFS，未加权）作参考。结果都带 "estimated": True，与正式的 Integrated Loudness 区分。
+
+批量计算时按 (采样率, 声道数) 分组，把同组的窗口堆成 (N, 样本, 声道) 的数组，
+用 scipy.signal.lfilter 沿时间轴一次滤完，不逐个文件循环。
+
+用法：
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).resolve().parents[N]))  # 仓库根目录
+    from Short_Loudness import estimate_short_batch, format_estimate
+
+    results = estimate_short_batch([(audio, sr), ...])
+    print(format_estimate(results[0]))
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+WINDOW_MS = 400
+MAX_GROUP_SIZE = 128  # 每次滤波的最多窗口数，限制临时数组大小
+
+
+# ============================================================
+# K 加权滤波器（BS.1770，按采样率计算系数）
+# ============================================================
+@lru_cache(maxsize=None)
+def k_weighting(sample_rate):
+    """返回合并后的 4 阶滤波器系数 (b, a)：高架滤波 + RLB 高通"""
+    # 高架滤波：+4 dB @ 1500 Hz
+    gain_db, q, fc = 4.0, 1 / math.sqrt(2), 1500.0
+    A = 10 ** (gain_db / 40)
+    w0 = 2 * math.pi * fc / sample_rate
+    alpha = math.sin(w0) / (2 * q)
+    cos_w0 = math.cos(w0)
+    shelf_b = [A * ((A + 1) + (A - 1) * cos_w0 + 2 * math.sqrt(A) * alpha),
+               -2 * A * ((A - 1) + (A + 1) * cos_w0),
+               A * ((A + 1) + (A - 1) * cos_w0 - 2 * math.sqrt(A) * alpha)]
+    shelf_a = [(A + 1) - (A - 1) * cos_w0 + 2 * math.sqrt(A) * alpha,
+               2 * ((A - 1) - (A + 1) * cos_w0),
+               (A + 1) - (A - 1) * cos_w0 - 2 * math.sqrt(A) * alpha]
+
+    # 高通：38 Hz
+    q, fc = 0.5, 38.0
+    w0 = 2 * math.pi * fc / sample_rate
+    alpha = math.sin(w0) / (2 * q)
+    cos_w0 = math.cos(w0)
+    high_b = [(1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2]
+    high_a = [1 + alpha, -2 * cos_w0, 1 - alpha]
+
+    b = np.convolve(np.array(shelf_b) / shelf_a[0], np.array(high_b) / high_a[0])
+    a = np.convolve(np.array(shelf_a) / shelf_a[0], np.array(high_a) / high_a[0])
+    return b, a
+
+
+def channel_weights(channels):
+    """BS.1770 声道权重：5 声道按 L R C Ls Rs，6 声道按 L R C LFE Ls Rs（LFE 不计入）"""
+    if channels == 5:
+        return np.array([1.0, 1.0, 1.0, 1.41, 1.41])
+    if channels == 6:
+        return np.array([1.0, 1.0, 1.0, 0.0, 1.41, 1.41])
+    return np.ones(channels)
+
+
+def _to_db(power):
+    return 10 * math.log10(power) if power > 0 else float("-inf")
+
+
+# ============================================================
+# 估算
+# ============================================================
+def _fill_window(audio, window, mode):
+    """把 (样本, 声道) 的短音频补齐到 window 个样本"""
+    if mode == "loop":
+        return audio[np.arange(window) % len(audio)]
+    filled = np.zeros((window, audio.shape[1]), dtype=np.float32)
+    filled[:len(audio)] = audio
+    return filled
+
+
+def _estimate_group(clips, sample_rate, channels, mode):
+    """同一采样率、声道数的一组短音频，返回每个窗口的 Momentary 响度"""
+    from scipy.signal import lfilter
+
+    window = int(round(sample_rate * WINDOW_MS / 1000))
+    # loop 模式多滤一个窗口用于让滤波器进入稳态
+    length = 2 * window if mode == "loop" else window
+
+    stacked = np.stack([_fill_window(audio, length, mode) for audio in clips])
+    b, a = k_weighting(sample_rate)
+    filtered = lfilter(b, a, stacked, axis=1)[:, -window:, :]
+
+    mean_square = np.mean(np.square(filtered, dtype=np.float64), axis=1)   # (N, 声道)
+    weighted = mean_square @ channel_weights(channels)
+    return [_to_db(float(power)) - 0.691 for power in weighted]
+
+
+def estimate_short_batch(clips, mode="loop"):
+    """
+    批量估算短音频响度
+
+    Args:
+        clips: [(audio, sample_rate), ...]，audio 为 (样本,) 或 (样本, 声道) 的 float 数组
+        mode: "loop" 循环补齐 / "pad" 补零
+
+    Returns:
+        list: 与 clips 顺序一致的 dict:
+            {"lufs", "peak_db", "rms_db", "duration_ms", "estimated": True, "mode"}
+            空音频的 lufs 为 None
+    """
+    if mode not in ("loop", "pad"):
+        raise ValueError(f"未知的补齐方式: {mode}")
+
+    results = [None] * len(clips)
+    groups = {}
+    for index, (audio, sample_rate) in enumerate(clips):
+        audio = np.asarray(audio, dtype=np.float32)
+        if audio.ndim == 1:
+            audio = audio[:, np.newaxis]
+
+        result = {
+            "lufs": None,
+            "peak_db": float("-inf"),
+            "rms_db": float("-inf"),
+            "duration_ms": len(audio) / sample_rate * 1000,
+            "estimated": True,
+            "mode": mode,
+        }
+        results[index] = result
+        if not len(audio):
+            continue
+
+        result["peak_db"] = _to_db(float(np.max(np.abs(audio))) ** 2)
+        result["rms_db"] = _to_db(float(np.mean(np.square(audio, dtype=np.float64))))
+        groups.setdefault((sample_rate, audio.shape[1]), []).append((index, audio))
+
+    for (sample_rate, channels), members in groups.items():
+        for start in range(0, len(members), MAX_GROUP_SIZE):
+            chunk = members[start:start + MAX_GROUP_SIZE]
+            values = _estimate_group([audio for _, audio in chunk], sample_rate, channels, mode)
+            for (index, _), lufs in zip(chunk, values):
+                results[index]["lufs"] = lufs
+
+    return results
+
+
+def estimate_short_loudness(audio, sample_rate, mode="loop"):
+    """估算单个短音频，返回值同 estimate_short_batch 的元素"""
+    return estimate_short_batch([(audio, sample_rate)], mode)[0]
+
+
+def format_estimate(result):
+    """格式化为日志文本，如 "≈-18.52 LUFS (估算, Peak -3.1 dBFS, RMS -21.4 dBFS)" """
+    if result["lufs"] is None:
+        return "无法估算（空音频）"
+    return (f"≈{result['lufs']:.2f} LUFS (估算, Peak {result['peak_db']:.1f} dBFS, "
+            f"RMS {result['rms_db']:.1f} dBFS)")
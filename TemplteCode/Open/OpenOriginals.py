@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
-from waapi import WaapiClient, CannotConnectToWaapiException
+from waapi import CannotConnectToWaapiException
 from pprint import pprint
-from pathlib import Path, PureWindowsPath
+from pathlib import Path
+import sys
 import subprocess
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from Wappi_Project import get_project_context
+
 def open_folder_safely(path):
     """安全地打开文件夹"""
     try:
@@ -28,43 +32,18 @@ voice_path = ''
 languages = []
 languages_path = {}
 
-def normalize_path(path_str):
-    """将路径转换为安全的正斜杠格式"""
-    if not path_str:
-        return ""
-    try:
-        if '\\' in path_str or (len(path_str) > 1 and path_str[1] == ':'):
-            return str(PureWindowsPath(path_str).as_posix())
-        else:
-            return path_str
-    except Exception:
-        return path_str.replace('\\', '/')
-
 try:
-    with WaapiClient(WAAPI_URL) as client:
-        result = client.call("ak.wwise.core.getProjectInfo")
+    # 工程信息走本地缓存，.wproj 未变化时不连接 WAAPI
+    context = get_project_context(WAAPI_URL)
 
-        root_str = normalize_path(result['directories']['root'])
-        originals_str = normalize_path(result['directories']['originals'])
-        
-        root_path = Path(root_str)
-        originals_path = Path(originals_str)
-        json_path = root_path / 'Json' / 'imported_files.json'
-        voice_path = originals_path / 'Voices'
-        
-        print(f"Root: {root_path}")
-        print(f"Originals: {originals_path}")
-        print(f"JSON path: {json_path}")
-        print(f"Voice path: {voice_path}")
-        # pprint(result['languages'])
-        # 收集语言
-        languages = []
-        for language in result['languages']:
-            key = language['name']
-            languages_path[key] = voice_path/key
-            languages.append(key)
-            print(f"{key} : {voice_path/key}")
+    root_path = context.root_path
+    originals_path = context.originals_path
+    json_path = context.json_path
+    voice_path = context.voice_path
+    languages = list(context.languages)
+    languages_path = context.languages_path
 
-        open_folder_safely(originals_path)
+    context.print_info()
+    open_folder_safely(originals_path)
 except CannotConnectToWaapiException:
-    print("Connection error")
\ No newline at end of file
+    print("Connection error")
@@ -0,0 +1,159 @@
+"""
+按音频内容批量设置 ChannelConfigOverride
+
+SetChannelToCLFE / SetChannelToDefault 对所有选中的 Source 写同一个值，
+这里先用 Channel_Layout 逐个分析源文件（线程池，按块读取），只对能确定的文件写入：
+- 双单声道 / 只有第一个声道有声音 → 单声道
+- 多声道文件只有前两个声道有内容 → 立体声
+其它情况（如 5.1 中 LFE / Center 静音）只在报告中列出。
+
+声道名称来自 getWavChannels.read_wav_channel_mask 读到的文件头掩码，普通 PCM 用默认映射。
+写入时在一个 Undo Group 中批量 object.set，当前值已相同的 Source 跳过。
+
+用法：
+    python SetChannelByContent.py              # 分析选中对象下的所有 AudioFileSource → 预览 → 确认后写入
+    python SetChannelByContent.py --dry-run    # 只预览
+    python SetChannelByContent.py --yes        # 不询问直接写入
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from waapi import WaapiClient, CannotConnectToWaapiException
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # 仓库根目录
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # TemplteCode
+from Channel_Layout import analyze_file, recommend_layout
+from getWavChannels import read_wav_channel_mask, decode_channel_mask, PCM_DEFAULT_MAPPING
+
+ANALYZE_WORKERS = 8
+SET_BATCH_SIZE = 500
+
+
+def wwise_log(client, text, level="info"):
+    """向 CMD 和 Wwise Log 同时输出信息"""
+    severity_map = {
+        "info": ("Message", "\033[92m"),
+        "warning": ("Warning", "\033[93m"),
+        "error": ("Error", "\033[91m"),
+        "fatal": ("Fatal Error", "\033[95m"),
+    }
+    severity, color = severity_map.get(level, ("Message", ""))
+    print(f"{color}{text}\033[0m")
+    try:
+        client.call("ak.wwise.core.log.addItem", {
+            "severity": severity,
+            "message": text
+        })
+    except Exception:
+        pass
+
+
+# ============================================================
+# WAAPI
+# ============================================================
+def get_selected_sources(client):
+    """一次 WAQL 查询选中对象（含自身）下的所有 AudioFileSource"""
+    selected = client.call("ak.wwise.ui.getSelectedObjects", {}).get("objects", [])
+    if not selected:
+        return []
+    ids = ", ".join(f'"{obj["id"]}"' for obj in selected)
+    result = client.call("ak.wwise.core.object.get",
+                         {"waql": f"$ {ids} select this, descendants where type = \"AudioFileSource\""},
+                         options={"return": ["id", "name", "originalWavFilePath", "ChannelConfigOverride"]})
+    unique = {obj["id"]: obj for obj in result.get("return", []) if obj.get("originalWavFilePath")}
+    return list(unique.values())
+
+
+def set_channel_configs(client, entries):
+    """在一个 Undo Group 中批量写入，entries: [(source_id, value), ...]"""
+    client.call("ak.wwise.core.undo.beginGroup")
+    try:
+        for start in range(0, len(entries), SET_BATCH_SIZE):
+            client.call("ak.wwise.core.object.set", {"objects": [
+                {"object": source_id, "@ChannelConfigOverride": value}
+                for source_id, value in entries[start:start + SET_BATCH_SIZE]
+            ]})
+    finally:
+        client.call("ak.wwise.core.undo.endGroup", {"displayName": "Set Channel Config By Content"})
+
+
+# ============================================================
+# 分析
+# ============================================================
+def channel_names(wav_path):
+    n_channels, mask, is_pcm = read_wav_channel_mask(wav_path)
+    if mask:
+        return decode_channel_mask(mask)
+    return PCM_DEFAULT_MAPPING.get(n_channels)
+
+
+def analyze_source(wav_path):
+    """返回 (layout, error)"""
+    try:
+        return recommend_layout(analyze_file(wav_path), channel_names(wav_path)), None
+    except Exception as e:
+        return None, str(e)
+
+
+def plan_sources(sources):
+    """返回 (需要写入的 [(source, layout)], 只报告的 [(source, layout 或 error)])"""
+    paths = sorted({source["originalWavFilePath"] for source in sources if os.path.isfile(source["originalWavFilePath"])})
+    with ThreadPoolExecutor(max_workers=ANALYZE_WORKERS) as executor:
+        layouts = dict(zip(paths, executor.map(analyze_source, paths)))
+
+    changes, notes = [], []
+    for source in sources:
+        layout, error = layouts.get(source["originalWavFilePath"], (None, "找不到源文件"))
+        if error:
+            notes.append((source, error))
+        elif layout["config"] is not None:
+            if source.get("ChannelConfigOverride") != layout["config"]:
+                changes.append((source, layout))
+        elif layout["silent"]:
+            notes.append((source, layout["reason"]))
+    return changes, notes
+
+
+def main():
+    with WaapiClient() as client:
+        sources = get_selected_sources(client)
+        if not sources:
+            wwise_log(client, "选中的对象下没有 AudioFileSource", "error")
+            return
+
+        start = time.perf_counter()
+        changes, notes = plan_sources(sources)
+        wwise_log(client, f"分析完成: {len(sources)} 个 Source，{time.perf_counter() - start:.2f} 秒")
+
+        for source, reason in notes:
+            wwise_log(client, f"{source['name']} - {reason}", "warning")
+        if not changes:
+            wwise_log(client, "没有需要修改声道配置的 Source")
+            return
+
+        print()
+        for source, layout in changes:
+            print(f"{source['name']}: {source.get('ChannelConfigOverride', 0)} → {layout['config']} "
+                  f"({layout['layout']}, {layout['reason']})")
+        print(f"共 {len(changes)} 个 Source 需要修改")
+
+        if "--dry-run" in sys.argv:
+            return
+        if "--yes" not in sys.argv and input(f"写入 {len(changes)} 个 Source 的 ChannelConfigOverride? (y/N) ").strip().lower() != "y":
+            print("已取消")
+            return
+
+        set_channel_configs(client, [(source["id"], layout["config"]) for source, layout in changes])
+        wwise_log(client, f"ChannelConfigOverride 已写入 {len(changes)} 个 Source")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except CannotConnectToWaapiException:
+        print("Could not connect to Waapi")
+    input("按回车键退出...")
@@ -2,8 +2,12 @@
 import shutil
 import json
 from pprint import pprint
-from waapi import WaapiClient, CannotConnectToWaapiException
+from waapi import CannotConnectToWaapiException
 from pathlib import Path, PureWindowsPath
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from Wappi_Project import get_project_context
 
 WAAPI_URL = "ws://127.0.0.1:8080/waapi"
 
@@ -41,41 +45,27 @@ def normalize_path(path_str: str) -> str:
 # 初始化函数
 # =========================
 def IninData():
-    """初始化 Wwise 工程路径与语言信息"""
+    """初始化 Wwise 工程路径与语言信息（工程信息走本地缓存）"""
     global root_path, originals_path, json_path, voice_path
     global languages, languages_path
 
     try:
-        with WaapiClient(WAAPI_URL) as client:
-            result = client.call("ak.wwise.core.getProjectInfo")
-
-        root_str = normalize_path(result['directories']['root'])
-        originals_str = normalize_path(result['directories']['originals'])
-
-        root_path = Path(root_str)
-        originals_path = Path(originals_str)
-        json_path = root_path / 'Json' / 'imported_files.json'
-        voice_path = originals_path / 'Voices'
-
-        print(f"Root: {root_path}")
-        print(f"Originals: {originals_path}")
-        print(f"JSON path: {json_path}")
-        print(f"Voice path: {voice_path}")
-
-        # 收集语言
-        languages = []
-        for language in result['languages']:
-            key = language['name']
-            languages_path[key] = voice_path/key
-            languages.append(key)
-            print(f"{key} : {voice_path/key}")
-
-        return True
-
+        context = get_project_context(WAAPI_URL)
     except CannotConnectToWaapiException:
         print("WAAPI 连接失败")
         return False
 
+    root_path = context.root_path
+    originals_path = context.originals_path
+    json_path = context.json_path
+    voice_path = context.voice_path
+    languages = list(context.languages)
+    languages_path.clear()
+    languages_path.update(context.languages_path)
+
+    context.print_info()
+    return True
+
 
 # =========================
 # Voice Source 收集
@@ -0,0 +1,194 @@
+"""
+语音首尾静音扫描与 Trim 建议
+
+CopyVoiceSourceToWwiseVoices 导入的语音经常带几百毫秒的首尾静音，占内存也影响对白节奏。
+扫描 Originals/Voices 下所有语言文件夹（进程池并行，每个文件一个任务）：
+- 用 np.lib.stride_tricks.sliding_window_view 把音频看成 (帧, 声道, 帧长) 的视图，不复制数据，
+  einsum 直接求每帧每声道的平方和，取声道最大值得到帧 RMS
+- 第一个 / 最后一个超过 THRESHOLD_DB 的帧之前 / 之后为静音，保留 PADDING_MS 余量后给出 Trim 点
+- 首尾静音都小于 MIN_TRIM_MS 的文件不给建议
+
+结果写入同目录的 VoiceSilence.csv；加 --apply 时把 Trim 点写入 Wwise：
+一次 WAQL 查询所有 Voice 的 AudioFileSource，按 originalWavFilePath 对应，
+在一个 Undo Group 中批量 object.set @TrimBegin / @TrimEnd（单位秒，TrimEnd 为从开头算起的结束位置）。
+
+用法：
+    python ScanVoiceSilence.py                     # 只扫描并输出 CSV
+    python ScanVoiceSilence.py --apply             # 扫描并写入 Wwise
+    python ScanVoiceSilence.py --threshold -45
+"""
+
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # 仓库根目录
+from Wappi_Project import get_project_context
+
+WAAPI_URL = "ws://127.0.0.1:8080/waapi"
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "VoiceSilence.csv")
+
+FRAME_MS = 10
+HOP_MS = 5
+THRESHOLD_DB = -50.0
+PADDING_MS = 30
+MIN_TRIM_MS = 100
+SET_BATCH_SIZE = 500
+
+
+# ============================================================
+# 扫描（子进程）
+# ============================================================
+def frame_rms_db(audio, sample_rate):
+    """每帧 RMS（声道取最大值），dBFS；audio 为 (样本, 声道)"""
+    frame = max(1, int(sample_rate * FRAME_MS / 1000))
+    hop = max(1, int(sample_rate * HOP_MS / 1000))
+    if len(audio) < frame:
+        audio = np.pad(audio, ((0, frame - len(audio)), (0, 0)))
+
+    # (帧, 声道, 帧长) 的只读视图，不复制数据
+    windows = sliding_window_view(audio, frame, axis=0)[::hop]
+    power = np.einsum("fcn,fcn->fc", windows, windows, dtype=np.float64) / frame
+    return 10 * np.log10(power.max(axis=1) + 1e-20), hop, frame
+
+
+def scan_file(path, threshold_db=THRESHOLD_DB):
+    """
+    返回 dict: {"path", "duration_ms", "head_ms", "tail_ms", "trim_begin", "trim_end", "error"}
+    trim_begin / trim_end 为建议的 Trim 点（秒），不需要裁剪时为 None；整段静音时 head_ms 为时长
+    """
+    import soundfile as sf
+
+    result = {"path": path, "duration_ms": None, "head_ms": None, "tail_ms": None,
+              "trim_begin": None, "trim_end": None, "error": None}
+    try:
+        audio, sample_rate = sf.read(path, dtype="float32", always_2d=True)
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+
+    duration = len(audio) / sample_rate
+    result["duration_ms"] = round(duration * 1000, 1)
+
+    levels, hop, frame = frame_rms_db(audio, sample_rate)
+    loud = np.flatnonzero(levels > threshold_db)
+    if not len(loud):
+        result["head_ms"] = result["duration_ms"]
+        result["tail_ms"] = 0.0
+        return result
+
+    head = int(loud[0]) * hop / sample_rate
+    tail = max(duration - (int(loud[-1]) * hop + frame) / sample_rate, 0.0)
+    result["head_ms"] = round(head * 1000, 1)
+    result["tail_ms"] = round(tail * 1000, 1)
+
+    padding = PADDING_MS / 1000
+    if max(head, tail) * 1000 >= MIN_TRIM_MS:
+        result["trim_begin"] = round(max(head - padding, 0.0), 4)
+        result["trim_end"] = round(min(duration - tail + padding, duration), 4)
+    return result
+
+
+# ============================================================
+# 写入 Wwise
+# ============================================================
+def _path_key(path):
+    return os.path.normcase(os.path.normpath(str(path)))
+
+
+def get_voice_sources(client):
+    """一次 WAQL 查询所有 Voice 的 AudioFileSource，返回 {规范化路径: [source id]}"""
+    result = client.call("ak.wwise.core.object.get",
+                         {"waql": "$ from type Sound where IsVoice = true select children"},
+                         options={"return": ["id", "type", "originalWavFilePath"]})
+    sources = {}
+    for obj in result.get("return", []):
+        if obj.get("type") == "AudioFileSource" and obj.get("originalWavFilePath"):
+            sources.setdefault(_path_key(obj["originalWavFilePath"]), []).append(obj["id"])
+    return sources
+
+
+def apply_trims(client, proposals):
+    """在一个 Undo Group 中批量写入 TrimBegin / TrimEnd，返回 (写入的 Source 数, 找不到 Source 的文件数)"""
+    sources = get_voice_sources(client)
+    entries = []
+    missing = 0
+    for proposal in proposals:
+        source_ids = sources.get(_path_key(proposal["path"]))
+        if not source_ids:
+            missing += 1
+            continue
+        entries.extend({"object": source_id, "@TrimBegin": proposal["trim_begin"], "@TrimEnd": proposal["trim_end"]}
+                       for source_id in source_ids)
+
+    client.call("ak.wwise.core.undo.beginGroup")
+    try:
+        for start in range(0, len(entries), SET_BATCH_SIZE):
+            client.call("ak.wwise.core.object.set", {"objects": entries[start:start + SET_BATCH_SIZE]})
+    finally:
+        client.call("ak.wwise.core.undo.endGroup", {"displayName": "Trim Voice Silence"})
+    return len(entries), missing
+
+
+# ============================================================
+# 主程序
+# ============================================================
+def collect_voice_files(context):
+    """{语言: [wav 路径]}"""
+    files = {}
+    for language, folder in context.languages_path.items():
+        if folder.exists():
+            files[language] = [str(path) for path in folder.rglob("*") if path.suffix.lower() == ".wav"]
+    return files
+
+
+def main():
+    threshold_db = float(sys.argv[sys.argv.index("--threshold") + 1]) if "--threshold" in sys.argv else THRESHOLD_DB
+    context = get_project_context()
+    files = collect_voice_files(context)
+    jobs = [(language, path) for language, paths in files.items() for path in paths]
+    print(f"语言: {', '.join(files) or '无'}，共 {len(jobs)} 个文件")
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor() as executor:
+        scanned = executor.map(scan_file, [path for _, path in jobs], [threshold_db] * len(jobs), chunksize=32)
+        for (language, _), result in zip(jobs, scanned):
+            result["language"] = language
+            results.append(result)
+    print(f"扫描完成: {time.perf_counter() - start:.1f} 秒")
+
+    fields = ["language", "path", "duration_ms", "head_ms", "tail_ms", "trim_begin", "trim_end", "error"]
+    with open(OUTPUT_PATH, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(results)
+
+    proposals = [result for result in results if result["trim_begin"] is not None]
+    for language in files:
+        rows = [result for result in results if result["language"] == language]
+        trims = [result for result in proposals if result["language"] == language]
+        saved = sum(result["trim_begin"] + result["duration_ms"] / 1000 - result["trim_end"] for result in trims)
+        silent = sum(1 for result in rows if result["head_ms"] is not None and result["head_ms"] == result["duration_ms"])
+        errors = sum(1 for result in rows if result["error"])
+        print(f"[{language}] {len(rows)} 个文件，建议裁剪 {len(trims)} 个（共 {saved:.1f} 秒），"
+              f"整段静音 {silent} 个，读取失败 {errors} 个")
+    print(f"结果已写入: {OUTPUT_PATH}")
+
+    if "--apply" in sys.argv and proposals:
+        from waapi import WaapiClient
+
+        with WaapiClient(WAAPI_URL) as client:
+            written, missing = apply_trims(client, proposals)
+        print(f"已写入 {written} 个 AudioFileSource 的 Trim" + (f"，{missing} 个文件未找到对应的 Voice" if missing else ""))
+
+
+if __name__ == "__main__":
+    main()
+    input("按回车键退出...")
@@ -0,0 +1,138 @@
+"""
+语音完整性矩阵：哪些 Sound Voice 缺少哪些语言
+
+GetSoundVoiceLanguage.py 一次只看一个 Sound 的子对象。这里用两次 WAQL 查询：所有 IsVoice 的 Sound 本身
+（行，没有任何 Source 的 Sound 也会列出，所有语言都算缺失），以及它们的 Source
+（与 SynchronizationVoice.py 相同的查询，返回 audioSourceLanguage 和 parent），
+用 numpy 整体填成 (Sound × 语言) 的布尔矩阵，缺失的语言按列一次求出，不逐个 Sound 查询。
+
+语言列取工程语言（get_project_context）与查询结果中出现的语言的并集，整列缺失的语言也会列出。
+结果写入同目录的 VoiceCompleteness.csv：每个 Sound 一行，各语言列为 1 / 0，missing 列为缺失的语言。
+
+用法：
+    python VoiceCompleteness.py                   # 所有 Sound
+    python VoiceCompleteness.py --missing-only    # 只输出有缺失的 Sound
+"""
+
+import csv
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from waapi import WaapiClient, CannotConnectToWaapiException
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # 仓库根目录
+from Wappi_Project import get_project_context
+
+WAAPI_URL = "ws://127.0.0.1:8080/waapi"
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "VoiceCompleteness.csv")
+NON_VOICE_LANGUAGES = {"SFX", "External", "Mixed"}
+
+
+# ============================================================
+# 查询
+# ============================================================
+def get_voice_sounds(client):
+    """一次 WAQL 查询所有 Voice Sound，返回 [{"id", "name", "path"}]"""
+    result = client.call("ak.wwise.core.object.get",
+                         {"waql": "$ from type Sound where IsVoice = true"},
+                         options={"return": ["id", "name", "path"]})
+    return result.get("return", [])
+
+
+def get_voice_sources(client):
+    """一次 WAQL 查询所有 Voice Sound 的 Source，返回 [{"parent", "path", "audioSourceLanguage"}]"""
+    result = client.call("ak.wwise.core.object.get",
+                         {"waql": "$ from type Sound where IsVoice = true select children"},
+                         options={"return": ["type", "path", "parent", "audioSourceLanguage"]})
+    return [obj for obj in result.get("return", []) if obj.get("type") == "AudioFileSource"]
+
+
+# ============================================================
+# 矩阵
+# ============================================================
+def build_matrix(voice_sounds, sources, languages=()):
+    """
+    Args:
+        voice_sounds: get_voice_sounds 的结果，每个 Sound 一行
+        sources: get_voice_sources 的结果
+        languages: 固定出现的语言列（如工程语言），查询结果中的其它语言追加在后面
+
+    Returns:
+        tuple: (sounds, languages, matrix)
+            sounds: [{"id", "name", "path"}]，按路径排序
+            matrix: (len(sounds), len(languages)) 的 bool 数组
+    """
+    sounds = [{"id": sound["id"], "name": sound.get("name", ""), "path": sound.get("path", "")}
+              for sound in voice_sounds]
+    sound_index = {sound["id"]: row for row, sound in enumerate(sounds)}
+    language_index = {language: index for index, language in enumerate(languages)}
+    rows = np.empty(len(sources), dtype=np.int64)
+    columns = np.empty(len(sources), dtype=np.int64)
+
+    for position, source in enumerate(sources):
+        parent = source["parent"]
+        row = sound_index.get(parent["id"])
+        if row is None:
+            # 两次查询之间新建的 Sound；Source 路径去掉最后一级即为 Sound 路径
+            row = sound_index[parent["id"]] = len(sounds)
+            sounds.append({"id": parent["id"], "name": parent.get("name", ""), "path": source["path"].rsplit("\\", 1)[0]})
+        language = (source.get("audioSourceLanguage") or {}).get("name", "")
+        column = language_index.get(language)
+        if column is None:
+            column = language_index[language] = len(language_index)
+        rows[position] = row
+        columns[position] = column
+
+    matrix = np.zeros((len(sounds), len(language_index)), dtype=bool)
+    matrix[rows, columns] = True
+
+    order = sorted(range(len(sounds)), key=lambda index: sounds[index]["path"].lower())
+    return [sounds[index] for index in order], list(language_index), matrix[order]
+
+
+def write_csv(path, sounds, languages, matrix, missing_only=False):
+    missing = ~matrix
+    rows = np.flatnonzero(missing.any(axis=1)) if missing_only else range(len(sounds))
+    language_array = np.array(languages, dtype=object)
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["path", "name", "id", *languages, "missing"])
+        for row in rows:
+            sound = sounds[row]
+            writer.writerow([sound["path"], sound["name"], sound["id"], *matrix[row].astype(np.uint8),
+                             " ".join(language_array[missing[row]])])
+    return len(rows)
+
+
+# ============================================================
+# 主程序
+# ============================================================
+def main():
+    with WaapiClient(WAAPI_URL) as client:
+        languages = [language for language in get_project_context(client=client).languages
+                     if language not in NON_VOICE_LANGUAGES]
+        start = time.perf_counter()
+        voice_sounds = get_voice_sounds(client)
+        sources = get_voice_sources(client)
+    query_time = time.perf_counter() - start
+
+    sounds, languages, matrix = build_matrix(voice_sounds, sources, languages)
+    written = write_csv(OUTPUT_PATH, sounds, languages, matrix, "--missing-only" in sys.argv)
+
+    print(f"查询 {len(sources)} 个 Source，{query_time:.2f} 秒；{len(sounds)} 个 Voice Sound × {len(languages)} 种语言")
+    present = matrix.sum(axis=0)
+    for language, count in zip(languages, present):
+        print(f"  {language:<12} {count:>7} / {len(sounds)}  缺少 {len(sounds) - count}")
+    print(f"完整的 Sound: {int(matrix.all(axis=1).sum())} / {len(sounds)}")
+    print(f"已写入 {written} 行: {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except CannotConnectToWaapiException:
+        print("Could not connect to Waapi")
+    input("按回车键退出...")
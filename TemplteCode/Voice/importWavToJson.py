@@ -4,6 +4,9 @@ from pathlib import Path
 from collections import deque
 import json
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from Json_Stream import StreamingJsonWriter
+
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QFileDialog, QTextEdit,
@@ -111,15 +114,10 @@ def load_imported_files_from_json(JsonPath):
 def save_imported_files_to_json(self,data):
     try:
         output_path = Path.cwd().parent.parent / JsonPath
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # 清空文件内容
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("")
 
-        # 写入新数据
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 写入临时文件后替换，写入失败时保留原文件
+        with StreamingJsonWriter(output_path) as writer:
+            writer.write_many(data)
         self.log(f"✅ Json路径 {output_path}")
         print(f"JSON 文件已保存: {output_path}")
         return True
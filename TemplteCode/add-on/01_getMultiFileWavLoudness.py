@@ -19,11 +19,17 @@ import soundfile as sf
 import loudness
 from waapi import WaapiClient
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from Short_Loudness import estimate_short_batch, format_estimate
+
 
 # ==============================
 # 响度计算
 # ==============================
-def check_loudness(file_path):
+def check_loudness(file_path, short_clips=None):
+    """
+    short_clips: 传入列表时，过短的音频放入其中稍后用 estimate_short 一起估算，本次返回 None
+    """
     name = os.path.basename(file_path)
 
     try:
@@ -33,7 +39,10 @@ def check_loudness(file_path):
         min_duration = 400
 
         if duration_ms < min_duration:
-            return f"[警告] {name}: 过短 ({duration_ms:.1f} ms)，无法计算 LUFS"
+            if short_clips is not None:
+                short_clips.append((file_path, audio, sr))
+                return None
+            return estimate_short([(file_path, audio, sr)])[0]
 
         lufs = loudness.integrated_loudness(audio, sr)
         return f"{lufs:.2f} LUFS - {name} ({duration_ms:.1f} ms)"
@@ -42,6 +51,23 @@ def check_loudness(file_path):
         return f"[错误] {name}: 读取失败 -> {e}"
 
 
+def estimate_short(short_clips):
+    """批量估算过短的音频（见 Short_Loudness.py），返回与 check_loudness 相同格式的文本"""
+    try:
+        estimates = estimate_short_batch([(audio, sr) for _, audio, sr in short_clips])
+    except Exception as e:
+        return [f"[错误] {os.path.basename(file_path)}: 估算失败 -> {e}" for file_path, _, _ in short_clips]
+
+    messages = []
+    for (file_path, _, _), estimate in zip(short_clips, estimates):
+        name = os.path.basename(file_path)
+        if estimate["lufs"] is None:
+            messages.append(f"[警告] {name}: 过短 ({estimate['duration_ms']:.1f} ms)，无法计算 LUFS")
+        else:
+            messages.append(f"[估算] {format_estimate(estimate)} - {name} ({estimate['duration_ms']:.1f} ms)")
+    return messages
+
+
 # ==============================
 # 主流程
 # ==============================
@@ -71,11 +97,19 @@ def main():
             "channel": "general"
         })
 
-    # 逐个处理 wav 文件
+    # 逐个处理 wav 文件，过短的音频最后一起估算
+    short_clips = []
     for path in wav_paths:
-        result = check_loudness(path)
+        result = check_loudness(path, short_clips)
+        if result is None:
+            continue
         log_to_wwise(result)
         pprint(result)
+
+    if short_clips:
+        for result in estimate_short(short_clips):
+            log_to_wwise(result)
+            pprint(result)
     client.disconnect()
 
 
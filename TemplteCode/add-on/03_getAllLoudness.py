@@ -1,9 +1,15 @@
 ﻿import sys
 from waapi import WaapiClient, CannotConnectToWaapiException
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from Wwise_Log import get_log_sink, log_sink
+from Short_Loudness import estimate_short_loudness, format_estimate
+from Audio_QA import analyze_array, qa_issues, format_qa
 from pprint import pprint
 from collections import deque
 import soundfile as sf
 import loudness
+from loudness_pool import LoudnessPool, MIN_DURATION_MS
 
 TARGET_TYPE = "Sound"  # 目标类型
 
@@ -17,58 +23,30 @@ def wwise_log(client, text, level="info"):
         warning → Warning
         error   → Error
         fatal   → Fatal Error
-    """
-
-    # CMD 颜色
-    color = ""
-    severity = "Message"
-
-    if level == "info":
-        color = "\033[92m"  # green
-        severity = "Message"
-
-    elif level == "warning":
-        color = "\033[93m"  # yellow
-        severity = "Warning"
-
-    elif level == "error":
-        color = "\033[91m"  # red
-        severity = "Error"
-
-    elif level == "fatal":
-        color = "\033[95m"  # magenta
-        severity = "Fatal Error"
 
-    # 输出到 CMD
-    print(f"{color}{text}\033[0m")
-
-    # 写入 Wwise Log
-    try:
-        client.call("ak.wwise.core.log.addItem", {
-            "severity": severity,
-            "message": text
-        })
-    except Exception as e:
-        print(f"\033[91m[ERROR] 写入 Wwise Log 失败: {e}\033[0m")
+    CMD 立即输出，Wwise Log 由后台线程批量写入（见 Wwise_Log.py）
+    """
+    get_log_sink(client).log(text, level)
 
 
 # ============================================================
 # 音频响度判断
 # ============================================================
-def check_loudness(client, file_path, name):
+def check_loudness(client, file_path, name, qa=True):
     try:
         audio, sr = sf.read(file_path, dtype="float32")
 
         duration_ms = len(audio) / sr * 1000
-        min_duration = 400
+        if qa:
+            _log_qa(client, name, analyze_array(audio))
 
-        if duration_ms < min_duration:
-            wwise_log(
-                client,
-                f"[警告]  {name}: 音频过短 ({duration_ms:.1f}ms < {min_duration}ms)，无法计算响度",
-                level="warning"
-            )
-            return None
+        if duration_ms < MIN_DURATION_MS:
+            estimate = estimate_short_loudness(audio, sr)
+            if estimate["lufs"] is None:
+                _log_too_short(client, name, duration_ms)
+                return None
+            _log_estimate(client, name, estimate)
+            return estimate["lufs"]
 
         lufs = loudness.integrated_loudness(audio, sr)
 
@@ -81,6 +59,64 @@ def check_loudness(client, file_path, name):
         return None
 
 
+def _log_too_short(client, name, duration_ms):
+    wwise_log(
+        client,
+        f"[警告]  {name}: 音频过短 ({duration_ms:.1f}ms < {MIN_DURATION_MS}ms)，无法计算响度",
+        level="warning"
+    )
+
+
+def _log_estimate(client, name, estimate):
+    wwise_log(client, f"[估算]  {format_estimate(estimate)} - {name} ({estimate['duration_ms']:.1f}ms)", level="info")
+
+
+def _log_qa(client, name, qa):
+    """只在 True Peak / 削波 / 直流偏移超出阈值时输出（见 Audio_QA.py）"""
+    issues = qa_issues(qa)
+    if issues:
+        wwise_log(client, f"[QA]  {name}: {'; '.join(issues)} ({format_qa(qa)})", level="warning")
+
+
+def check_loudness_many(client, sounds, pool=None, qa=True):
+    """
+    多进程计算多个 Sound 的响度（见 loudness_pool.py），日志格式与 check_loudness 相同
+
+    Args:
+        sounds: WAAPI 返回的 Sound 列表（需要 name / originalWavFilePath）
+        pool: 复用的 LoudnessPool，None 时临时创建；是否计算 QA 指标由 pool 的 qa 参数决定
+        qa: 临时创建 pool 时是否同时计算 QA 指标
+
+    Returns:
+        dict: {sound id: {"lufs": lufs 或 None, "estimated": 是否为短音频估算值, "qa": QA 指标或 None}}
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = LoudnessPool(qa=qa)
+
+    names = {sound["id"]: sound["name"] for sound in sounds}
+    results = {}
+    try:
+        jobs = ((sound["id"], sound["originalWavFilePath"]) for sound in sounds)
+        for sound_id, result in pool.measure_files(jobs):
+            name = names[sound_id]
+            lufs, error, estimate = result["lufs"], result["error"], result["estimate"]
+            results[sound_id] = {"lufs": lufs, "estimated": estimate is not None, "qa": result["qa"]}
+            if error == "too_short":
+                _log_too_short(client, name, result["duration_ms"])
+            elif error:
+                wwise_log(client, f"[错误] 读取音频文件失败 {name}: {error}", level="error")
+            elif estimate is not None:
+                _log_estimate(client, name, estimate)
+            else:
+                wwise_log(client, f"[正常]  {lufs:.2f} LUFS - {name}", level="info")
+            _log_qa(client, name, result["qa"])
+    finally:
+        if own_pool:
+            pool.close()
+    return results
+
+
 # ============================================================
 # WAAPI 获取对象
 # ============================================================
@@ -127,7 +163,7 @@ def bfs_collect_objects(client, start_id, target_type):
 if __name__ == "__main__":
 
     try:
-        with WaapiClient() as client:
+        with WaapiClient() as client, log_sink(client):
 
             raw_string = sys.argv[2].strip()
             wav_ids = raw_string.split()
@@ -157,9 +193,8 @@ if __name__ == "__main__":
             print("\n========== SUMMARY ==========")
             print(f"Total {TARGET_TYPE}: {len(total_collected)}")
 
-            # 检测响度
-            for sound in total_collected:
-                check_loudness(client, sound['originalWavFilePath'], sound['name'])
+            # 检测响度和 QA 指标（多进程）
+            check_loudness_many(client, total_collected)
 
             input("按回车键退出...")
 
@@ -0,0 +1,90 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+WwiseHelperDaemon 的轻量客户端（只用标准库，可配合 python -S 启动）
+
+把命令和参数转发给常驻的 WwiseHelperDaemon，daemon 未运行时自动在后台拉起。
+
+用法（command.json）：
+    "program": "D:/Code/env313/Scripts/python.exe",
+    "args": "-S \\"${CurrentCommandDirectory}\\\\WwiseHelperClient.py\\" CheckLoudness -i \\"${id}\\""
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+HOST = "127.0.0.1"
+PORT = int(os.environ.get("WWISE_HELPER_PORT", "8095"))
+DAEMON_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "WwiseHelperDaemon.py")
+DAEMON_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "WwiseHelperDaemon.log")
+START_TIMEOUT = 15.0
+
+
+def send(command, args, timeout=None):
+    with socket.create_connection((HOST, PORT), timeout=2.0) as sock:
+        sock.settimeout(timeout)
+        request = json.dumps({"command": command, "args": args}, ensure_ascii=False) + "\n"
+        sock.sendall(request.encode("utf-8"))
+
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data.decode("utf-8"))
+
+
+def start_daemon():
+    """在后台启动 daemon（不带 -S，正常加载 site-packages）"""
+    kwargs = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = (subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+                                   | subprocess.CREATE_NO_WINDOW)
+    else:
+        kwargs["start_new_session"] = True
+
+    log = open(DAEMON_LOG, "a", encoding="utf-8")
+    subprocess.Popen([sys.executable, DAEMON_SCRIPT], stdout=log, stderr=subprocess.STDOUT,
+                     stdin=subprocess.DEVNULL, close_fds=True, **kwargs)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("用法: WwiseHelperClient.py <命令> [参数...]")
+        sys.exit(1)
+
+    command, args = sys.argv[1], sys.argv[2:]
+    try:
+        response = send(command, args)
+    except (ConnectionRefusedError, socket.timeout, OSError):
+        if command == "Shutdown":
+            print("daemon 未运行")
+            return
+        print("Wwise Helper 未运行，正在启动...")
+        start_daemon()
+
+        deadline = time.time() + START_TIMEOUT
+        while True:
+            try:
+                response = send(command, args)
+                break
+            except OSError:
+                if time.time() > deadline:
+                    print(f"Wwise Helper 启动超时，详见 {DAEMON_LOG}")
+                    sys.exit(1)
+                time.sleep(0.1)
+
+    if response.get("output"):
+        print(response["output"], end="" if response["output"].endswith("\n") else "\n")
+    print(f"[{command}] {'完成' if response.get('ok') else '失败'} ({response.get('elapsed', 0) * 1000:.0f} ms)")
+    if not response.get("ok"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
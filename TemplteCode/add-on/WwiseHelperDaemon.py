@@ -0,0 +1,208 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Wwise 右键命令常驻助手进程
+
+command.json 里每次右键都会启动一个新的 python.exe，再导入 waapi / soundfile / loudness
+并重新建立 WebSocket 连接，真正干活之前就要花掉几秒。
+这个进程常驻后台：启动时预先导入模块并保持一个 WAAPI 连接，
+右键命令通过 WwiseHelperClient.py 经本地 socket 转发过来，直接在已预热的进程里执行。
+
+协议：每个请求 / 响应都是一行 JSON
+    请求: {"command": "CheckLoudness", "args": ["-i", "{id1} {id2}"]}
+    响应: {"ok": true, "output": "...", "elapsed": 0.012}
+
+用法：
+    python WwiseHelperDaemon.py            # 手动启动（客户端连不上时也会自动拉起）
+    python WwiseHelperClient.py Shutdown   # 关闭
+"""
+
+import importlib
+import io
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stdout
+
+from waapi import WaapiClient, CannotConnectToWaapiException
+
+HOST = "127.0.0.1"
+PORT = int(os.environ.get("WWISE_HELPER_PORT", "8095"))
+WAAPI_URL = "ws://127.0.0.1:8080/waapi"
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 预先导入：右键命令执行时不再付导入开销
+import pyperclip
+loudness_module = importlib.import_module("03_getAllLoudness")
+
+# 响度计算进程池在第一次 CheckLoudness 时创建，之后常驻（子进程已导入模块、缓存了滤波器）
+loudness_pool = None
+
+
+# ============================================================
+# WAAPI 连接（断开后下次请求自动重连）
+# ============================================================
+class WarmClient:
+    def __init__(self, url=WAAPI_URL):
+        self.url = url
+        self.client = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        with self.lock:
+            if self.client is None or not self.client.is_connected():
+                if self.client is not None:
+                    try:
+                        self.client.disconnect()
+                    except Exception:
+                        pass
+                self.client = WaapiClient(self.url)
+            return self.client
+
+    def close(self):
+        with self.lock:
+            if self.client is not None:
+                self.client.disconnect()
+                self.client = None
+
+
+warm_client = WarmClient()
+# redirect_stdout 作用于整个进程，命令逐个执行以免输出串到别的请求里
+command_lock = threading.Lock()
+
+
+# ============================================================
+# 命令
+# ============================================================
+def _parse_ids(args):
+    """兼容 command.json 的 -i "{id1} {id2}" 与直接传多个 ID 两种写法"""
+    if args and args[0] == "-i":
+        args = args[1:]
+    return " ".join(args).split()
+
+
+def cmd_ping(args):
+    print("pong")
+
+
+def cmd_copy_name(args):
+    guids = _parse_ids(args)
+    pyperclip.copy(' '.join(guids))
+    print(guids)
+
+
+def cmd_check_loudness(args):
+    client = warm_client.get()
+    try:
+        _check_loudness(client, args)
+    finally:
+        # 日志由后台线程写入 Wwise，返回前（包括出错时）等它写完；sink 随预热连接保留
+        loudness_module.get_log_sink(client).flush()
+
+
+def _check_loudness(client, args):
+    target_type = loudness_module.TARGET_TYPE
+    total_collected = []
+
+    for wid in _parse_ids(args):
+        obj = loudness_module.get_object_info(client, wid)
+        if not obj:
+            loudness_module.wwise_log(client, f"[警告] 找不到对象 {wid}", level="warning")
+            continue
+
+        if obj["type"] == target_type:
+            total_collected.append(obj)
+            continue
+
+        total_collected.extend(loudness_module.bfs_collect_objects(client, wid, target_type))
+
+    global loudness_pool
+    if loudness_pool is None:
+        loudness_pool = loudness_module.LoudnessPool(qa=True)
+
+    print(f"Total {target_type}: {len(total_collected)}")
+    loudness_module.check_loudness_many(client, total_collected, pool=loudness_pool)
+
+
+COMMANDS = {
+    "Ping": cmd_ping,
+    "CopyName": cmd_copy_name,
+    "CheckLoudness": cmd_check_loudness,
+}
+
+
+# ============================================================
+# Socket 服务
+# ============================================================
+class HelperHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+
+        start = time.perf_counter()
+        output = io.StringIO()
+        ok = True
+        try:
+            request = json.loads(line.decode("utf-8"))
+            command = request.get("command")
+            args = request.get("args", [])
+
+            if command == "Shutdown":
+                self._reply(True, "daemon 已关闭", start)
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+            handler = COMMANDS.get(command)
+            if handler is None:
+                raise ValueError(f"未知命令: {command}，可用命令: {', '.join(COMMANDS)}")
+
+            with command_lock, redirect_stdout(output):
+                handler(args)
+        except CannotConnectToWaapiException:
+            ok = False
+            output.write("无法连接到 WAAPI: 请确保 Wwise 正在运行且启用了 Wwise Authoring API\n")
+        except ValueError as e:
+            ok = False
+            output.write(f"{e}\n")
+        except Exception:
+            ok = False
+            output.write(traceback.format_exc())
+
+        self._reply(ok, output.getvalue(), start)
+
+    def _reply(self, ok, output, start):
+        response = {"ok": ok, "output": output, "elapsed": round(time.perf_counter() - start, 4)}
+        self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+class HelperServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def main():
+    # 启动时就建立连接；Wwise 未运行时等第一个请求再连
+    try:
+        warm_client.get()
+        print(f"WAAPI 已连接: {WAAPI_URL}")
+    except CannotConnectToWaapiException:
+        print("WAAPI 暂不可用，收到请求时再连接")
+
+    with HelperServer((HOST, PORT), HelperHandler) as server:
+        print(f"Wwise Helper 已启动: {HOST}:{PORT}  命令: {', '.join(COMMANDS)}")
+        try:
+            server.serve_forever()
+        finally:
+            warm_client.close()
+            if loudness_pool is not None:
+                loudness_pool.close()
+
+
+if __name__ == "__main__":
+    main()
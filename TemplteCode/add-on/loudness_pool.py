@@ -0,0 +1,203 @@
+"""
+多进程响度计算
+
+integrated_loudness 的滤波计算受 GIL 限制只能用一个核心。这里把计算放到 ProcessPoolExecutor：
+- 主进程按文件头信息创建 SharedMemory，sf.read(out=...) 直接解码到共享内存，
+  子进程按名字映射同一块内存计算，音频数据不经过 pickle，也不会多复制一份
+- 同时在途的文件数有上限，不会把所有文件一次性解码进内存
+- 子进程与 03_getAllLoudness 的串行路径使用同一个 loudness.integrated_loudness，两条路径结果一致
+- 不足 400 ms 的短音频不进子进程，在主进程攒成一批用 Short_Loudness 估算（结果带 estimated 标记）
+- qa=True 时在同一块共享内存上顺带计算 Audio_QA 指标（True Peak / 削波 / 直流偏移 / 峰值因数），
+  每个文件只解码一次
+
+本模块顶层只导入标准库和 numpy，loudness / Audio_QA 在子进程第一次计算时才导入。
+注意 Windows 上进程池以 spawn 方式启动子进程，子进程会重新导入主脚本（__mp_main__），
+主脚本顶层导入的 waapi / soundfile 等仍会在每个子进程里加载一次；进程池常驻复用，只在启动时付这一次。
+
+用法：
+    with LoudnessPool() as pool:
+        for key, result in pool.measure_files([(sound_id, wav_path), ...]):
+            result["lufs"], result["qa"], ...
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MIN_DURATION_MS = 400
+SHORT_BATCH_SIZE = 256  # 短音频攒够这么多再一起估算
+DTYPE = np.float32
+
+# ============================================================
+# 子进程
+# ============================================================
+def _attach(name):
+    """映射主进程创建的共享内存，由主进程负责 unlink"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python 3.12 及以下没有 track 参数；进程池的子进程与主进程共用 resource_tracker，重复登记不会提前删除
+        return shared_memory.SharedMemory(name=name)
+
+
+def _measure_shared(name, shape, sample_rate, qa):
+    """返回 (lufs, QA 指标或 None)"""
+    shm = _attach(name)
+    audio = None
+    try:
+        audio = np.ndarray(shape, dtype=DTYPE, buffer=shm.buf)
+        import loudness
+        lufs = float(loudness.integrated_loudness(audio, sample_rate))
+        if not qa:
+            return lufs, None
+        from Audio_QA import analyze_array
+        return lufs, analyze_array(audio)
+    finally:
+        # 释放对 buf 的引用后才能 close
+        del audio
+        shm.close()
+
+
+# ============================================================
+# 主进程
+# ============================================================
+class LoudnessPool:
+    def __init__(self, max_workers=None, max_in_flight=None, estimate_short=True, short_mode="loop", qa=False):
+        """
+        Args:
+            max_workers: 进程数，默认 CPU 核心数 - 1
+            max_in_flight: 同时解码在内存中的文件数上限，默认 2 × 进程数
+            estimate_short: 是否估算短音频，False 时短音频只返回 "too_short"
+            short_mode: 短音频补齐方式，"loop" / "pad"（见 Short_Loudness.py）
+            qa: 是否同时计算 QA 指标（见 Audio_QA.py）
+        """
+        self.qa = qa
+        self.estimate_short = estimate_short
+        self.short_mode = short_mode
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_in_flight = max_in_flight or 2 * self.max_workers
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def _submit(self, file_path):
+        """
+        解码到共享内存并提交，返回 (future, shm, duration_ms, short_clip)
+        过短的文件不提交；需要估算时 short_clip 为 (audio, sample_rate)
+        """
+        import soundfile as sf
+
+        info = sf.info(file_path)
+        duration_ms = info.frames / info.samplerate * 1000
+        if duration_ms < MIN_DURATION_MS:
+            if not self.estimate_short:
+                return None, None, duration_ms, None
+            audio, sample_rate = sf.read(file_path, dtype="float32")
+            return None, None, duration_ms, (audio, sample_rate)
+
+        shape = (info.frames, info.channels) if info.channels > 1 else (info.frames,)
+        shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(DTYPE).itemsize, 1))
+        try:
+            audio = np.ndarray(shape, dtype=DTYPE, buffer=shm.buf)
+            sf.read(file_path, dtype="float32", out=audio)
+            del audio
+            future = self.executor.submit(_measure_shared, shm.name, shape, info.samplerate, self.qa)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return future, shm, duration_ms, None
+
+    def _estimate(self, short_clips):
+        """估算攒下的短音频，产出与 measure_files 相同格式的结果"""
+        from Short_Loudness import estimate_short_batch
+
+        try:
+            estimates = estimate_short_batch([clip for _, clip in short_clips], self.short_mode)
+        except Exception as e:
+            for key, (audio, sample_rate) in short_clips:
+                yield key, _result(duration_ms=len(audio) / sample_rate * 1000, error=str(e))
+            return
+
+        for (key, (audio, _)), estimate in zip(short_clips, estimates):
+            qa = None
+            if self.qa:
+                from Audio_QA import analyze_array
+                qa = analyze_array(audio)
+            if estimate["lufs"] is None:
+                yield key, _result(duration_ms=estimate["duration_ms"], error="too_short", qa=qa)
+            else:
+                yield key, _result(estimate["lufs"], estimate["duration_ms"], estimate=estimate, qa=qa)
+
+    def measure_files(self, jobs):
+        """
+        计算多个文件的 Integrated Loudness，完成一个产出一个（不保证输入顺序）
+
+        Args:
+            jobs: [(key, file_path), ...]
+
+        Yields:
+            tuple: (key, {"lufs", "duration_ms", "error", "estimate", "qa"})
+                estimate: 短音频为 Short_Loudness 的估算结果（lufs 取其估算值），其它为 None
+                error: 不估算的短音频为 "too_short"，读取或计算失败时为异常信息，否则为 None
+                qa: qa=True 时为 Audio_QA 指标，否则为 None
+        """
+        pending = {}
+        short_clips = []
+        jobs = iter(jobs)
+        exhausted = False
+
+        while pending or not exhausted:
+            # 补充任务直到达到在途上限
+            while not exhausted and len(pending) < self.max_in_flight:
+                try:
+                    key, file_path = next(jobs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                try:
+                    future, shm, duration_ms, short_clip = self._submit(file_path)
+                except Exception as e:
+                    yield key, _result(error=str(e))
+                    continue
+                if short_clip is not None:
+                    short_clips.append((key, short_clip))
+                    if len(short_clips) >= SHORT_BATCH_SIZE:
+                        yield from self._estimate(short_clips)
+                        short_clips = []
+                    continue
+                if future is None:
+                    yield key, _result(duration_ms=duration_ms, error="too_short")
+                    continue
+                pending[future] = (key, shm, duration_ms)
+
+            if not pending:
+                continue
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, shm, duration_ms = pending.pop(future)
+                shm.close()
+                shm.unlink()
+                try:
+                    lufs, qa = future.result()
+                except Exception as e:
+                    yield key, _result(duration_ms=duration_ms, error=str(e))
+                    continue
+                yield key, _result(lufs, duration_ms, qa=qa)
+
+        if short_clips:
+            yield from self._estimate(short_clips)
+
+
+def _result(lufs=None, duration_ms=None, error=None, estimate=None, qa=None):
+    return {"lufs": lufs, "duration_ms": duration_ms, "error": error, "estimate": estimate, "qa": qa}
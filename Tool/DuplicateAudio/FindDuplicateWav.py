@@ -0,0 +1,398 @@
+"""
+查找 Originals 中重复 / 近似重复的 WAV
+
+以不同名字重复导入的音频会让 Originals 和 SoundBank 变大。分两步查找，整体接近线性：
+1. 草图分桶（线程池，只读文件头和少量采样）：
+   声道数 + 时长（按 DURATION_STEP_MS 取整）+ 均匀分布的 SKETCH_POINTS 个短窗口的相对电平（相对最大窗口，dB）。
+   电平是相对值，音量不同、采样率不同的同一素材草图仍然相近。
+   不对电平做量化取整（取整边界两侧的文件会被拆开），而是在同一时长格及相邻时长格内比较草图，
+   各窗口电平差都不超过 SKETCH_TOLERANCE_DB 的两个文件连起来，连通分量即为候选桶。
+   稳态素材（循环 / 环境声）的草图都接近 0 dB，会连成很大的分量：超过 MAX_BUCKET_FILES 的分量
+   再按精确草图（时长格 + 按 SKETCH_TOLERANCE_DB 量化的电平）拆开，第 2 步的两两比较不会随文件总数平方增长。
+2. 只对有多个文件的桶计算指纹（进程池，读完整 PCM）：
+   - PCM 内容哈希：完全相同的采样数据（只是文件名 / 元数据不同）直接判为重复
+   - 色度指纹：SPECTRUM_FRAMES 帧的 12 音级能量 + 对数频带能量的时频变化（减去整体均值，与音量无关），
+     余弦相似度 >= threshold 判为近似重复；桶内按 SIMILARITY_BLOCK 行分块计算，不生成完整的 n×n 矩阵
+最后用一次 WAQL 查询所有 AudioFileSource 的 originalWavFilePath，按 parent 把结果对应回 Wwise Sound。
+
+用法：
+    python FindDuplicateWav.py                     # 扫描当前工程的 Originals
+    python FindDuplicateWav.py D:/Project/Originals/SFX --threshold 0.97
+
+结果写入同目录的 DuplicateWav.json，每组一条：
+    {"kind": "exact" | "near", "similarity": 0.99, "files": [{"path": ..., "sounds": [{"id", "name"}]}]}
+"""
+
+import hashlib
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # 仓库根目录
+from Json_Stream import StreamingJsonWriter
+
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "DuplicateWav.json")
+WAAPI_URL = "ws://127.0.0.1:8080/waapi"
+
+# 第 1 步：草图
+DURATION_STEP_MS = 50
+SKETCH_POINTS = 16
+SKETCH_FRAMES = 1024
+SKETCH_TOLERANCE_DB = 3.0
+MAX_BUCKET_FILES = 2000
+SKETCH_FLOOR_DB = -60.0
+SCAN_WORKERS = 16
+
+# 第 2 步：指纹
+SPECTRUM_FRAMES = 64
+SPECTRUM_SIZE = 4096
+CHROMA_MIN_HZ = 55.0
+CHROMA_MAX_HZ = 5000.0
+BANDS = 24
+BAND_MIN_HZ = 50.0
+BAND_MAX_HZ = 16000.0
+BAND_RANGE_DB = 60.0        # 低于最大频带能量这么多的部分按噪底处理
+DEFAULT_THRESHOLD = 0.98
+SIMILARITY_BLOCK = 1024     # 桶内相似度每次计算的行数
+
+
+# ============================================================
+# 第 1 步：文件头 + 草图
+# ============================================================
+def iter_wav_files(root):
+    """递归列出 .wav 文件（os.scandir，不为每个文件单独 stat）"""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(".wav"):
+                    yield entry.path
+
+
+def sketch_key(path):
+    """返回 (声道数, 时长格, 各窗口相对电平 dB)，读取失败时返回 None"""
+    import soundfile as sf
+
+    try:
+        with sf.SoundFile(path) as f:
+            frames, channels = f.frames, f.channels
+            duration_key = round(frames / f.samplerate * 1000 / DURATION_STEP_MS)
+            if frames == 0:
+                return channels, duration_key, (SKETCH_FLOOR_DB,) * SKETCH_POINTS
+
+            levels = []
+            for i in range(SKETCH_POINTS):
+                f.seek(int(i * max(frames - SKETCH_FRAMES, 0) / max(SKETCH_POINTS - 1, 1)))
+                window = f.read(SKETCH_FRAMES, dtype="float32", always_2d=True)
+                levels.append(float(np.mean(np.square(window, dtype=np.float64))) if len(window) else 0.0)
+    except Exception:
+        return None
+
+    loudest = max(levels)
+    if loudest <= 0:
+        return channels, duration_key, (SKETCH_FLOOR_DB,) * SKETCH_POINTS
+
+    # 相对最大窗口的电平作为草图，整段静音时全部为 SKETCH_FLOOR_DB
+    sketch = []
+    for level in levels:
+        db = 10 * math.log10(level / loudest) if level > 0 else SKETCH_FLOOR_DB
+        sketch.append(max(db, SKETCH_FLOOR_DB))
+    return channels, duration_key, tuple(sketch)
+
+
+def bucket_files(paths, workers=SCAN_WORKERS):
+    """按草图分桶，只返回有多个文件的桶；libsndfile 调用不占 GIL，用线程池并行读取"""
+    cells = {}  # (声道数, 时长格) -> [文件序号]
+    readable = []
+    cell_keys = []
+    sketches = []
+    unreadable = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for path, key in zip(paths, executor.map(sketch_key, paths, chunksize=64)):
+            if key is None:
+                unreadable.append(path)
+                continue
+            channels, duration_key, sketch = key
+            cells.setdefault((channels, duration_key), []).append(len(readable))
+            readable.append(path)
+            cell_keys.append((channels, duration_key))
+            sketches.append(sketch)
+
+    parent = list(range(len(readable)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    sketches = np.array(sketches, dtype=np.float32).reshape(len(readable), SKETCH_POINTS)
+    for (channels, duration_key), members in cells.items():
+        # 与下一个时长格一起比较，时长落在格子边界两侧的文件也能相遇
+        neighbours = np.array(members + cells.get((channels, duration_key + 1), []))
+        levels = sketches[neighbours]
+        for position, index in enumerate(members):
+            others = neighbours[position + 1:]
+            close = np.abs(levels[position + 1:] - levels[position]).max(axis=1) <= SKETCH_TOLERANCE_DB
+            for other in others[close]:
+                parent[find(index)] = find(int(other))
+
+    components = {}
+    for index in range(len(readable)):
+        components.setdefault(find(index), []).append(index)
+
+    buckets = []
+    for members in components.values():
+        parts = [members]
+        if len(members) > MAX_BUCKET_FILES:
+            # 容差连接是传递的，过大的分量按精确草图拆开
+            exact = {}
+            for index in members:
+                levels = np.floor(sketches[index] / SKETCH_TOLERANCE_DB).astype(np.int64)
+                exact.setdefault((cell_keys[index], levels.tobytes()), []).append(index)
+            parts = exact.values()
+        buckets.extend([readable[index] for index in part] for part in parts if len(part) > 1)
+    return buckets, unreadable
+
+
+# ============================================================
+# 第 2 步：完整指纹（子进程）
+# ============================================================
+_spectrum_cache = {}
+
+
+def _spectrum_maps(sample_rate):
+    """rfft 频点 -> 12 音级 / BANDS 个对数频带的映射矩阵，按采样率缓存"""
+    maps = _spectrum_cache.get(sample_rate)
+    if maps is None:
+        freqs = np.fft.rfftfreq(SPECTRUM_SIZE, 1 / sample_rate)
+
+        chroma = np.zeros((len(freqs), 12), dtype=np.float32)
+        in_range = (freqs >= CHROMA_MIN_HZ) & (freqs <= CHROMA_MAX_HZ)
+        pitch_class = np.round(12 * np.log2(freqs[in_range] / 440.0)).astype(int) % 12
+        chroma[np.nonzero(in_range)[0], pitch_class] = 1.0
+
+        bands = np.zeros((len(freqs), BANDS), dtype=np.float32)
+        edges = np.geomspace(BAND_MIN_HZ, min(BAND_MAX_HZ, sample_rate / 2), BANDS + 1)
+        band = np.searchsorted(edges, freqs, side="right") - 1
+        in_range = (band >= 0) & (band < BANDS)
+        bands[np.nonzero(in_range)[0], band[in_range]] = 1.0
+
+        maps = _spectrum_cache[sample_rate] = (chroma, bands)
+    return maps
+
+
+def _unit(vector):
+    return vector / (np.linalg.norm(vector) + 1e-12)
+
+
+def fingerprint(path):
+    """
+    返回 (path, PCM 哈希, 归一化指纹向量)；读取失败时哈希为 None
+
+    指纹 = 每帧 12 音级能量（帧内归一化）+ 对数频带能量减去整体均值，两部分各占一半权重
+    只有色度时，白噪声之类频谱平坦的素材彼此都很像；频带能量的时频起伏能把它们区分开
+    """
+    import soundfile as sf
+
+    try:
+        audio, sample_rate = sf.read(path, dtype="float32", always_2d=True)
+    except Exception:
+        return path, None, None
+
+    digest = hashlib.blake2b(audio.tobytes(), digest_size=16)
+    digest.update(f"{sample_rate}:{audio.shape[1]}".encode())
+
+    mono = audio.mean(axis=1)
+    if len(mono) < SPECTRUM_SIZE:
+        mono = np.pad(mono, (0, SPECTRUM_SIZE - len(mono)))
+    starts = np.linspace(0, len(mono) - SPECTRUM_SIZE, SPECTRUM_FRAMES).astype(np.int64)
+    frames = mono[starts[:, np.newaxis] + np.arange(SPECTRUM_SIZE)] * np.hanning(SPECTRUM_SIZE).astype(np.float32)
+
+    power = np.square(np.abs(np.fft.rfft(frames, axis=1)))
+    chroma_map, band_map = _spectrum_maps(sample_rate)
+
+    chroma = power @ chroma_map
+    chroma /= np.linalg.norm(chroma, axis=1, keepdims=True) + 1e-12
+
+    band_db = 10 * np.log10(power @ band_map + 1e-20)
+    band_db = np.maximum(band_db, band_db.max() - BAND_RANGE_DB)
+    band_db -= band_db.mean()
+
+    vector = np.concatenate([_unit(chroma.ravel()), _unit(band_db.ravel())]) / math.sqrt(2)
+    return path, digest.hexdigest(), vector.astype(np.float32)
+
+
+def group_bucket(bucket_fingerprints, threshold):
+    """
+    一个桶内分组
+
+    Args:
+        bucket_fingerprints: [(path, 哈希, 指纹)]
+
+    Returns:
+        list: [{"kind", "similarity", "paths"}]，只包含两个及以上文件的组
+    """
+    # 先按 PCM 哈希合并完全相同的文件
+    by_hash = {}
+    for path, digest, vector in bucket_fingerprints:
+        by_hash.setdefault(digest, (vector, []))[1].append(path)
+    hashes = list(by_hash)
+
+    # 再对不同内容做两两相似度，并查集合并
+    parent = list(range(len(hashes)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    vectors = None
+    if len(hashes) > 1:
+        vectors = np.stack([by_hash[digest][0] for digest in hashes])
+        # 分块计算上三角，内存为 SIMILARITY_BLOCK × n 而不是 n × n
+        for start in range(0, len(hashes), SIMILARITY_BLOCK):
+            block = vectors[start:start + SIMILARITY_BLOCK] @ vectors[start:].T
+            rows, cols = np.nonzero(block >= threshold)
+            for i, j in zip(rows + start, cols + start):
+                if i < j:
+                    parent[find(i)] = find(j)
+
+    clusters = {}
+    for i in range(len(hashes)):
+        clusters.setdefault(find(i), []).append(i)
+
+    groups = []
+    for members in clusters.values():
+        paths = [path for i in members for path in by_hash[hashes[i]][1]]
+        if len(paths) < 2:
+            continue
+        if len(members) == 1:
+            groups.append({"kind": "exact", "similarity": 1.0, "paths": paths})
+        else:
+            member_vectors = vectors[members]
+            lowest = float((member_vectors @ member_vectors.T).min())
+            groups.append({"kind": "near", "similarity": round(lowest, 4), "paths": paths})
+    return groups
+
+
+def find_duplicates(buckets, threshold=DEFAULT_THRESHOLD, workers=None):
+    """对候选桶计算指纹并分组"""
+    location = {path: index for index, bucket in enumerate(buckets) for path in bucket}
+    per_bucket = [[] for _ in buckets]
+    unreadable = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path, digest, vector in executor.map(fingerprint, list(location), chunksize=16):
+            if digest is None:
+                unreadable.append(path)
+            else:
+                per_bucket[location[path]].append((path, digest, vector))
+
+    groups = []
+    for bucket_fingerprints in per_bucket:
+        if len(bucket_fingerprints) > 1:
+            groups.extend(group_bucket(bucket_fingerprints, threshold))
+    return groups, unreadable
+
+
+# ============================================================
+# 对应到 Wwise Sound
+# ============================================================
+def _path_key(path):
+    return os.path.normcase(os.path.normpath(path))
+
+
+def get_sounds_by_path():
+    """
+    一次 WAQL 查询所有 AudioFileSource，按 parent 对应到 Sound
+    （originalWavFilePath 属于 Source，Voice 的每种语言各有一个 Source）
+
+    Returns:
+        dict: {规范化路径: [{"id", "name"}]}；无法连接 WAAPI 时返回 None
+    """
+    from waapi import WaapiClient, CannotConnectToWaapiException
+
+    try:
+        with WaapiClient(WAAPI_URL) as client:
+            result = client.call("ak.wwise.core.object.get",
+                                 {"waql": "$ from type AudioFileSource"},
+                                 options={"return": ["originalWavFilePath", "parent"]})
+    except CannotConnectToWaapiException:
+        return None
+
+    sounds_by_path = {}
+    for source in result.get("return", []):
+        wav_path = source.get("originalWavFilePath")
+        parent = source.get("parent")
+        if not wav_path or not parent:
+            continue
+        sounds = sounds_by_path.setdefault(_path_key(wav_path), [])
+        if all(sound["id"] != parent["id"] for sound in sounds):
+            sounds.append({"id": parent["id"], "name": parent.get("name", "")})
+    return sounds_by_path
+
+
+def get_originals_path():
+    from Wappi_Project import get_project_context
+
+    return str(get_project_context().originals_path)
+
+
+# ============================================================
+# 主程序
+# ============================================================
+def main():
+    args = sys.argv[1:]
+    threshold = DEFAULT_THRESHOLD
+    if "--threshold" in args:
+        index = args.index("--threshold")
+        threshold = float(args[index + 1])
+        del args[index:index + 2]
+    root = args[0] if args else get_originals_path()
+    print(f"扫描目录: {root}")
+
+    start = time.perf_counter()
+    paths = list(iter_wav_files(root))
+    buckets, unreadable = bucket_files(paths)
+    candidates = sum(len(bucket) for bucket in buckets)
+    print(f"第 1 步: {len(paths)} 个文件，{len(buckets)} 个候选桶（{candidates} 个文件），"
+          f"{time.perf_counter() - start:.1f} 秒")
+
+    start = time.perf_counter()
+    groups, failed = find_duplicates(buckets, threshold)
+    unreadable.extend(failed)
+    print(f"第 2 步: {len(groups)} 组重复，{time.perf_counter() - start:.1f} 秒")
+
+    sounds_by_path = get_sounds_by_path()
+    if sounds_by_path is None:
+        print("无法连接 WAAPI，结果中不包含对应的 Sound")
+        sounds_by_path = {}
+
+    groups.sort(key=lambda group: (group["kind"] != "exact", -len(group["paths"])))
+    with StreamingJsonWriter(OUTPUT_PATH, array_key="groups") as writer:
+        for group in groups:
+            files = [{"path": path, "sounds": sounds_by_path.get(_path_key(path), [])} for path in group["paths"]]
+            writer.write({"kind": group["kind"], "similarity": group["similarity"], "files": files})
+
+            print(f"\n[{'重复' if group['kind'] == 'exact' else '近似'} {group['similarity']:.3f}]")
+            for file in files:
+                names = ", ".join(sound["name"] for sound in file["sounds"]) or "（未被 Sound 引用）"
+                print(f"    {file['path']}  ->  {names}")
+
+    if unreadable:
+        print(f"\n{len(unreadable)} 个文件无法读取，已跳过")
+    print(f"\n结果已写入: {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
+    input("按回车键退出...")
@@ -0,0 +1,231 @@
+"""
+Wwise 工程信息（带磁盘缓存）
+
+各脚本启动时都要调用 ak.wwise.core.getProjectInfo 来拼 root / Originals / Voices 路径和语言列表。
+这里统一获取一次并缓存到本地磁盘，缓存以工程文件路径 + 修改时间为键：
+工程文件（.wproj）没有变化时直接读缓存，不需要连接 WAAPI。
+
+工程文件路径的来源（按优先级）：
+1. 调用参数 project_file
+2. 环境变量 WWISE_PROJECT_PATH
+3. 向 WAAPI 查询当前打开的工程文件（只查 Project 对象的 filePath，比 getProjectInfo 轻得多）
+不会使用"上一次的工程"，Wwise 切换工程后不会拿到旧工程的路径。
+
+用法：
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).resolve().parents[N]))  # 仓库根目录
+    from Wappi_Project import get_project_context
+
+    context = get_project_context()
+    print(context.originals_path, context.languages)
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path, PureWindowsPath
+
+from waapi import WaapiClient
+
+WAAPI_URL = "ws://127.0.0.1:8080/waapi"
+CACHE_PATH = Path(os.environ.get("LOCALAPPDATA") or Path.home()) / "WwisePython" / "project_info_cache.json"
+CACHE_VERSION = 1
+
+
+def normalize_path(path_str):
+    """将路径转换为安全的正斜杠格式"""
+    if not path_str:
+        return ""
+    try:
+        if '\\' in path_str or (len(path_str) > 1 and path_str[1] == ':'):
+            return str(PureWindowsPath(path_str).as_posix())
+        else:
+            return path_str
+    except Exception:
+        return path_str.replace('\\', '/')
+
+
+@dataclass(frozen=True)
+class WwiseProjectContext:
+    """工程路径与语言/平台信息"""
+    name: str
+    project_file: Path
+    root_path: Path
+    originals_path: Path
+    soundbank_output_path: Path = None
+    languages: tuple = ()
+    platforms: tuple = ()
+    default_language: str = ""
+    from_cache: bool = field(default=False, compare=False)
+
+    @property
+    def json_path(self):
+        return self.root_path / 'Json' / 'imported_files.json'
+
+    @property
+    def voice_path(self):
+        return self.originals_path / 'Voices'
+
+    @property
+    def languages_path(self):
+        """{语言名: Originals/Voices/<语言>}"""
+        return {language: self.voice_path / language for language in self.languages}
+
+    @classmethod
+    def from_project_info(cls, result):
+        directories = result.get('directories', {})
+        output_root = normalize_path(directories.get('soundBankOutputRoot', ''))
+        default_language = result.get('defaultLanguage') or ''
+        if isinstance(default_language, dict):
+            default_language = default_language.get('name', '')
+        return cls(
+            name=result.get('name', ''),
+            project_file=Path(normalize_path(result.get('path', ''))),
+            root_path=Path(normalize_path(directories['root'])),
+            originals_path=Path(normalize_path(directories['originals'])),
+            soundbank_output_path=Path(output_root) if output_root else None,
+            languages=tuple(language['name'] for language in result.get('languages', [])),
+            platforms=tuple(platform['name'] for platform in result.get('platforms', [])),
+            default_language=default_language,
+        )
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "project_file": self.project_file.as_posix(),
+            "root_path": self.root_path.as_posix(),
+            "originals_path": self.originals_path.as_posix(),
+            "soundbank_output_path": self.soundbank_output_path.as_posix() if self.soundbank_output_path else None,
+            "languages": list(self.languages),
+            "platforms": list(self.platforms),
+            "default_language": self.default_language,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        output = data.get("soundbank_output_path")
+        return cls(
+            name=data["name"],
+            project_file=Path(data["project_file"]),
+            root_path=Path(data["root_path"]),
+            originals_path=Path(data["originals_path"]),
+            soundbank_output_path=Path(output) if output else None,
+            languages=tuple(data["languages"]),
+            platforms=tuple(data["platforms"]),
+            default_language=data.get("default_language", ""),
+            from_cache=True,
+        )
+
+    def print_info(self):
+        print(f"Root: {self.root_path}")
+        print(f"Originals: {self.originals_path}")
+        print(f"JSON path: {self.json_path}")
+        print(f"Voice path: {self.voice_path}")
+        for key, path in self.languages_path.items():
+            print(f"{key} : {path}")
+
+
+# =========================
+# 磁盘缓存
+# =========================
+def _cache_key(project_file):
+    return os.path.normcase(os.path.normpath(str(project_file)))
+
+
+def _project_mtime(project_file):
+    try:
+        return os.stat(project_file).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_cache():
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (OSError, json.JSONDecodeError):
+        pass
+    return {"version": CACHE_VERSION, "projects": {}}
+
+
+def _save_cache(cache):
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = CACHE_PATH.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError as e:
+        print(f"写入工程信息缓存失败: {e}")
+
+
+def _cached_context(cache, project_file):
+    if not project_file:
+        return None
+    entry = cache["projects"].get(_cache_key(project_file))
+    if not entry:
+        return None
+    mtime = _project_mtime(project_file)
+    if mtime is None or entry.get("mtime") != mtime:
+        return None
+    return WwiseProjectContext.from_dict(entry["context"])
+
+
+def get_project_context(url=WAAPI_URL, client=None, project_file=None, refresh=False):
+    """
+    获取工程信息；指定了工程文件且命中缓存时不连接 WAAPI，
+    否则只查询当前打开的工程文件路径，命中缓存时不调用 getProjectInfo
+
+    Args:
+        url: WAAPI 地址（需要查询且未传入 client 时使用）
+        client: 已连接的 WaapiClient，需要查询时复用
+        project_file: .wproj 路径
+        refresh: 忽略缓存，强制重新查询
+
+    Returns:
+        WwiseProjectContext
+
+    Raises:
+        CannotConnectToWaapiException: 需要查询且无法连接 WAAPI
+    """
+    cache = _load_cache()
+    project_file = project_file or os.environ.get("WWISE_PROJECT_PATH")
+    if project_file and not refresh:
+        context = _cached_context(cache, project_file)
+        if context:
+            return context
+
+    if client is not None:
+        return _query_project_context(client, cache, project_file, refresh)
+    with WaapiClient(url) as new_client:
+        return _query_project_context(new_client, cache, project_file, refresh)
+
+
+def _open_project_file(client):
+    """当前打开的 .wproj 路径"""
+    result = client.call("ak.wwise.core.object.get", {"waql": "$ from type Project"},
+                         options={"return": ["filePath"]})
+    objects = (result or {}).get("return", [])
+    return normalize_path(objects[0].get("filePath", "")) if objects else None
+
+
+def _query_project_context(client, cache, project_file, refresh):
+    if not project_file:
+        project_file = _open_project_file(client)
+        if not refresh:
+            context = _cached_context(cache, project_file)
+            if context:
+                return context
+
+    result = client.call("ak.wwise.core.getProjectInfo")
+    context = WwiseProjectContext.from_project_info(result)
+    key = _cache_key(context.project_file)
+    cache["projects"][key] = {
+        "mtime": _project_mtime(context.project_file),
+        "context": context.to_dict(),
+    }
+    _save_cache(cache)
+    return context
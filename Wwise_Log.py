@@ -0,0 +1,208 @@
+"""
+非阻塞的 Wwise Log 输出
+
+原来的 wwise_log 每条消息都同步调用一次 ak.wwise.core.log.addItem，
+响度检查循环里每个 Sound 都要等一次 WAAPI 往返，日志比测量本身还慢。
+
+WwiseLogSink 把消息放进有界队列，由后台线程批量写入：
+- 连续的同级别消息合并成一条 addItem（多行）
+- 可选同时写入本地 JSON Lines 文件
+- 队列满时不等待，只按级别计数，下一批写入时输出一条汇总
+调用方（热循环）只做一次 print 和一次 put_nowait。
+
+waapi-client 的 call 通过自身事件循环线程执行，可以在后台线程中调用。
+
+用法：
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).resolve().parents[N]))  # 仓库根目录
+    from Wwise_Log import get_log_sink, log_sink
+
+    def wwise_log(client, text, level="info"):
+        get_log_sink(client).log(text, level)
+
+    # 退出 with 时（包括异常）先写完剩余日志并停止后台线程，再关闭连接
+    with WaapiClient() as client, log_sink(client):
+        ...
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# level -> (CMD 颜色, Wwise severity)
+LEVELS = {
+    "info": ("\033[92m", "Message"),
+    "warning": ("\033[93m", "Warning"),
+    "error": ("\033[91m", "Error"),
+    "fatal": ("\033[95m", "Fatal Error"),
+}
+SEVERITY_ORDER = ["Message", "Warning", "Error", "Fatal Error"]
+
+
+class WwiseLogSink:
+    def __init__(self, client, jsonl_path=None, max_queue=2000, batch_size=50, flush_interval=0.2, echo=True):
+        """
+        Args:
+            client: 已连接的 WaapiClient
+            jsonl_path: 同时写入的 JSON Lines 文件，None 表示不写
+            max_queue: 队列上限，超出时丢弃并计数
+            batch_size: 每批最多合并的消息数
+            flush_interval: 收到第一条消息后最多再等多久凑一批（秒）
+            echo: 是否同时输出到 CMD
+        """
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.echo = echo
+        self.queue = queue.Queue(max_queue)
+        self.dropped = Counter()
+        self.sent = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._jsonl = open(jsonl_path, "a", encoding="utf-8") if jsonl_path else None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="WwiseLogSink", daemon=True)
+        self._thread.start()
+
+    # --------------------------------------------------------
+    # 调用方
+    # --------------------------------------------------------
+    def log(self, text, level="info"):
+        """输出到 CMD 并放入队列，不等待 WAAPI"""
+        color, severity = LEVELS.get(level, LEVELS["info"])
+        if self.echo:
+            print(f"{color}{text}\033[0m")
+
+        try:
+            self.queue.put_nowait((time.time(), severity, text))
+        except queue.Full:
+            with self._lock:
+                self.dropped[severity] += 1
+
+    def flush(self, timeout=10.0):
+        """等待此前放入的消息全部写完"""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=10.0):
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self.queue.put(None)
+        self._thread.join(timeout)
+        if self._jsonl:
+            self._jsonl.close()
+            self._jsonl = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --------------------------------------------------------
+    # 后台线程
+    # --------------------------------------------------------
+    def _take_batch(self):
+        """阻塞等待第一条消息，再在 flush_interval 内尽量凑满一批"""
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and batch[-1] is not None and not isinstance(batch[-1], threading.Event):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            records = [item for item in batch if isinstance(item, tuple)]
+            self._write(records)
+
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if batch[-1] is None:
+                return
+
+    def _write(self, records):
+        with self._lock:
+            dropped, self.dropped = self.dropped, Counter()
+        if dropped:
+            severity = max(dropped, key=SEVERITY_ORDER.index)
+            detail = ", ".join(f"{key} {count}" for key, count in dropped.items())
+            records.append((time.time(), severity, f"[日志] 队列已满，丢弃 {sum(dropped.values())} 条消息 ({detail})"))
+        if not records:
+            return
+
+        if self._jsonl:
+            for timestamp, severity, text in records:
+                self._jsonl.write(json.dumps({"time": round(timestamp, 3), "severity": severity, "message": text},
+                                             ensure_ascii=False) + "\n")
+            self._jsonl.flush()
+
+        # 连续同级别的消息合并为一条
+        groups = []
+        for _, severity, text in records:
+            if groups and groups[-1][0] == severity:
+                groups[-1][1].append(text)
+            else:
+                groups.append((severity, [text]))
+
+        for severity, texts in groups:
+            try:
+                self.client.call("ak.wwise.core.log.addItem", {
+                    "severity": severity,
+                    "message": "\n".join(texts)
+                })
+                self.calls += 1
+            except Exception as e:
+                print(f"\033[91m[ERROR] 写入 Wwise Log 失败: {e}\033[0m")
+        self.sent += len(records)
+
+
+# =========================
+# 每个连接一个 sink
+# =========================
+_sinks = {}
+_sinks_lock = threading.Lock()
+
+
+def get_log_sink(client, **options):
+    """获取（首次调用时创建）client 对应的 WwiseLogSink，options 只在创建时生效"""
+    with _sinks_lock:
+        sink = _sinks.get(id(client))
+        if sink is None or sink.client is not client or sink._closed:
+            sink = WwiseLogSink(client, **options)
+            _sinks[id(client)] = sink
+        return sink
+
+
+@contextmanager
+def log_sink(client, timeout=10.0, **options):
+    """with 块内使用 client 对应的 WwiseLogSink，退出时（包括异常）调用 close_log_sink"""
+    sink = get_log_sink(client, **options)
+    try:
+        yield sink
+    finally:
+        close_log_sink(client, timeout)
+
+
+def close_log_sink(client, timeout=10.0):
+    """写完 client 的剩余日志并停止后台线程，需在连接关闭前调用"""
+    with _sinks_lock:
+        sink = _sinks.pop(id(client), None)
+    if sink is not None and sink.client is client:
+        sink.close(timeout)
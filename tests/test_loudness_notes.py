@@ -0,0 +1,26 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FFmpeg"))
+from ffmepgCheckEbu128 import merge_notes
+
+
+def _estimate_note(timestamp):
+    return (
+        f"[Loudness Check {timestamp}]\n"
+        f"Momentary (估算): -23.10 LUFS (loop)\n"
+        f"Source: D:\\Originals\\SFX\\click.wav\n"
+    )
+
+
+def test_merge_notes_replaces_estimate_note():
+    notes = merge_notes("用户备注", _estimate_note("2024-01-01 00:00:00"))
+    again = merge_notes(notes, _estimate_note("2024-01-02 00:00:00"))
+    assert again == "用户备注\n\n" + _estimate_note("2024-01-02 00:00:00").strip()
+    assert merge_notes(again, _estimate_note("2024-01-02 00:00:00")) == again
+
+
+def test_merge_notes_replaces_estimate_with_measurement():
+    notes = merge_notes("", _estimate_note("2024-01-01 00:00:00"))
+    measured = "[Loudness Check 2024-01-02 00:00:00]\nMomentary Max: -20.00 LUFS\nSource: a.wav\n"
+    assert merge_notes(notes, measured) == measured.strip()
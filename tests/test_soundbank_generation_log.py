@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Exe", "Soundbank"))
+from SoundBankGenerationLog import SoundBankLogCapture
+
+
+class FakeHandler:
+    def unsubscribe(self):
+        pass
+
+
+class FakeClient:
+    def __init__(self):
+        self.subscriptions = {}
+
+    def subscribe(self, topic, callback, options):
+        self.subscriptions[topic] = (callback, options)
+        return FakeHandler()
+
+
+def _generated_payload(root, bank_path):
+    # ak.wwise.core.soundbank.generated 订阅 {"return": ["id", "name"], "infoFile": True} 时的结构
+    return {
+        "soundbank": {"id": "{6A7B5C2E-0000-0000-0000-000000000001}", "name": "Music"},
+        "platform": {"id": "{6A7B5C2E-0000-0000-0000-000000000002}", "name": "Windows"},
+        "language": {"id": "{6A7B5C2E-0000-0000-0000-000000000003}", "name": "SFX"},
+        "infoFile": {
+            "SoundBanksInfo": {
+                "Platform": "Windows",
+                "RootPaths": {"SoundBanksRoot": str(root)},
+                "SoundBanks": [{"ShortName": "Music", "Language": "SFX", "Path": bank_path}],
+            }
+        },
+    }
+
+
+def test_on_generated_reads_name_and_size(tmp_path):
+    (tmp_path / "Music.bnk").write_bytes(b"\0" * 1234)
+    jsonl_path = tmp_path / "generation.jsonl"
+    client = FakeClient()
+
+    with SoundBankLogCapture(client, str(jsonl_path), echo=False) as capture:
+        callback, options = client.subscriptions["ak.wwise.core.soundbank.generated"]
+        assert options["return"] == ["id", "name"]
+        callback(**_generated_payload(tmp_path, "Music.bnk"))
+        capture.finished.set()
+
+    record = capture.banks[0]
+    assert record["bank"] == "Music"
+    assert record["platform"] == "Windows"
+    assert record["language"] == "SFX"
+    assert record["size"] == 1234
+
+    lines = [json.loads(line) for line in jsonl_path.read_text(encoding="utf-8").splitlines()]
+    assert [line for line in lines if line["event"] == "bank"][0]["size"] == 1234
+
+
+def test_on_generated_without_file_on_disk(tmp_path):
+    client = FakeClient()
+    with SoundBankLogCapture(client, str(tmp_path / "generation.jsonl"), echo=False) as capture:
+        callback, _ = client.subscriptions["ak.wwise.core.soundbank.generated"]
+        callback(**_generated_payload(tmp_path, "Missing.bnk"))
+        capture.finished.set()
+
+    assert capture.banks[0]["bank"] == "Music"
+    assert capture.banks[0]["size"] is None